@@ -12,12 +12,17 @@ URL rules (match what the live site actually serves without a redirect):
   - redirect stubs (files with <meta http-equiv="refresh">) are skipped,
     because their URL 301/refreshes elsewhere and the target is listed instead.
 
+<lastmod> is emitted for pages recorded in a generator's build manifest (the
+state-page build's "reviewed" date, which only moves when a page's content
+actually changes). Other pages are listed without one.
+
 Run from the repo root:  python scripts/generate_sitemap.py
 Re-run whenever pages are added or removed (e.g. in the nightly state build).
 """
 
 from __future__ import annotations
 
+import json
 import re
 import sys
 from pathlib import Path
@@ -38,6 +43,11 @@ EXCLUDE_DIRS = {
 
 REFRESH_RE = re.compile(r'http-equiv=["\']?refresh', re.IGNORECASE)
 
+# Build manifests whose page records carry {"path": <repo-relative html>, "reviewed": <date>}.
+LASTMOD_MANIFESTS = [
+    Path("state-spending-monitor/state_pages/build_manifest.json"),
+]
+
 
 def is_redirect_stub(path: Path) -> bool:
     """True if the file is a client-side redirect (meta refresh) rather than a page."""
@@ -58,6 +68,24 @@ def url_for(rel: Path) -> str:
     return f"{BASE}/{parts}"
 
 
+def load_lastmods(root: Path) -> dict[str, str]:
+    """Map canonical URL -> lastmod date from the build manifests."""
+    lastmods: dict[str, str] = {}
+    for rel in LASTMOD_MANIFESTS:
+        path = root / rel
+        if not path.exists():
+            continue
+        try:
+            pages = json.loads(path.read_text(encoding="utf-8")).get("pages", {})
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {rel}: {e}", file=sys.stderr)
+            continue
+        for record in pages.values():
+            if record.get("path") and record.get("reviewed"):
+                lastmods[url_for(Path(record["path"]))] = record["reviewed"]
+    return lastmods
+
+
 def collect(root: Path) -> list[str]:
     urls: set[str] = set()
     for path in root.rglob("*.html"):
@@ -71,11 +99,15 @@ def collect(root: Path) -> list[str]:
     return sorted(urls, key=lambda u: (u != f"{BASE}/", u))
 
 
-def render(urls: list[str]) -> str:
+def render(urls: list[str], lastmods: dict[str, str] | None = None) -> str:
+    lastmods = lastmods or {}
     lines = ['<?xml version="1.0" encoding="UTF-8"?>',
              '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
     for u in urls:
-        lines.append(f"  <url><loc>{u}</loc></url>")
+        if u in lastmods:
+            lines.append(f"  <url><loc>{u}</loc><lastmod>{lastmods[u]}</lastmod></url>")
+        else:
+            lines.append(f"  <url><loc>{u}</loc></url>")
     lines.append("</urlset>")
     return "\n".join(lines) + "\n"
 
@@ -83,9 +115,11 @@ def render(urls: list[str]) -> str:
 def main() -> int:
     root = Path(__file__).resolve().parent.parent
     urls = collect(root)
+    lastmods = load_lastmods(root)
     out = root / "sitemap.xml"
-    out.write_text(render(urls), encoding="utf-8")
-    print(f"Wrote {out.relative_to(root)} with {len(urls)} URLs")
+    out.write_text(render(urls, lastmods), encoding="utf-8")
+    dated = sum(1 for u in urls if u in lastmods)
+    print(f"Wrote {out.relative_to(root)} with {len(urls)} URLs ({dated} with lastmod)")
     return 0
 
 
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Award program registry and USASpending client for spending_monitor.py.
+
+Programs are declared in programs.json (program id → CFDA number, discovery
+rules, output paths, pinned FAIN → display-name map).  Adding a CMS or HRSA
+program is a registry edit, not a code change.
+
+Award discovery searches spending_by_award by CFDA number, fetching pages
+concurrently in windows until the API reports no further pages, so a program
+with thousands of awards is pulled in one run.  Pinned FAINs the CFDA search
+misses are fetched by award ID in chunks.
+
+USASpendingClient caches responses in memory, keyed by endpoint + payload, and
+is shared by every program pipeline in a run so overlapping searches hit the
+API once.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROGRAMS_FILE = os.path.join(HERE, 'programs.json')
+DEFAULT_PROGRAM = 'rhtp'
+
+USASPENDING_API = "https://api.usaspending.gov/api/v2"
+
+# Fields we request from the spending_by_award search
+USASPENDING_FIELDS = [
+    "Award ID",
+    "Recipient Name",
+    "Start Date",
+    "End Date",
+    "Award Amount",
+    "Total Outlays",
+    "Awarding Agency",
+    "Awarding Sub Agency",
+    "Award Type",
+    "Description",
+    "Last Modified Date",
+    "CFDA Number",
+]
+
+PAGE_SIZE = 100            # spending_by_award maximum
+AWARD_ID_CHUNK = 100       # award_ids per request for pinned FAINs
+MAX_WORKERS = 4            # concurrent USASpending requests
+MAX_PAGES = 500            # safety stop: 50,000 awards per program
+
+
+def load_programs(path: str = PROGRAMS_FILE) -> Dict[str, Dict]:
+    """Load the program registry, keyed by program id.
+
+    Keys starting with '_' are comments.  Each program is returned with its
+    'key' filled in and default output paths for anything not configured.
+    """
+    with open(path, encoding='utf-8') as f:
+        raw = json.load(f)
+    programs = {}
+    for key, prog in raw.items():
+        if key.startswith('_'):
+            continue
+        prog = dict(prog)
+        prog['key'] = key
+        prog.setdefault('short_name', key.upper())
+        prog.setdefault('award_type_codes', ["02", "03", "04", "05"])
+        prog.setdefault('label_field', 'Recipient Name')
+        prog.setdefault('awards', {})
+        prog.setdefault('snapshots_file', f'spending_snapshots_{key}.json')
+        prog.setdefault('results_file', f'spending-monitor-results-{key}.json')
+        prog.setdefault('outlays_file', os.path.join('outlays', f'{key}.json'))
+        programs[key] = prog
+    return programs
+
+
+def award_url(program: Dict, fain: str, record: Optional[Dict] = None) -> str:
+    """USASpending award page for a FAIN.
+
+    Uses the program's awarding sub-tier agency code when configured (the
+    URL shape is ASST_NON_<FAIN>_<code>), else the API's generated_internal_id.
+    """
+    code = program.get('agency_code')
+    if code:
+        return f"https://www.usaspending.gov/award/ASST_NON_{fain}_{code}/"
+    internal_id = (record or {}).get('generated_internal_id')
+    if internal_id:
+        return f"https://www.usaspending.gov/award/{internal_id}/"
+    return f"https://www.usaspending.gov/search/?query={fain}"
+
+
+class USASpendingClient:
+    """Thin spending_by_award client with a shared, thread-safe response cache."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self._cache: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.requests_made = 0
+        self.cache_hits = 0
+
+    def search(self, payload: Dict) -> Dict:
+        """POST a spending_by_award search, served from cache when seen before."""
+        key = json.dumps(payload, sort_keys=True)
+        with self._lock:
+            if key in self._cache:
+                self.cache_hits += 1
+                return self._cache[key]
+        resp = self.session.post(
+            f"{USASPENDING_API}/search/spending_by_award/",
+            json=payload,
+            timeout=60,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        with self._lock:
+            self._cache[key] = data
+            self.requests_made += 1
+        return data
+
+    def search_all(self, filters: Dict) -> List[Dict]:
+        """Every result for a filter set, fetching pages concurrently.
+
+        Pages are requested in windows of max_workers; the next window is
+        only requested while the last page of the current one reports
+        hasNext.  Stopping at MAX_PAGES with hasNext still set is logged as
+        a warning: the list is truncated and awards past the cap are missed.
+        """
+        def _page(n: int) -> Dict:
+            return self.search({
+                "subawards": False,
+                "limit": PAGE_SIZE,
+                "page": n,
+                "sort": "Award Amount",
+                "order": "desc",
+                "filters": filters,
+                "fields": USASPENDING_FIELDS,
+            })
+
+        results: List[Dict] = []
+        page = 1
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while page <= MAX_PAGES:
+                window = list(range(page, min(page + self.max_workers, MAX_PAGES + 1)))
+                pages = list(pool.map(_page, window))
+                for data in pages:
+                    results.extend(data.get('results', []))
+                last = pages[-1]
+                if not last.get('results') or not last.get('page_metadata', {}).get('hasNext'):
+                    break
+                page = window[-1] + 1
+            else:
+                logger.warning(
+                    f"  USASpending search stopped at MAX_PAGES={MAX_PAGES} "
+                    f"({len(results)} results) with more pages remaining; "
+                    f"awards beyond the cap were not fetched: {filters}"
+                )
+        return results
+
+
+def discover_awards(client: USASpendingClient, program: Dict) -> Dict[str, Dict]:
+    """Fetch every award belonging to a program, keyed by FAIN.
+
+    1. Search by CFDA number (paginated, concurrent) and keep awards whose
+       FAIN matches the program's fain_pattern (all of them if unset).
+    2. Fetch any pinned FAIN the CFDA search missed by award ID, in chunks.
+    """
+    pattern = re.compile(program['fain_pattern']) if program.get('fain_pattern') else None
+    type_codes = program['award_type_codes']
+    pinned = program['awards']
+    awards: Dict[str, Dict] = {}
+
+    if program.get('cfda'):
+        try:
+            results = client.search_all({
+                "award_type_codes": type_codes,
+                "program_numbers": [program['cfda']],
+            })
+            logger.info(f"  CFDA {program['cfda']} search returned {len(results)} results")
+            for r in results:
+                fain = r.get('Award ID', '')
+                if fain and (fain in pinned or not pattern or pattern.search(fain)):
+                    awards[fain] = r
+        except requests.RequestException as e:
+            logger.error(f"  CFDA {program['cfda']} search failed: {e}")
+
+    missing = [f for f in pinned if f not in awards]
+    if missing:
+        logger.info(f"  Fetching {len(missing)} pinned awards by award ID...")
+        chunks = [missing[i:i + AWARD_ID_CHUNK] for i in range(0, len(missing), AWARD_ID_CHUNK)]
+
+        def _chunk(ids: List[str]) -> List[Dict]:
+            try:
+                return client.search_all({"award_type_codes": type_codes, "award_ids": ids})
+            except requests.RequestException as e:
+                logger.error(f"  USASpending award_ids search failed: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=client.max_workers) as pool:
+            for results in pool.map(_chunk, chunks):
+                for r in results:
+                    fain = r.get('Award ID', '')
+                    if fain in pinned:
+                        awards[fain] = r
+
+    return awards
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Declarative monday.com board sync.
+
+Reads a desired-state file (item name → column values), reads the board with
+cursor pagination, computes a diff plan, prints it, and (unless dry run)
+applies it as batched, aliased change_multiple_column_values mutations sized
+to stay inside monday.com's complexity budget.  A failed batch doesn't stop
+the run: the remaining batches still go out, and the report (and the exit
+status) lists the applied and failed item counts.
+
+The same engine covers URL fixes, status resets and bulk backfills:
+
+  {
+    "board_id": "optional — defaults to MONDAY_BOARD_ID",
+    "items": {
+      "Alaska":        {"RHTP Specific URL": {"value": "https://...", "if_empty": true}},
+      "Massachusetts": {"RHTP Specific URL": "https://www.mass.gov/..."},
+      "*":             {"RHTP URL Status": "Working on it"}
+    }
+  }
+
+Columns are matched by ID or title (case-insensitive).  A value is either the
+desired value itself or a rule {"value": ..., "if_empty": true} that only
+fills empty cells.  "*" applies to every item on the board; named items
+override it column by column.  Strings are converted to the column type's
+JSON shape (link → {"url", "text"}, status → {"label"}, date → {"date"});
+dicts are sent as-is.  null clears the cell.
+
+Usage:
+  python board_sync.py board_state/rhtp_urls.json            # apply
+  python board_sync.py board_state/rhtp_urls.json --dry-run  # plan only
+
+Env: MONDAY_API_TOKEN, MONDAY_BOARD_ID, DRY_RUN=true (same as --dry-run).
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import requests
+except ImportError:
+    print("Missing dependency: requests")
+    sys.exit(1)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+MONDAY_API = 'https://api.monday.com/v2'
+PAGE_SIZE = 500                 # items_page / next_items_page maximum
+MAX_QUERY_COMPLEXITY = 5_000_000  # monday.com per-query ceiling
+DEFAULT_CHUNK = 25              # mutations in the first batch, before cost is known
+MAX_CHUNK = 100
+
+ITEM_FIELDS = """
+        id
+        name
+        column_values(ids: $cols) { id type text value }
+"""
+
+
+class BoardSync:
+    """Diff a desired board state against monday.com and apply the changes."""
+
+    def __init__(self, token: str, board_id: str):
+        self.token = token
+        self.board_id = board_id
+        self.session = requests.Session()
+        self.mutations_sent = 0
+        self.requests_made = 0
+
+    # ── API ──────────────────────────────────────────────────────────
+
+    def query(self, query: str, variables: Optional[dict] = None, partial: bool = False) -> dict:
+        """POST a GraphQL request.  API errors raise RuntimeError unless
+        ``partial`` is set and the response still carries data (aliased
+        mutations report per-alias failures that way)."""
+        resp = self.session.post(
+            MONDAY_API,
+            json={'query': query, 'variables': variables or {}},
+            headers={
+                'Authorization': self.token,
+                'Content-Type': 'application/json',
+                'API-Version': '2024-10',
+            },
+            timeout=60,
+        )
+        self.requests_made += 1
+        resp.raise_for_status()
+        data = resp.json()
+        if 'errors' in data and not (partial and data.get('data')):
+            raise RuntimeError(f"monday.com API errors: {data['errors']}")
+        return data
+
+    def fetch_columns(self) -> List[Dict]:
+        data = self.query(
+            'query ($board: [ID!]!) { boards(ids: $board) { columns { id title type } } }',
+            {'board': [self.board_id]},
+        )
+        return data['data']['boards'][0]['columns']
+
+    def fetch_items(self, column_ids: List[str]) -> List[Dict]:
+        """Every item on the board (only the requested columns), following
+        items_page / next_items_page cursors."""
+        first = f"""
+        query ($board: [ID!]!, $cols: [String!]) {{
+          boards(ids: $board) {{
+            items_page(limit: {PAGE_SIZE}) {{
+              cursor
+              items {{ {ITEM_FIELDS} }}
+            }}
+          }}
+        }}
+        """
+        nxt = f"""
+        query ($cursor: String!, $cols: [String!]) {{
+          next_items_page(limit: {PAGE_SIZE}, cursor: $cursor) {{
+            cursor
+            items {{ {ITEM_FIELDS} }}
+          }}
+        }}
+        """
+        data = self.query(first, {'board': [self.board_id], 'cols': column_ids})
+        page = data['data']['boards'][0]['items_page']
+        items = list(page['items'])
+        while page.get('cursor'):
+            data = self.query(nxt, {'cursor': page['cursor'], 'cols': column_ids})
+            page = data['data']['next_items_page']
+            items.extend(page['items'])
+        logger.info(f"Read {len(items)} items in {self.requests_made} board requests")
+        return items
+
+    # ── Plan ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def resolve_column(columns: List[Dict], key: str) -> Optional[Dict]:
+        for c in columns:
+            if c['id'] == key:
+                return c
+        for c in columns:
+            if c['title'] == key:
+                return c
+        lowered = key.lower()
+        for c in columns:
+            if c['title'].lower() == lowered:
+                return c
+        return None
+
+    @staticmethod
+    def current_value(col_type: str, cell: Optional[Dict]) -> Any:
+        """Comparable form of a board cell: the URL for links, the label/text
+        for everything else; parsed JSON when compared against a dict."""
+        if not cell:
+            return None
+        if col_type in ('link', 'url'):
+            raw = cell.get('value')
+            if raw:
+                try:
+                    parsed = json.loads(raw)
+                    if isinstance(parsed, dict) and parsed.get('url'):
+                        return parsed['url'].strip()
+                except (json.JSONDecodeError, TypeError):
+                    pass
+        text = (cell.get('text') or '').strip()
+        return text or None
+
+    @staticmethod
+    def column_payload(col_type: str, value: Any) -> Any:
+        """The change_multiple_column_values JSON for a desired value."""
+        if value is None:
+            return {} if col_type in ('link', 'status', 'color', 'date') else ''
+        if isinstance(value, dict):
+            return value
+        value = str(value)
+        if col_type == 'link':
+            return {'url': value, 'text': value}
+        if col_type in ('status', 'color'):
+            return {'label': value}
+        if col_type == 'date':
+            return {'date': value[:10]}
+        return value
+
+    @staticmethod
+    def matches(col_type: str, cell: Optional[Dict], desired: Any, current: Any) -> bool:
+        if isinstance(desired, dict):
+            try:
+                parsed = json.loads(cell.get('value') or 'null') if cell else None
+            except (json.JSONDecodeError, TypeError):
+                parsed = None
+            return isinstance(parsed, dict) and all(parsed.get(k) == v for k, v in desired.items())
+        if desired is None:
+            return current is None
+        return current == str(desired).strip()
+
+    def plan(self, desired: Dict[str, Dict], columns: List[Dict], items: List[Dict]) -> Dict:
+        """Diff desired state against the board.
+
+        Returns {'changes': [...], 'missing_items': [...], 'unknown_columns': [...]}
+        where each change is {item_id, name, column_id, column, type, old, new}.
+        """
+        col_by_key = {}
+        unknown = []
+        for spec in desired.values():
+            for key in spec:
+                if key not in col_by_key:
+                    col = self.resolve_column(columns, key)
+                    col_by_key[key] = col
+                    if not col:
+                        unknown.append(key)
+
+        wildcard = desired.get('*', {})
+        by_name = {item['name'].strip(): item for item in items}
+        missing = sorted(n for n in desired if n != '*' and n not in by_name)
+
+        changes = []
+        for item in items:
+            name = item['name'].strip()
+            spec = dict(wildcard)
+            spec.update(desired.get(name, {}))
+            if not spec:
+                continue
+            cells = {cv['id']: cv for cv in item['column_values']}
+            for key, rule in spec.items():
+                col = col_by_key.get(key)
+                if not col:
+                    continue
+                if isinstance(rule, dict) and 'value' in rule:
+                    value, if_empty = rule['value'], rule.get('if_empty', False)
+                else:
+                    value, if_empty = rule, False
+                cell = cells.get(col['id'])
+                current = self.current_value(col['type'], cell)
+                if if_empty and current:
+                    continue
+                if self.matches(col['type'], cell, value, current):
+                    continue
+                changes.append({
+                    'item_id': item['id'],
+                    'name': name,
+                    'column_id': col['id'],
+                    'column': col['title'],
+                    'type': col['type'],
+                    'old': current,
+                    'new': value,
+                })
+        return {'changes': changes, 'missing_items': missing, 'unknown_columns': unknown}
+
+    # ── Apply ────────────────────────────────────────────────────────
+
+    def apply(self, changes: List[Dict]) -> Dict[str, Any]:
+        """Apply changes as aliased mutations, one alias per item.
+
+        The first batch uses DEFAULT_CHUNK items; its reported complexity
+        sets the per-mutation cost used to size later batches under
+        MAX_QUERY_COMPLEXITY and the remaining budget (waiting for the
+        budget reset when it runs low).
+
+        A batch that fails (HTTP or API error) is recorded and the rest still
+        go out; an alias that comes back null fails just its item.  Returns
+        {'applied': [item ids], 'failed': [item ids], 'errors': [messages]}.
+        """
+        per_item: Dict[str, Dict] = {}
+        for c in changes:
+            entry = per_item.setdefault(c['item_id'], {})
+            entry[c['column_id']] = self.column_payload(c['type'], c['new'])
+        pending = list(per_item.items())
+
+        chunk = DEFAULT_CHUNK
+        cost = None
+        result: Dict[str, List[str]] = {'applied': [], 'failed': [], 'errors': []}
+        while pending:
+            batch, pending = pending[:chunk], pending[chunk:]
+            decl = ['$board: ID!']
+            body = []
+            variables: Dict[str, Any] = {'board': self.board_id}
+            for i, (item_id, values) in enumerate(batch):
+                decl += [f'$i{i}: ID!', f'$v{i}: JSON!']
+                body.append(
+                    f'u{i}: change_multiple_column_values(board_id: $board, item_id: $i{i}, '
+                    f'column_values: $v{i}, create_labels_if_missing: true) {{ id }}'
+                )
+                variables[f'i{i}'] = item_id
+                variables[f'v{i}'] = json.dumps(values)
+            mutation = (f"mutation ({', '.join(decl)}) {{\n  "
+                        + '\n  '.join(body)
+                        + '\n  complexity { query before reset_in_x_seconds }\n}')
+            self.mutations_sent += len(batch)
+            try:
+                data = self.query(mutation, variables, partial=True)
+            except (requests.RequestException, RuntimeError, ValueError) as e:
+                result['failed'] += [item_id for item_id, _ in batch]
+                result['errors'].append(str(e))
+                logger.warning(f"  Batch of {len(batch)} item updates failed: {e}")
+                continue
+            if 'errors' in data:
+                result['errors'] += [err.get('message', str(err)) for err in data['errors']]
+            for i, (item_id, _) in enumerate(batch):
+                result['applied' if data['data'].get(f'u{i}') else 'failed'].append(item_id)
+
+            cx = data['data'].get('complexity') or {}
+            if cx.get('query'):
+                cost = max(cost or 0, cx['query'] / len(batch))
+            if cost:
+                chunk = max(1, min(MAX_CHUNK, int(MAX_QUERY_COMPLEXITY // cost)))
+                if pending and cx.get('before') is not None \
+                        and cx['before'] < cost * min(chunk, len(pending)):
+                    wait = cx.get('reset_in_x_seconds') or 60
+                    logger.info(f"  Complexity budget low ({cx['before']}); waiting {wait}s")
+                    time.sleep(wait)
+            logger.info(f"  Sent {self.mutations_sent}/{len(per_item)} item updates "
+                        f"({len(result['failed'])} failed so far)")
+        return result
+
+
+def format_plan(plan: Dict, dry_run: bool) -> str:
+    """Markdown plan/report (also used for the GitHub step summary)."""
+    changes = plan['changes']
+    lines = [f"# Board Sync {'Plan (dry run)' if dry_run else 'Report'}\n",
+             f"**Changes:** {len(changes)} cells on "
+             f"{len({c['item_id'] for c in changes})} items\n"]
+    for c in changes:
+        old = c['old'] if c['old'] is not None else '(empty)'
+        new = c['new'] if c['new'] is not None else '(clear)'
+        lines.append(f"- **{c['name']}** · {c['column']}: {old} → {new}")
+    if plan['missing_items']:
+        lines.append(f"\n**Not on board:** {', '.join(plan['missing_items'])}")
+    if plan['unknown_columns']:
+        lines.append(f"\n**Unknown columns:** {', '.join(plan['unknown_columns'])}")
+    return '\n'.join(lines)
+
+
+def format_apply(result: Dict[str, Any], changes: List[Dict]) -> str:
+    """Markdown applied/failed counts for the step summary."""
+    names = {c['item_id']: c['name'] for c in changes}
+    lines = [f"\n**Applied:** {len(result['applied'])} items · "
+             f"**Failed:** {len(result['failed'])} items"]
+    if result['failed']:
+        lines.append(f"\n**Failed items:** {', '.join(names.get(i, i) for i in result['failed'])}")
+        for err in dict.fromkeys(result['errors']):
+            lines.append(f"- {err}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync a monday.com board to a desired-state file')
+    parser.add_argument('state_file', help='Desired-state JSON (item name → column values)')
+    parser.add_argument('--dry-run', action='store_true', help='Print the plan without writing')
+    args = parser.parse_args()
+
+    with open(args.state_file, encoding='utf-8') as f:
+        state = json.load(f)
+
+    token = os.getenv('MONDAY_API_TOKEN', '')
+    board_id = str(state.get('board_id') or os.getenv('MONDAY_BOARD_ID', ''))
+    dry_run = args.dry_run or os.getenv('DRY_RUN', 'false').lower() == 'true'
+    if not token or not board_id:
+        logger.error("MONDAY_API_TOKEN and MONDAY_BOARD_ID (or board_id in the state file) are required")
+        sys.exit(1)
+
+    desired = state['items']
+    sync = BoardSync(token, board_id)
+    columns = sync.fetch_columns()
+    wanted_ids = sorted({
+        col['id'] for spec in desired.values() for key in spec
+        for col in [sync.resolve_column(columns, key)] if col
+    })
+    items = sync.fetch_items(wanted_ids)
+
+    plan = sync.plan(desired, columns, items)
+    report = format_plan(plan, dry_run)
+    print("\n" + report + "\n")
+
+    failed = False
+    if plan['changes'] and not dry_run:
+        result = sync.apply(plan['changes'])
+        failed = bool(result['failed'])
+        report += '\n' + format_apply(result, plan['changes'])
+        logger.info(f"Done: {len(result['applied'])} items updated, {len(result['failed'])} failed, "
+                    f"in {sync.requests_made} API requests")
+    elif not plan['changes']:
+        logger.info("No changes needed — board already matches the desired state")
+
+    summary_file = os.getenv('GITHUB_STEP_SUMMARY')
+    if summary_file:
+        with open(summary_file, 'a') as f:
+            f.write(report + '\n')
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except Exception as e:
+        logger.error(f"Fatal error: {e}", exc_info=True)
+        sys.exit(1)
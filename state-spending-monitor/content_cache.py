@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Persistent extracted-text cache for linked documents.
+
+Keyed by URL; stores the *extracted text* (not raw bytes) together with the
+response's ETag / Last-Modified, so the next fetch can be a conditional
+request.  A 304 (or an entry younger than max_age) is a hit: no download and
+no HTML/PDF parsing.  The cache is bounded by total text size with
+least-recently-used eviction.
+
+Layout:
+  <dir>/index.json      — url → {file, etag, last_modified, size, fetched, used}
+  <dir>/<sha1>.txt      — extracted text
+
+Env:
+  CONTENT_CACHE_DIR      — cache directory (default: .content-cache)
+  CONTENT_CACHE_MAX_MB   — size bound for cached text (default: 100)
+  CONTENT_CACHE_MAX_AGE  — hours an entry is trusted without revalidation
+                           (default: 0 = always revalidate)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ContentCache:
+    """URL → extracted text, with HTTP validators and LRU size eviction."""
+
+    def __init__(self, directory: str = '', max_bytes: int = 0, max_age_hours: float = -1):
+        self.directory = directory or os.getenv('CONTENT_CACHE_DIR', '.content-cache')
+        self.max_bytes = max_bytes or int(float(os.getenv('CONTENT_CACHE_MAX_MB', '100')) * 1024 * 1024)
+        if max_age_hours < 0:
+            max_age_hours = float(os.getenv('CONTENT_CACHE_MAX_AGE', '0'))
+        self.max_age = max_age_hours * 3600
+        self._index_path = os.path.join(self.directory, 'index.json')
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict] = {}
+        self.hits = 0
+        self.stores = 0   # entries written by put()
+        if os.path.exists(self._index_path):
+            try:
+                with open(self._index_path) as f:
+                    self._index = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Ignoring unreadable content cache index: {e}")
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.txt')
+
+    def fresh_text(self, url: str) -> Optional[str]:
+        """Cached text if the entry is within max_age (no request needed)."""
+        with self._lock:
+            entry = self._index.get(url)
+        if entry and self.max_age and time.time() - entry['fetched'] < self.max_age:
+            return self.hit(url)
+        return None
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional-request headers for a cached URL (empty if not cached)."""
+        with self._lock:
+            entry = self._index.get(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def hit(self, url: str) -> Optional[str]:
+        """Return cached text after a 304 (or fresh entry) and mark it used."""
+        try:
+            with open(self._path(url), encoding='utf-8') as f:
+                text = f.read()
+        except IOError:
+            with self._lock:
+                self._index.pop(url, None)
+            return None
+        with self._lock:
+            if url in self._index:
+                self._index[url]['used'] = time.time()
+            self.hits += 1
+        return text
+
+    def put(self, url: str, text: str, headers=None):
+        """Store extracted text with the response's validators."""
+        headers = headers or {}
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(url), 'w', encoding='utf-8') as f:
+            f.write(text)
+        now = time.time()
+        with self._lock:
+            self._index[url] = {
+                'file': os.path.basename(self._path(url)),
+                'etag': headers.get('ETag') or headers.get('etag'),
+                'last_modified': headers.get('Last-Modified') or headers.get('last_modified'),
+                'size': len(text.encode('utf-8')),
+                'fetched': now,
+                'used': now,
+            }
+            self.stores += 1
+
+    def save(self):
+        """Evict least-recently-used entries beyond max_bytes and write the index."""
+        with self._lock:
+            total = sum(e['size'] for e in self._index.values())
+            for url, entry in sorted(self._index.items(), key=lambda kv: kv[1]['used']):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, entry['file']))
+                except OSError:
+                    pass
+                total -= entry['size']
+                del self._index[url]
+            if not self._index and not os.path.isdir(self.directory):
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self._index_path, 'w') as f:
+                json.dump(self._index, f, indent=1)
+        logger.info(f"Content cache: {len(self._index)} entries, "
+                    f"{total / 1024 / 1024:.1f} MB, {self.hits} hits / {self.stores} stored this run")
@@ -19,29 +19,99 @@ OAuth env vars (preferred):
 Service account env vars (Shared Drives only):
   GOOGLE_SERVICE_ACCOUNT_JSON — service account key JSON (as string)
   GOOGLE_DRIVE_FOLDER_ID      — ID of the target Drive folder
+
+Round-trips are kept low: uploads run concurrently, "anyone with the link"
+grants go through the Drive batch endpoint (up to 100 per HTTP request),
+and folder-name → ID lookups are remembered in DRIVE_FOLDER_CACHE
+(default: .drive-folders.json) so a re-run skips the search query.
+fake_drive.py is an in-memory Drive service for exercising this module
+without credentials; test_drive_upload.py pins the round-trip counts.
 """
 
+import hashlib
 import json
 import logging
 import os
-from typing import Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Optional, Set
 
 logger = logging.getLogger(__name__)
 
+# Files at or above this size are sent as resumable (chunked) uploads.
+RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+RESUMABLE_CHUNKSIZE = 5 * 1024 * 1024
 
-def _get_drive_service(
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+# Calls per batch request allowed by the Drive API.
+BATCH_LIMIT = 100
+
+PUBLIC_READER = {'type': 'anyone', 'role': 'reader'}
+
+
+class FolderCache:
+    """Persistent (parent ID, folder name) → folder ID map."""
+
+    def __init__(self, path: str = ''):
+        self.path = path or os.getenv('DRIVE_FOLDER_CACHE', '.drive-folders.json')
+        self._lock = threading.Lock()
+        self._ids: Dict[str, str] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self._ids = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Ignoring unreadable Drive folder cache {self.path}: {e}")
+
+    @staticmethod
+    def _key(parent_id: str, folder_name: str) -> str:
+        return f"{parent_id}/{folder_name}"
+
+    def get(self, parent_id: str, folder_name: str) -> Optional[str]:
+        with self._lock:
+            return self._ids.get(self._key(parent_id, folder_name))
+
+    def put(self, parent_id: str, folder_name: str, folder_id: str):
+        with self._lock:
+            self._ids[self._key(parent_id, folder_name)] = folder_id
+            self._save()
+
+    def forget(self, parent_id: str, folder_name: str):
+        """Drop an ID that turned out to be stale (folder deleted/trashed)."""
+        with self._lock:
+            if self._ids.pop(self._key(parent_id, folder_name), None):
+                self._save()
+
+    def _save(self):
+        try:
+            with open(self.path, 'w') as f:
+                json.dump(self._ids, f, indent=1)
+        except IOError as e:
+            logger.warning(f"Could not write Drive folder cache {self.path}: {e}")
+
+
+_folder_cache: Optional[FolderCache] = None
+
+
+def _default_folder_cache() -> FolderCache:
+    global _folder_cache
+    if _folder_cache is None:
+        _folder_cache = FolderCache()
+    return _folder_cache
+
+
+def _get_drive_credentials(
     credentials_json: str = '',
     refresh_token: str = '',
     client_id: str = '',
     client_secret: str = '',
 ):
-    """Authenticate and return a Drive API service object.
+    """Return (credentials, auth type).
 
     Tries OAuth refresh token first (works with personal Drive),
     falls back to service account (Shared Drives only).
     """
-    from googleapiclient.discovery import build
-
     if refresh_token and client_id and client_secret:
         from google.oauth2.credentials import Credentials
 
@@ -53,7 +123,7 @@ def _get_drive_service(
             token_uri='https://oauth2.googleapis.com/token',
         )
         logger.info("Authenticated with OAuth refresh token")
-        return build('drive', 'v3', credentials=creds), 'oauth'
+        return creds, 'oauth'
 
     if credentials_json:
         from google.oauth2 import service_account
@@ -64,15 +134,78 @@ def _get_drive_service(
             scopes=['https://www.googleapis.com/auth/drive'],
         )
         logger.info("Authenticated with service account (Shared Drives only)")
-        return build('drive', 'v3', credentials=creds), 'service_account'
+        return creds, 'service_account'
 
     raise ValueError("No Drive credentials provided")
 
 
+def _build_service(creds):
+    from googleapiclient.discovery import build
+    return build('drive', 'v3', credentials=creds, cache_discovery=False)
+
+
+def _get_drive_service(
+    credentials_json: str = '',
+    refresh_token: str = '',
+    client_id: str = '',
+    client_secret: str = '',
+):
+    """Authenticate and return (Drive API service object, auth type)."""
+    creds, auth_type = _get_drive_credentials(
+        credentials_json=credentials_json,
+        refresh_token=refresh_token,
+        client_id=client_id,
+        client_secret=client_secret,
+    )
+    return _build_service(creds), auth_type
+
+
+def grant_public_read(service, file_ids: Iterable[str]) -> Set[str]:
+    """Make files viewable by anyone with the link, BATCH_LIMIT per request.
+
+    Returns the IDs whose permission was created.
+    """
+    file_ids = list(file_ids)
+    granted: Set[str] = set()
+
+    def _done(request_id, response, exception):
+        if exception is not None:
+            logger.warning(f"  Could not set public permission on {request_id}: {exception}")
+        else:
+            granted.add(request_id)
+
+    for start in range(0, len(file_ids), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=_done)
+        for file_id in file_ids[start:start + BATCH_LIMIT]:
+            batch.add(
+                service.permissions().create(
+                    fileId=file_id, body=PUBLIC_READER,
+                    fields='id', supportsAllDrives=True,
+                ),
+                request_id=file_id,
+            )
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.warning(f"  Permission batch failed: {e}")
+    return granted
+
+
 def create_or_get_subfolder(
     service, parent_id: str, folder_name: str, use_shared: bool = False,
+    cache: Optional[FolderCache] = None, make_public: bool = True,
 ) -> str:
-    """Create a subfolder in Drive (or return existing one's ID)."""
+    """Create a subfolder in Drive (or return existing one's ID).
+
+    IDs are remembered in the folder cache, so repeat calls cost no API
+    requests.  With make_public=False the caller is expected to grant the
+    new folder's public permission itself (e.g. in its permission batch).
+    """
+    cache = cache or _default_folder_cache()
+    cached = cache.get(parent_id, folder_name)
+    if cached:
+        return cached
+
     safe_name = folder_name.replace("\\", "\\\\").replace("'", "\\'")
     query = (
         f"'{parent_id}' in parents and name = '{safe_name}' "
@@ -86,6 +219,7 @@ def create_or_get_subfolder(
     )
     files = results.get('files', [])
     if files:
+        cache.put(parent_id, folder_name, files[0]['id'])
         return files[0]['id']
 
     metadata = {
@@ -100,19 +234,147 @@ def create_or_get_subfolder(
     )
 
     # Make viewable by anyone with the link
-    try:
-        service.permissions().create(
-            fileId=folder['id'],
-            body={'type': 'anyone', 'role': 'reader'},
-            supportsAllDrives=True,
-        ).execute()
-    except Exception as e:
-        logger.warning(f"Could not set public permissions on subfolder: {e}")
+    if make_public:
+        try:
+            service.permissions().create(
+                fileId=folder['id'],
+                body=PUBLIC_READER,
+                supportsAllDrives=True,
+            ).execute()
+        except Exception as e:
+            logger.warning(f"Could not set public permissions on subfolder: {e}")
 
+    cache.put(parent_id, folder_name, folder['id'])
     logger.info(f"Created Drive subfolder: {folder_name}")
     return folder['id']
 
 
+def file_md5(filepath: str) -> str:
+    """Hex MD5 of a local file, comparable to Drive's md5Checksum."""
+    h = hashlib.md5()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_previous_run_files(
+    service, parent_id: str, exclude_folder: Optional[str] = None,
+    name_prefix: str = '',
+) -> Dict[str, Dict]:
+    """Return the files in the most recently created subfolder of parent_id.
+
+    Used to compare this run's artifacts against the last uploaded copies.
+    Skips the folder named exclude_folder (normally today's run folder) and,
+    when name_prefix is set, folders whose name does not start with it.
+
+    Returns:
+        Dict mapping file name to {id, md5Checksum, webViewLink}.
+    """
+    query = (
+        f"'{parent_id}' in parents and mimeType = '{FOLDER_MIME}' "
+        f"and trashed = false"
+    )
+    if name_prefix:
+        safe_prefix = name_prefix.strip().replace("\\", "\\\\").replace("'", "\\'")
+        query += f" and name contains '{safe_prefix}'"
+    folders = (
+        service.files()
+        .list(q=query, orderBy='createdTime desc', pageSize=10,
+              fields='files(id, name)', supportsAllDrives=True,
+              includeItemsFromAllDrives=True)
+        .execute()
+        .get('files', [])
+    )
+    previous = next(
+        (f for f in folders
+         if f['name'] != exclude_folder and f['name'].startswith(name_prefix)),
+        None,
+    )
+    if not previous:
+        return {}
+
+    files = (
+        service.files()
+        .list(q=f"'{previous['id']}' in parents and trashed = false",
+              fields='files(id, name, md5Checksum, webViewLink)',
+              supportsAllDrives=True, includeItemsFromAllDrives=True)
+        .execute()
+        .get('files', [])
+    )
+    logger.info(f"Previous Drive run folder: {previous['name']} ({len(files)} files)")
+    return {f['name']: f for f in files}
+
+
+def upload_files(
+    service_factory: Callable,
+    files: Dict[str, str],
+    folder_id: str,
+    mimetype: str = 'application/octet-stream',
+    max_workers: int = 4,
+    errors: Optional[Dict[str, Exception]] = None,
+) -> Dict[str, Dict]:
+    """Upload local files into a Drive folder concurrently.
+
+    googleapiclient service objects are not thread-safe, so each worker
+    thread builds its own from service_factory.  Files of
+    RESUMABLE_THRESHOLD bytes or more use resumable uploads.
+
+    Args:
+        service_factory: Zero-arg callable returning a Drive service.
+        files: Dict mapping a key (e.g. file name) to local file path.
+        folder_id: Drive folder ID to upload into.
+        mimetype: MIME type for every file.
+        max_workers: Maximum concurrent uploads.
+        errors: If given, filled with key → exception for failed uploads.
+
+    Returns:
+        Dict mapping key to the created file's {id, webViewLink}.
+    """
+    from googleapiclient.http import MediaFileUpload
+
+    local = threading.local()
+
+    def _upload(filepath: str) -> Dict:
+        service = getattr(local, 'service', None)
+        if service is None:
+            service = local.service = service_factory()
+        resumable = os.path.getsize(filepath) >= RESUMABLE_THRESHOLD
+        media = MediaFileUpload(
+            filepath, mimetype=mimetype, resumable=resumable,
+            chunksize=RESUMABLE_CHUNKSIZE if resumable else -1,
+        )
+        return (
+            service.files()
+            .create(
+                body={'name': os.path.basename(filepath), 'parents': [folder_id]},
+                media_body=media,
+                fields='id, webViewLink',
+                supportsAllDrives=True,
+            )
+            .execute()
+        )
+
+    uploaded = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(files)))) as pool:
+        futures = {pool.submit(_upload, path): key for key, path in files.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                uploaded[key] = future.result()
+                logger.info(f"  Uploaded to Drive: {key}")
+            except Exception as e:
+                logger.warning(f"  Failed to upload {key}: {e}")
+                if errors is not None:
+                    errors[key] = e
+    return uploaded
+
+
+def _is_not_found(error: Exception) -> bool:
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    return status == 404 or 'notFound' in str(error)
+
+
 def upload_screenshots_to_drive(
     screenshots: Dict[str, str],
     folder_id: str,
@@ -121,9 +383,15 @@ def upload_screenshots_to_drive(
     refresh_token: str = '',
     client_id: str = '',
     client_secret: str = '',
+    service_factory: Optional[Callable] = None,
+    max_workers: int = 0,
 ) -> Dict[str, str]:
     """Upload screenshot files to Google Drive.
 
+    Uploads run concurrently (DRIVE_UPLOAD_WORKERS, default 4); public
+    permissions for the files (and a newly created subfolder) are then
+    granted in batch requests.
+
     Args:
         screenshots: Dict mapping state name to local file path.
         folder_id: Google Drive folder ID to upload into.
@@ -132,6 +400,9 @@ def upload_screenshots_to_drive(
         refresh_token: OAuth refresh token (preferred over service account).
         client_id: OAuth client ID.
         client_secret: OAuth client secret.
+        service_factory: Zero-arg callable returning a Drive service,
+            used instead of the credentials (e.g. fake_drive.FakeDrive().service).
+        max_workers: Concurrent uploads (default: DRIVE_UPLOAD_WORKERS or 4).
 
     Returns:
         Dict mapping state name to public Drive view URL.
@@ -140,7 +411,7 @@ def upload_screenshots_to_drive(
         return {}
 
     try:
-        from googleapiclient.http import MediaFileUpload
+        from googleapiclient.http import MediaFileUpload  # noqa: F401
     except ImportError:
         logger.warning(
             "Google API libraries not installed — skipping Drive upload. "
@@ -148,80 +419,84 @@ def upload_screenshots_to_drive(
         )
         return {}
 
-    try:
-        service, auth_type = _get_drive_service(
-            credentials_json=credentials_json,
-            refresh_token=refresh_token,
-            client_id=client_id,
-            client_secret=client_secret,
-        )
-    except Exception as e:
-        logger.error(f"Failed to authenticate with Google Drive: {e}")
-        return {}
+    if service_factory is None:
+        try:
+            creds, auth_type = _get_drive_credentials(
+                credentials_json=credentials_json,
+                refresh_token=refresh_token,
+                client_id=client_id,
+                client_secret=client_secret,
+            )
+        except Exception as e:
+            logger.error(f"Failed to authenticate with Google Drive: {e}")
+            return {}
 
-    use_shared = auth_type == 'service_account'
+        # One set of credentials (one token refresh) shared by every
+        # thread's service object
+        def service_factory():
+            return _build_service(creds)
+
+    service = service_factory()
+    max_workers = max_workers or int(os.getenv('DRIVE_UPLOAD_WORKERS', '4'))
+
+    files = {}
+    for name, filepath in screenshots.items():
+        if not os.path.exists(filepath):
+            logger.warning(f"  Screenshot file not found: {filepath}")
+            continue
+        files[name] = filepath
 
     # Use subfolder if requested
+    cache = _default_folder_cache()
     target_folder = folder_id
+    from_cache = False
+    new_folder = None
     if subfolder_name:
+        from_cache = cache.get(folder_id, subfolder_name) is not None
         try:
             target_folder = create_or_get_subfolder(
-                service, folder_id, subfolder_name, use_shared=use_shared,
+                service, folder_id, subfolder_name, cache=cache, make_public=False,
             )
+            if not from_cache:
+                new_folder = target_folder
         except Exception as e:
             logger.warning(f"Could not create subfolder '{subfolder_name}': {e}")
 
-    drive_links = {}
-
-    for name, filepath in screenshots.items():
-        if not os.path.exists(filepath):
-            logger.warning(f"  Screenshot file not found: {filepath}")
-            continue
-
-        logger.info(f"  Uploading to Drive: {name}")
+    logger.info(f"  Uploading {len(files)} files to Drive ({max_workers} at a time)")
+    errors: Dict[str, Exception] = {}
+    uploaded = upload_files(service_factory, files, target_folder,
+                            mimetype='image/png', max_workers=max_workers, errors=errors)
 
+    # A cached folder ID can go stale if the folder was deleted — look it
+    # up again and retry once
+    if from_cache and files and not uploaded and all(_is_not_found(e) for e in errors.values()):
+        logger.info(f"  Cached ID for Drive subfolder '{subfolder_name}' is stale — re-resolving")
+        cache.forget(folder_id, subfolder_name)
         try:
-            file_metadata = {
-                'name': os.path.basename(filepath),
-                'parents': [target_folder],
-            }
-            media = MediaFileUpload(filepath, mimetype='image/png')
-
-            file = (
-                service.files()
-                .create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields='id, webViewLink',
-                    supportsAllDrives=True,
-                )
-                .execute()
+            target_folder = new_folder = create_or_get_subfolder(
+                service, folder_id, subfolder_name, cache=cache, make_public=False,
             )
+            errors = {}
+            uploaded = upload_files(service_factory, files, target_folder,
+                                    mimetype='image/png', max_workers=max_workers, errors=errors)
+        except Exception as e:
+            logger.warning(f"Could not create subfolder '{subfolder_name}': {e}")
 
-            # Make the file viewable by anyone with the link
-            try:
-                service.permissions().create(
-                    fileId=file['id'],
-                    body={'type': 'anyone', 'role': 'reader'},
-                    supportsAllDrives=True,
-                ).execute()
-            except Exception as e:
-                logger.warning(f"  Could not set public permission for {name}: {e}")
-
-            drive_links[name] = file.get('webViewLink', '')
-            logger.info(f"  Uploaded: {drive_links[name]}")
+    if any('storageQuotaExceeded' in str(e) for e in errors.values()):
+        logger.error(
+            "  Storage quota exceeded. "
+            "Service accounts have zero storage on regular Drive. "
+            "Fix: use OAuth credentials (run setup_drive_oauth.py) "
+            "or move the folder to a Shared Drive."
+        )
 
-        except Exception as e:
-            error_str = str(e)
-            if 'storageQuotaExceeded' in error_str:
-                logger.error(
-                    f"  Storage quota exceeded uploading {name}. "
-                    "Service accounts have zero storage on regular Drive. "
-                    "Fix: use OAuth credentials (run setup_drive_oauth.py) "
-                    "or move the folder to a Shared Drive."
-                )
-                break  # No point retrying — all uploads will fail
-            logger.warning(f"  Failed to upload {name}: {e}")
+    # Make the files (and a newly created subfolder) viewable by anyone
+    # with the link
+    to_grant = [f['id'] for f in uploaded.values()]
+    if new_folder:
+        to_grant.append(new_folder)
+    grant_public_read(service, to_grant)
 
+    drive_links = {name: f.get('webViewLink', '') for name, f in uploaded.items()}
     logger.info(f"Uploaded {len(drive_links)}/{len(screenshots)} screenshots to Drive")
     return drive_links
@@ -0,0 +1,207 @@
+"""
+In-memory stand-in for the Google Drive v3 service used by drive_upload.py.
+
+Implements the subset the uploaders call — files().create/list/get,
+permissions().create and new_batch_http_request — and counts HTTP
+round-trips the way the real client would make them: one per execute(),
+one per batch, and for resumable uploads one to open the session plus one
+per chunk.
+
+    drive = FakeDrive()
+    links = upload_screenshots_to_drive(files, 'root', service_factory=drive.service)
+    print(drive.round_trips)
+
+test_drive_upload.py uses it to check round-trip counts, folder-cache
+hits and stale-folder recovery.
+"""
+
+import itertools
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List
+
+FOLDER_MIME = 'application/vnd.google-apps.folder'
+
+
+class FakeHttpError(Exception):
+    """Mimics googleapiclient.errors.HttpError's resp.status."""
+
+    class _Resp:
+        def __init__(self, status):
+            self.status = status
+
+    def __init__(self, status: int, reason: str):
+        super().__init__(f"<HttpError {status}: {reason}>")
+        self.resp = self._Resp(status)
+
+
+class _Request:
+    def __init__(self, drive: 'FakeDrive', kind: str, fn, trips: int = 1):
+        self._drive = drive
+        self.kind = kind
+        self._fn = fn
+        self._trips = trips
+
+    def execute(self):
+        self._drive._count(self.kind, self._trips)
+        return self._fn()
+
+
+class _Batch:
+    def __init__(self, drive: 'FakeDrive', callback=None):
+        self._drive = drive
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request: _Request, callback=None, request_id=None):
+        if len(self._requests) >= 100:
+            raise ValueError("Exceeded the maximum of 100 calls in a single batch")
+        self._requests.append((request, callback or self._callback,
+                               request_id or str(len(self._requests) + 1)))
+
+    def execute(self):
+        self._drive._count('batch', 1)
+        for request, callback, request_id in self._requests:
+            try:
+                response, exception = request._fn(), None
+            except Exception as e:
+                response, exception = None, e
+            self._drive._count(f"batched {request.kind}", 0)
+            if callback:
+                callback(request_id, response, exception)
+
+
+class _Files:
+    def __init__(self, drive: 'FakeDrive'):
+        self._drive = drive
+
+    def create(self, body=None, media_body=None, fields=None, supportsAllDrives=False):
+        trips = 1
+        if media_body is not None and getattr(media_body, 'resumable', lambda: False)():
+            chunk = media_body.chunksize()
+            trips = 1 + max(1, math.ceil(media_body.size() / chunk)) if chunk > 0 else 2
+        return _Request(self._drive, 'files.create',
+                        lambda: self._drive._create(dict(body or {}), media_body), trips)
+
+    def list(self, q='', fields=None, orderBy=None, pageSize=None,
+             supportsAllDrives=False, includeItemsFromAllDrives=False):
+        return _Request(self._drive, 'files.list',
+                        lambda: {'files': self._drive._query(q, orderBy, pageSize)})
+
+    def get(self, fileId, fields=None, supportsAllDrives=False):
+        return _Request(self._drive, 'files.get', lambda: self._drive._get(fileId))
+
+
+class _Permissions:
+    def __init__(self, drive: 'FakeDrive'):
+        self._drive = drive
+
+    def create(self, fileId, body, fields=None, supportsAllDrives=False):
+        return _Request(self._drive, 'permissions.create',
+                        lambda: self._drive._permit(fileId, body))
+
+
+class FakeDriveService:
+    def __init__(self, drive: 'FakeDrive'):
+        self._drive = drive
+
+    def files(self):
+        return _Files(self._drive)
+
+    def permissions(self):
+        return _Permissions(self._drive)
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self._drive, callback)
+
+
+class FakeDrive:
+    """Shared in-memory Drive; service() may be called once per thread."""
+
+    def __init__(self, root_id: str = 'root'):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.files: Dict[str, Dict] = {
+            root_id: {'id': root_id, 'name': 'root', 'mimeType': FOLDER_MIME,
+                      'parents': [], 'trashed': False, 'createdTime': 0},
+        }
+        self.permissions: Dict[str, List[Dict]] = {}
+        self.calls: Counter = Counter()
+        self.round_trips = 0
+
+    def service(self) -> FakeDriveService:
+        return FakeDriveService(self)
+
+    def _count(self, kind: str, trips: int):
+        with self._lock:
+            self.calls[kind] += 1
+            self.round_trips += trips
+
+    def _create(self, body: Dict, media_body) -> Dict:
+        with self._lock:
+            for parent in body.get('parents', []):
+                if parent not in self.files or self.files[parent]['trashed']:
+                    raise FakeHttpError(404, f"notFound: File not found: {parent}")
+            file_id = f"fake{next(self._ids)}"
+            entry = {
+                'id': file_id,
+                'name': body.get('name', 'Untitled'),
+                'mimeType': body.get('mimeType') or getattr(media_body, 'mimetype', lambda: '')(),
+                'parents': body.get('parents', []),
+                'trashed': False,
+                'createdTime': len(self.files),
+                'webViewLink': f"https://drive.google.com/file/d/{file_id}/view",
+            }
+            self.files[file_id] = entry
+            return {'id': file_id, 'webViewLink': entry['webViewLink']}
+
+    def _get(self, file_id: str) -> Dict:
+        with self._lock:
+            if file_id not in self.files:
+                raise FakeHttpError(404, f"notFound: File not found: {file_id}")
+            return dict(self.files[file_id])
+
+    def _permit(self, file_id: str, body: Dict) -> Dict:
+        with self._lock:
+            if file_id not in self.files:
+                raise FakeHttpError(404, f"notFound: File not found: {file_id}")
+            self.permissions.setdefault(file_id, []).append(dict(body))
+            return {'id': f"perm-{file_id}"}
+
+    def _query(self, q: str, order_by=None, page_size=None) -> List[Dict]:
+        """Evaluate the `'X' in parents and name = 'Y' and ...` queries the
+        uploaders build (unescaping \\' and \\\\)."""
+        def unescape(v):
+            return v.replace("\\'", "'").replace('\\\\', '\\')
+
+        string = r"'((?:[^'\\]|\\.)*)'"
+        checks = []
+        for clause in re.split(r'\s+and\s+', q.strip()):
+            if m := re.fullmatch(string + r'\s+in\s+parents', clause):
+                parent = unescape(m.group(1))
+                checks.append(lambda f, p=parent: p in f['parents'])
+            elif m := re.fullmatch(r'(name|mimeType)\s*=\s*' + string, clause):
+                field, value = m.group(1), unescape(m.group(2))
+                checks.append(lambda f, k=field, v=value: f[k] == v)
+            elif m := re.fullmatch(r'name\s+contains\s+' + string, clause):
+                value = unescape(m.group(1))
+                checks.append(lambda f, v=value: v in f['name'])
+            elif re.fullmatch(r'trashed\s*=\s*false', clause):
+                checks.append(lambda f: not f['trashed'])
+            else:
+                raise ValueError(f"Unsupported query clause: {clause}")
+        with self._lock:
+            found = [dict(f) for f in self.files.values() if all(c(f) for c in checks)]
+        if order_by == 'createdTime desc':
+            found.sort(key=lambda f: f['createdTime'], reverse=True)
+        return found[:page_size] if page_size else found
+
+    def trash(self, file_id: str):
+        with self._lock:
+            self.files[file_id]['trashed'] = True
+
+    def is_public(self, file_id: str) -> bool:
+        return any(p.get('type') == 'anyone' for p in self.permissions.get(file_id, []))
+
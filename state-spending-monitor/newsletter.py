@@ -18,18 +18,32 @@ Optional env vars:
   MONDAY_API_TOKEN        — monday.com API token (for topics board)
   MONDAY_TOPICS_BOARD_ID  — monday.com topics board ID
   LOOKBACK_DAYS           — days to look back for changes (default: 7)
+  ISSUE_STORE_FILE        — local store of parsed url-monitor issues
+                            (default: newsletter-issues.json)
+  SNAPSHOTS_FILE          — URL monitor snapshots; changed pages are read from
+                            here instead of re-fetched (default: snapshots.json)
+  SNAPSHOT_MAX_AGE_HOURS  — older snapshots are re-fetched live (default: 36)
+  ENRICH_WORKERS          — concurrent fetches for enrichment (default: 1 =
+                            sequential; >1 enables the pipelined mode)
+  ENRICH_PER_HOST         — max concurrent fetches per host (default: 2)
+  PDF_WORKERS             — PDF text-extraction processes (default: 2; see
+                            pdf_text.py for PDF_TIMEOUT / PDF_MEMORY_MB)
+  CONTENT_CACHE_DIR       — on-disk cache of linked-document text
+                            (default: .content-cache; see content_cache.py)
+  CONTENT_CACHE_MAX_MB    — size bound for the content cache (default: 100)
 """
 
-import io
 import json
 import logging
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
-from urllib.parse import urljoin, urlparse
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
 
 try:
     import requests
@@ -41,12 +55,8 @@ except ImportError as e:
     print("Install with: pip install requests beautifulsoup4 lxml")
     sys.exit(1)
 
-# Optional PDF support
-try:
-    from pypdf import PdfReader
-    HAS_PYPDF = True
-except ImportError:
-    HAS_PYPDF = False
+from content_cache import ContentCache
+from pdf_text import HAS_PYPDF, PDFExtractor  # PDF support is optional (pypdf)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -76,61 +86,178 @@ def make_session() -> requests.Session:
     })
     session.trust_env = False
     retry = Retry(total=2, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-    session.mount('https://', HTTPAdapter(max_retries=retry))
-    session.mount('http://', HTTPAdapter(max_retries=retry))
+    session.mount('https://', HTTPAdapter(max_retries=retry, pool_maxsize=16))
+    session.mount('http://', HTTPAdapter(max_retries=retry, pool_maxsize=16))
     return session
 
 
 SESSION = make_session()
+CONTENT_CACHE = ContentCache()
+PDF_EXTRACTOR = PDFExtractor()
+
+
+def conditional_get(url: str, timeout: int, stream: bool = False):
+    """GET with the content cache's validators.
+
+    Returns (response, cached_text): cached_text is set (and response is
+    None) when the cache answered — a fresh entry or a 304.
+    """
+    cached = CONTENT_CACHE.fresh_text(url)
+    if cached is not None:
+        return None, cached
+    resp = SESSION.get(url, timeout=timeout, allow_redirects=True, stream=stream,
+                       headers=CONTENT_CACHE.validators(url))
+    if resp.status_code == 304:
+        cached = CONTENT_CACHE.hit(url)
+        if cached is not None:
+            return None, cached
+        # Index pointed at a missing text file — refetch unconditionally
+        # (closing the 304 first so its pooled connection is released)
+        resp.close()
+        resp = SESSION.get(url, timeout=timeout, allow_redirects=True, stream=stream)
+    return resp, None
 
 
 # ── GitHub: collect changes from url-monitor issues ───────────────────
 
-def fetch_weekly_changes(token: str, repo: str, lookback_days: int = 7) -> List[Dict]:
-    """Fetch url-monitor issues with page-changed label from the past week."""
-    since = (datetime.now(timezone.utc) - timedelta(days=lookback_days)).isoformat()
+ISSUE_STORE_FILE = os.getenv('ISSUE_STORE_FILE', 'newsletter-issues.json')
+ISSUE_RETAIN_DAYS = 90
 
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json',
-    }
 
-    url = f'https://api.github.com/repos/{repo}/issues'
-    params = {
-        'labels': 'url-monitor,page-changed',
-        'since': since,
-        'state': 'open',
-        'sort': 'created',
-        'direction': 'desc',
-        'per_page': 50,
-    }
+class IssueStore:
+    """Local store of parsed url-monitor issues, keyed by issue number.
 
-    resp = requests.get(url, headers=headers, params=params, timeout=30)
-    resp.raise_for_status()
-    issues = resp.json()
+    sync() pulls only issues updated since the last sync, following the
+    GitHub API's Link-header pagination, and sends the previous ETag so an
+    unchanged listing costs a 304.  Issue bodies are parsed only when an
+    issue is new or its updated_at moved.  changes_since() is then a local
+    query.
+    """
 
-    logger.info(f"Found {len(issues)} page-changed issues in the past {lookback_days} days")
+    def __init__(self, path: str = ISSUE_STORE_FILE):
+        self.path = path
+        self.data = {'etag': None, 'etag_since': None, 'synced_through': None,
+                     'coverage_start': None, 'issues': {}}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.data.update(json.load(f))
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Ignoring unreadable issue store {path}: {e}")
+
+    def sync(self, token: str, repo: str, cutoff: datetime):
+        """Fetch new/edited page-changed issues into the store."""
+        headers = {
+            'Authorization': f'token {token}',
+            'Accept': 'application/vnd.github.v3+json',
+        }
+        issues = self.data['issues']
+        coverage = self.data['coverage_start']
+        if coverage and datetime.fromisoformat(coverage) <= cutoff and self.data['synced_through']:
+            since = self.data['synced_through']
+        else:
+            # First run, or a longer lookback than the store covers
+            since = cutoff.isoformat()
+            self.data['etag'] = None
+
+        url = f'https://api.github.com/repos/{repo}/issues'
+        params = {
+            'labels': 'url-monitor,page-changed',
+            'since': since,
+            'state': 'all',
+            'sort': 'updated',
+            'direction': 'asc',
+            'per_page': 100,
+        }
+        first_headers = dict(headers)
+        if self.data['etag'] and self.data['etag_since'] == since:
+            first_headers['If-None-Match'] = self.data['etag']
+
+        resp = requests.get(url, headers=first_headers, params=params, timeout=30)
+        if resp.status_code == 304:
+            logger.info("Issue listing unchanged since last sync (304)")
+            return
+        resp.raise_for_status()
+        self.data['etag'] = resp.headers.get('ETag')
+        self.data['etag_since'] = since
+
+        fetched = parsed = 0
+        latest = since
+        while True:
+            for issue in resp.json():
+                if 'pull_request' in issue:
+                    continue
+                fetched += 1
+                latest = max(latest, issue['updated_at'])
+                key = str(issue['number'])
+                stored = issues.get(key)
+                if stored and stored['updated_at'] == issue['updated_at']:
+                    continue
+                issues[key] = self._parse(issue)
+                parsed += 1
+            next_url = resp.links.get('next', {}).get('url')
+            if not next_url:
+                break
+            resp = requests.get(next_url, headers=headers, timeout=30)
+            resp.raise_for_status()
 
-    changes = []
-    cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
-    for issue in issues:
-        created = datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
-        if created < cutoff:
-            continue
+        logger.info(f"Issue sync: {fetched} issues updated since {since}, {parsed} parsed")
+        if not coverage or datetime.fromisoformat(coverage) > cutoff:
+            self.data['coverage_start'] = cutoff.isoformat()
+        self.data['synced_through'] = latest
 
-        body = issue.get('body', '')
-        title = issue.get('title', '')
-        date_match = re.search(r'\d{4}-\d{2}-\d{2}', title)
+    @staticmethod
+    def _parse(issue: Dict) -> Dict:
+        created = datetime.fromisoformat(issue['created_at'].replace('Z', '+00:00'))
+        date_match = re.search(r'\d{4}-\d{2}-\d{2}', issue.get('title', ''))
         issue_date = date_match.group(0) if date_match else created.strftime('%Y-%m-%d')
-
-        parsed = parse_issue_changes(body)
-        for change in parsed:
+        changes = parse_issue_changes(issue.get('body') or '')
+        for change in changes:
             change['date'] = issue_date
             change['issue_number'] = issue['number']
+        return {
+            'created_at': created.isoformat(),
+            'updated_at': issue['updated_at'],
+            'state': issue['state'],
+            'changes': changes,
+        }
+
+    def changes_since(self, cutoff: datetime) -> List[Dict]:
+        """Changes from open issues created after cutoff, newest issue first."""
+        recent = [
+            i for i in self.data['issues'].values()
+            if i['state'] == 'open' and datetime.fromisoformat(i['created_at']) >= cutoff
+        ]
+        recent.sort(key=lambda i: i['created_at'], reverse=True)
+        return [dict(c) for i in recent for c in i['changes']]
+
+    def save(self):
+        """Drop issues older than ISSUE_RETAIN_DAYS and write the store."""
+        horizon = datetime.now(timezone.utc) - timedelta(days=ISSUE_RETAIN_DAYS)
+        self.data['issues'] = {
+            k: v for k, v in self.data['issues'].items()
+            if datetime.fromisoformat(v['created_at']) >= horizon
+        }
+        coverage = self.data['coverage_start']
+        if coverage and datetime.fromisoformat(coverage) < horizon:
+            self.data['coverage_start'] = horizon.isoformat()
+        with open(self.path, 'w') as f:
+            json.dump(self.data, f, indent=1)
+
+
+def fetch_weekly_changes(token: str, repo: str, lookback_days: int = 7) -> List[Dict]:
+    """Changes from url-monitor page-changed issues opened in the lookback window.
 
-        changes.extend(parsed)
+    Syncs the local IssueStore (only new or edited issues are fetched and
+    parsed), then answers the lookback from the store.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    store = IssueStore()
+    store.sync(token, repo, cutoff)
+    store.save()
 
-    logger.info(f"Extracted {len(changes)} state changes total")
+    changes = store.changes_since(cutoff)
+    logger.info(f"Extracted {len(changes)} state changes from the past {lookback_days} days")
     return changes
 
 
@@ -198,18 +325,110 @@ def parse_issue_changes(body: str) -> List[Dict]:
 
 # ── Link enrichment: follow key links on changed pages ────────────────
 
-def enrich_changes(changes: List[Dict]) -> List[Dict]:
-    """For each changed state, re-fetch the page and follow key links.
+MAX_LINKS_PER_STATE = 10
+PAGE_CONTENT_CHARS = 5000
+LINK_CONTENT_CHARS = 3000
 
-    Adds 'page_content', 'key_links', and 'linked_content' to each change dict.
+
+SNAPSHOTS_FILE = os.getenv('SNAPSHOTS_FILE', 'snapshots.json')
+SNAPSHOT_MAX_AGE_HOURS = float(os.getenv('SNAPSHOT_MAX_AGE_HOURS', '36'))
+
+
+def load_page_snapshots(path: str = SNAPSHOTS_FILE) -> Dict[str, Dict]:
+    """URL monitor snapshots (url → {content, links, last_checked, ...})."""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        logger.warning(f"Could not read URL monitor snapshots {path}: {e}")
+        return {}
+
+
+def snapshot_page(snapshots: Dict[str, Dict], url: str):
+    """(text, links) from a fresh URL-monitor snapshot, or None.
+
+    A snapshot is usable if it has content and an outbound-link list (older
+    snapshots predate 'links') and was checked within SNAPSHOT_MAX_AGE_HOURS.
     """
-    # Deduplicate by URL (a state may appear in multiple daily issues)
+    entry = snapshots.get(url)
+    if not entry or not entry.get('content') or 'links' not in entry:
+        return None
+    try:
+        checked = datetime.fromisoformat(entry['last_checked'])
+    except (KeyError, ValueError):
+        return None
+    if datetime.now() - checked > timedelta(hours=SNAPSHOT_MAX_AGE_HOURS):
+        return None
+    return entry['content'], entry['links']
+
+
+def fetch_page_links(url: str):
+    """Fetch a page live; return (text, links) or (None, None)."""
+    page_text, soup = fetch_page_with_soup(url)
+    if not page_text:
+        return None, None
+    return page_text, page_links(soup, url)
+
+
+# Query parameters that never change the document served
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', '_ga', '_gl'}
+
+
+def canonical_url(url: str) -> str:
+    """Canonical form of a link for cross-state deduplication.
+
+    Lowercases scheme/host, drops default ports, fragments, tracking
+    parameters and a trailing slash, and sorts the query, so
+    'HTTPS://www.cms.gov/rhtp/?utm_source=x#top' and
+    'https://www.cms.gov/rhtp' are one document.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if parsed.port and (scheme, parsed.port) not in (('http', 80), ('https', 443)):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunparse((scheme, host, path, '', urlencode(query), ''))
+
+
+def _unique_by_url(changes: List[Dict]) -> List[Dict]:
+    """Deduplicate by URL (a state may appear in multiple daily issues)."""
     seen_urls = set()
     unique_changes = []
     for c in changes:
         if c['url'] not in seen_urls:
             seen_urls.add(c['url'])
             unique_changes.append(c)
+    return unique_changes
+
+
+def enrich_changes(changes: List[Dict], workers: int = 1, per_host: int = 2,
+                   snapshots: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """For each changed state, load the page and follow key links.
+
+    The page text and its links come from the URL monitor's snapshot when a
+    fresh one exists (no request); otherwise the page is fetched live.
+    Adds 'page_content', 'key_links', and 'linked_content' to each change dict.
+    Linked documents are fetched once per canonical URL across all states and
+    attached to every state that links to them.
+    With workers > 1 the pipelined mode is used (see _enrich_pipelined); its
+    output is identical to the sequential path.
+    """
+    if snapshots is None:
+        snapshots = load_page_snapshots()
+    if workers > 1:
+        return _enrich_pipelined(changes, workers, per_host, snapshots)
+
+    unique_changes = _unique_by_url(changes)
+    documents: Dict[str, Optional[str]] = {}  # canonical URL → extracted text
 
     for change in unique_changes:
         url = change['url']
@@ -218,38 +437,151 @@ def enrich_changes(changes: List[Dict]) -> List[Dict]:
 
         logger.info(f"Enriching: {change['state']} — {url}")
 
-        # Fetch the main page
-        page_text, soup = fetch_page_with_soup(url)
+        # Main page: URL-monitor snapshot, else a live fetch
+        snapshot = snapshot_page(snapshots, url)
+        if snapshot:
+            page_text, links = snapshot
+            logger.info(f"  Using URL monitor snapshot")
+        else:
+            page_text, links = fetch_page_links(url)
         if not page_text:
             logger.warning(f"  Could not fetch page for enrichment")
             continue
 
-        change['page_content'] = page_text[:5000]  # Cap at 5k chars
+        change['page_content'] = page_text[:PAGE_CONTENT_CHARS]
 
-        # Extract key links from the page
-        key_links = extract_key_links(soup, url)
+        # Pick key links from the page's links
+        key_links = select_key_links(links, url)
         change['key_links'] = key_links
         logger.info(f"  Found {len(key_links)} key links")
 
         # Follow key links and extract content
         linked_content = []
-        for link in key_links[:10]:  # Cap at 10 links per state
+        for link in key_links[:MAX_LINKS_PER_STATE]:
             link_url = link['url']
             link_label = link['label']
-            logger.info(f"  Following: {link_label} — {link_url}")
-
-            content = fetch_link_content(link_url)
+            canonical = canonical_url(link_url)
+            if canonical in documents:
+                logger.info(f"  Already fetched: {link_label} — {link_url}")
+            else:
+                logger.info(f"  Following: {link_label} — {link_url}")
+                documents[canonical] = fetch_link_content(link_url)
+                time.sleep(0.5)
+
+            content = documents[canonical]
             if content:
                 linked_content.append({
                     'url': link_url,
                     'label': link_label,
-                    'content': content[:3000],  # Cap each link
+                    'content': content[:LINK_CONTENT_CHARS],
                 })
 
-            time.sleep(0.5)
-
         change['linked_content'] = linked_content
-        time.sleep(1)
+        if not snapshot:
+            time.sleep(1)
+
+    return changes
+
+
+def _enrich_pipelined(changes: List[Dict], workers: int, per_host: int,
+                      snapshots: Dict[str, Dict]) -> List[Dict]:
+    """Pipelined enrichment: page fetches and link follows share a thread pool
+    (at most per_host in flight per host), PDF text extraction runs in
+    PDF_EXTRACTOR's process pool, and results are reassembled in page/link order.
+
+    Work is chained as it completes — a page's links are queued as soon as
+    the page arrives, a PDF is handed to the extractors as soon as its bytes
+    arrive — so no stage waits for the whole previous stage.  The link queue
+    is global and keyed by canonical URL, so a document several states link
+    to is fetched and extracted once.
+    """
+    unique_changes = _unique_by_url(changes)
+    host_limits: Dict[str, threading.Semaphore] = {}
+    host_lock = threading.Lock()
+
+    def limited(url, fn, *args):
+        host = urlparse(url).netloc.lower()
+        with host_lock:
+            sem = host_limits.setdefault(host, threading.Semaphore(per_host))
+        with sem:
+            return fn(*args)
+
+    documents: Dict[str, Optional[str]] = {}  # canonical URL → extracted text
+    queued = set()
+    key_links_by_change: Dict[int, List[Dict]] = {}
+    pdf_headers: Dict[str, Dict] = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as io_pool:
+        pending = {}
+
+        def on_page(key, page_text, links):
+            change = unique_changes[key]
+            if not page_text:
+                logger.warning(f"  Could not fetch page for enrichment: {change['state']}")
+                return
+            change['page_content'] = page_text[:PAGE_CONTENT_CHARS]
+            key_links = select_key_links(links, change['url'])
+            change['key_links'] = key_links
+            key_links_by_change[key] = key_links[:MAX_LINKS_PER_STATE]
+            logger.info(f"  {change['state']}: found {len(key_links)} key links")
+            for link in key_links_by_change[key]:
+                link_url = link['url']
+                canonical = canonical_url(link_url)
+                if canonical in queued:
+                    continue
+                queued.add(canonical)
+                if HAS_PYPDF and urlparse(link_url).path.lower().endswith('.pdf'):
+                    f = io_pool.submit(limited, link_url, download_pdf, link_url)
+                    pending[f] = ('pdf_bytes', (canonical, link_url))
+                else:
+                    f = io_pool.submit(limited, link_url, fetch_link_content, link_url)
+                    pending[f] = ('link', (canonical, link_url))
+
+        for i, change in enumerate(unique_changes):
+            if change['url']:
+                logger.info(f"Enriching: {change['state']} — {change['url']}")
+                snapshot = snapshot_page(snapshots, change['url'])
+                if snapshot:
+                    on_page(i, *snapshot)
+                else:
+                    fut = io_pool.submit(limited, change['url'], fetch_page_links, change['url'])
+                    pending[fut] = ('page', i)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                kind, key = pending.pop(fut)
+                if kind == 'page':
+                    on_page(key, *fut.result())
+                elif kind == 'pdf_bytes':
+                    canonical, link_url = key
+                    download = fut.result()
+                    if download is None or 'text' in download:
+                        documents[canonical] = download and download['text']
+                        continue
+                    f = PDF_EXTRACTOR.submit(download['path'], LINK_CONTENT_CHARS)
+                    pending[f] = ('pdf_text', key)
+                    pdf_headers[canonical] = download['headers']
+                elif kind == 'pdf_text':
+                    canonical, link_url = key
+                    text = documents[canonical] = PDF_EXTRACTOR.result(fut)
+                    if text:
+                        CONTENT_CACHE.put(link_url, text, pdf_headers.pop(canonical))
+                else:
+                    documents[key[0]] = fut.result()
+
+    logger.info(f"Fetched {len(documents)} unique linked documents")
+    for i, links in key_links_by_change.items():
+        linked_content = []
+        for link in links:
+            content = documents.get(canonical_url(link['url']))
+            if content:
+                linked_content.append({
+                    'url': link['url'],
+                    'label': link['label'],
+                    'content': content[:LINK_CONTENT_CHARS],
+                })
+        unique_changes[i]['linked_content'] = linked_content
 
     return changes
 
@@ -279,13 +611,15 @@ def fetch_page_with_soup(url: str):
     return '\n'.join(lines), soup
 
 
-def extract_key_links(soup: BeautifulSoup, base_url: str) -> List[Dict]:
-    """Extract links that are likely important: PDFs, subpages, forms, media."""
+def page_links(soup: BeautifulSoup, base_url: str) -> List[Dict]:
+    """Absolute {url, label} links from the page's main content, deduplicated.
+
+    Same shape as the 'links' list the URL monitor stores in its snapshots.
+    """
     if not soup:
         return []
 
-    base_domain = urlparse(base_url).netloc
-    key_links = []
+    links = []
     seen = set()
 
     # Look in main content area first, fall back to whole page
@@ -297,13 +631,29 @@ def extract_key_links(soup: BeautifulSoup, base_url: str) -> List[Dict]:
             continue
 
         full_url = urljoin(base_url, href)
-        parsed = urlparse(full_url)
-
         if full_url in seen:
             continue
         seen.add(full_url)
 
-        label = a.get_text(strip=True)[:100] or href.split('/')[-1]
+        links.append({'url': full_url, 'label': a.get_text(strip=True)[:100] or href.split('/')[-1]})
+
+    return links
+
+
+def select_key_links(links: List[Dict], base_url: str) -> List[Dict]:
+    """Pick the links that are likely important: PDFs, subpages, forms, media."""
+    base_domain = urlparse(base_url).netloc
+    key_links = []
+    seen = set()
+
+    for link in links:
+        full_url = link['url']
+        label = link['label']
+        canonical = canonical_url(full_url)
+        if canonical in seen:
+            continue
+        seen.add(canonical)
+        parsed = urlparse(full_url)
         path_lower = parsed.path.lower()
 
         # Score relevance
@@ -330,14 +680,19 @@ def extract_key_links(soup: BeautifulSoup, base_url: str) -> List[Dict]:
 
 
 def fetch_link_content(url: str) -> Optional[str]:
-    """Fetch content from a link — handles HTML pages and PDFs."""
+    """Fetch content from a link — handles HTML pages and PDFs.
+
+    Extracted text is served from / stored in CONTENT_CACHE.
+    """
     parsed = urlparse(url)
 
     if parsed.path.lower().endswith('.pdf'):
         return fetch_pdf_text(url)
 
     try:
-        resp = SESSION.get(url, timeout=15, allow_redirects=True)
+        resp, cached = conditional_get(url, timeout=15)
+        if cached is not None:
+            return cached
         if resp.status_code != 200:
             return None
     except requests.exceptions.RequestException:
@@ -350,30 +705,46 @@ def fetch_link_content(url: str) -> Optional[str]:
     main = soup.find('main') or soup.find('article') or soup
     text = main.get_text(separator='\n', strip=True)
     lines = [line.strip() for line in text.splitlines() if line.strip()]
-    return '\n'.join(lines)
+    text = '\n'.join(lines)
+    if text:
+        CONTENT_CACHE.put(url, text, resp.headers)
+    return text
 
 
 def fetch_pdf_text(url: str) -> Optional[str]:
-    """Download a PDF and extract text."""
+    """Download a PDF and extract text (cached text skips both steps)."""
     if not HAS_PYPDF:
         return f"[PDF at {url} — pypdf not installed for text extraction]"
 
-    try:
-        resp = SESSION.get(url, timeout=30)
-        if resp.status_code != 200:
-            return None
+    download = download_pdf(url)
+    if download is None:
+        return None
+    if 'text' in download:
+        return download['text']
+    text = PDF_EXTRACTOR.extract(download['path'], LINK_CONTENT_CHARS)
+    if text:
+        CONTENT_CACHE.put(url, text, download['headers'])
+    return text
 
-        reader = PdfReader(io.BytesIO(resp.content))
-        pages_text = []
-        for i, page in enumerate(reader.pages[:20]):  # Cap at 20 pages
-            text = page.extract_text()
-            if text:
-                pages_text.append(text)
 
-        return '\n'.join(pages_text) if pages_text else None
+def download_pdf(url: str) -> Optional[Dict]:
+    """Download a PDF to a temp file, revalidating against the content cache.
 
+    Returns {'text': ...} on a cache hit, {'path': ..., 'headers': ...}
+    otherwise, or None on HTTP error or failure.
+    """
+    try:
+        resp, cached = conditional_get(url, timeout=30, stream=True)
+        if cached is not None:
+            return {'text': cached}
+        if resp.status_code != 200:
+            resp.close()
+            return None
+        headers = dict(resp.headers)
+        path = PDF_EXTRACTOR.save_response(resp)
+        return {'path': path, 'headers': headers} if path else None
     except Exception as e:
-        logger.warning(f"  PDF extraction failed for {url}: {e}")
+        logger.warning(f"  PDF download failed for {url}: {e}")
         return None
 
 
@@ -444,11 +815,14 @@ def fetch_topics(token: str, board_id: str) -> List[Dict]:
 
 # ── Format briefing report ────────────────────────────────────────────
 
-def format_briefing_report(changes: List[Dict], topics: List[Dict]) -> str:
+def format_briefing_report(changes: List[Dict], topics: List[Dict],
+                           cached_links: int = 0) -> str:
     """Build a structured markdown briefing from collected changes and topics.
 
     Output is designed to be copy-pasted into Claude.ai for newsletter drafting
-    or read directly as a raw briefing.
+    or read directly as a raw briefing.  cached_links is the number of
+    followed links whose text came from the content cache.  Documents linked
+    from more than one state are printed once, under "Shared documents".
     """
     today = datetime.now().strftime('%B %d, %Y')
     week_start = (datetime.now() - timedelta(days=7)).strftime('%B %d')
@@ -471,8 +845,25 @@ def format_briefing_report(changes: List[Dict], topics: List[Dict]) -> str:
                 by_state[state] = []
             by_state[state].append(c)
 
+        # Canonical document URL → referencing states (first link seen wins)
+        doc_states: Dict[str, List[str]] = {}
+        doc_link: Dict[str, Dict] = {}
+        for c in changes:
+            for link in c.get('linked_content', []):
+                canonical = canonical_url(link['url'])
+                doc_link.setdefault(canonical, link)
+                states = doc_states.setdefault(canonical, [])
+                if c['state'] not in states:
+                    states.append(c['state'])
+        shared = [d for d, states in doc_states.items() if len(states) > 1]
+
         lines.append(f"## {len(changes)} changes across {len(by_state)} states")
         lines.append("")
+        linked = len(doc_states)
+        if linked:
+            lines.append(f"_{linked} linked documents followed; "
+                         f"{cached_links} unchanged since last fetch (served from cache)._")
+            lines.append("")
 
         for state, state_changes in sorted(by_state.items()):
             lines.append(f"### {state}")
@@ -502,6 +893,11 @@ def format_briefing_report(changes: List[Dict], topics: List[Dict]) -> str:
                     lines.append("**Content from key links on this page:**")
                     lines.append("")
                     for link in c['linked_content']:
+                        if len(doc_states[canonical_url(link['url'])]) > 1:
+                            lines.append(f"- {link['label']} — shared document, "
+                                         f"see **Shared documents** ({link['url']})")
+                            lines.append("")
+                            continue
                         lines.append(f"#### {link['label']}")
                         lines.append(f"URL: {link['url']}")
                         lines.append("")
@@ -519,6 +915,20 @@ def format_briefing_report(changes: List[Dict], topics: List[Dict]) -> str:
             lines.append("---")
             lines.append("")
 
+        if shared:
+            lines.append(f"## Shared documents ({len(shared)})")
+            lines.append("")
+            lines.append("Linked from more than one changed state; fetched once.")
+            lines.append("")
+            for canonical in shared:
+                link = doc_link[canonical]
+                lines.append(f"#### {link['label']}")
+                lines.append(f"URL: {link['url']}")
+                lines.append(f"Linked from: {', '.join(sorted(doc_states[canonical]))}")
+                lines.append("")
+                lines.append(link['content'])
+                lines.append("")
+
     # Topics from monday.com
     if topics:
         lines.append("## Active Topics (monday.com)")
@@ -545,6 +955,8 @@ def main():
     monday_token = os.getenv('MONDAY_API_TOKEN', '')
     topics_board_id = os.getenv('MONDAY_TOPICS_BOARD_ID', '')
     lookback_days = int(os.getenv('LOOKBACK_DAYS', '7'))
+    enrich_workers = int(os.getenv('ENRICH_WORKERS', '1'))
+    enrich_per_host = int(os.getenv('ENRICH_PER_HOST', '2'))
 
     if not github_token or not repo:
         logger.error("GITHUB_TOKEN and GITHUB_REPOSITORY are required")
@@ -556,13 +968,18 @@ def main():
     # 2. Enrich: re-fetch changed pages and follow key links
     if changes:
         logger.info("Enriching changes with linked content...")
-        changes = enrich_changes(changes)
+        started = time.monotonic()
+        changes = enrich_changes(changes, workers=enrich_workers, per_host=enrich_per_host)
+        logger.info(f"Enrichment took {time.monotonic() - started:.1f}s "
+                    f"({enrich_workers} worker(s))")
+        CONTENT_CACHE.save()
+        PDF_EXTRACTOR.close()
 
     # 3. Fetch topics from monday.com for context
     topics = fetch_topics(monday_token, topics_board_id)
 
     # 4. Format the briefing report
-    report = format_briefing_report(changes, topics)
+    report = format_briefing_report(changes, topics, cached_links=CONTENT_CACHE.hits)
 
     # 5. Save report
     output_path = 'newsletter-draft.html'
@@ -589,6 +1006,7 @@ def main():
         'topics_count': len(topics),
         'states_with_changes': list(set(c['state'] for c in changes)),
         'lookback_days': lookback_days,
+        'cached_links': CONTENT_CACHE.hits,
     }
     with open('newsletter-metadata.json', 'w') as f:
         json.dump(metadata, f, indent=2)
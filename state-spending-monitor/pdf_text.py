@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+PDF text extraction service shared by newsletter.py, url_monitor.py and
+anything else that needs text out of linked PDFs (e.g. KPI extraction).
+
+  - Downloads stream to a temporary file in chunks, capped at
+    PDF_MAX_DOWNLOAD_MB, so the calling process never holds the whole PDF.
+  - pypdf runs in a process pool.  Each worker runs under an address-space
+    limit (PDF_MEMORY_MB) and every document under a timeout (PDF_TIMEOUT
+    seconds), so one scanned 200-page narrative can't stall or exhaust the job.
+  - Extraction stops at max_pages or as soon as the caller's character budget
+    is reached — there is no point parsing page 20 when 3,000 characters
+    are kept.
+
+The timeout runs from when a worker starts a document, not from when it was
+queued, so documents waiting behind slow ones are never timed out.  A
+watchdog thread backs up the in-worker alarm: a worker still busy with a
+document PDF_TIMEOUT + TIMEOUT_GRACE seconds after starting it is torn down
+with the pool, that document yields None, and every other pending document
+is resubmitted to a fresh pool.  A worker crash is handled the same way;
+a document whose worker died twice yields None.
+
+Env:
+  PDF_WORKERS          — extraction processes (default: 2)
+  PDF_TIMEOUT          — seconds per document (default: 60)
+  PDF_MEMORY_MB        — address-space limit per worker (default: 1024)
+  PDF_MAX_DOWNLOAD_MB  — largest PDF downloaded (default: 50)
+"""
+
+import itertools
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    from pypdf import PdfReader
+    HAS_PYPDF = True
+except ImportError:
+    HAS_PYPDF = False
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = 20
+DOWNLOAD_CHUNK = 64 * 1024
+# Grace period on top of the in-worker alarm before the pool is torn down
+TIMEOUT_GRACE = 10
+# How often the watchdog checks running documents (seconds)
+WATCH_INTERVAL = 1.0
+# A document whose worker died this many times yields None
+MAX_ATTEMPTS = 2
+
+# Worker side: queue the parent reads (job id, worker pid, start time) from
+_started_events = None
+
+
+def is_pdf_response(url: str, content_type: str = '') -> bool:
+    """True if a URL/response looks like a PDF (by extension or Content-Type)."""
+    return (urlparse(url).path.lower().endswith('.pdf')
+            or 'application/pdf' in (content_type or '').lower())
+
+
+class _DocumentTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _DocumentTimeout()
+
+
+def _init_worker(memory_mb: int, started_events):
+    """Pool initializer: cap the worker's address space and keep the queue
+    that start times are reported on."""
+    global _started_events
+    _started_events = started_events
+    if resource and memory_mb:
+        limit = memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+
+
+def _extract(job_id: int, path: str, max_pages: int, char_budget: Optional[int],
+             timeout: int) -> Optional[str]:
+    """Worker: text of the first max_pages pages, stopping at char_budget."""
+    if _started_events is not None:
+        _started_events.put((job_id, os.getpid(), time.time()))
+    use_alarm = timeout and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.alarm(timeout)
+    try:
+        reader = PdfReader(path)
+        pages_text = []
+        total = 0
+        for page in reader.pages[:max_pages]:
+            text = page.extract_text()
+            if text:
+                pages_text.append(text)
+                total += len(text) + 1
+                if char_budget and total >= char_budget:
+                    break
+        text = '\n'.join(pages_text)
+        if char_budget:
+            text = text[:char_budget]
+        return text or None
+    except _DocumentTimeout:
+        logger.warning(f"  PDF extraction timed out after {timeout}s: {path}")
+        return None
+    except MemoryError:
+        logger.warning(f"  PDF extraction exceeded the memory limit: {path}")
+        return None
+    except Exception as e:
+        logger.warning(f"  PDF extraction failed: {e}")
+        return None
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+
+
+class PDFExtractor:
+    """Process-pool PDF text extraction with streaming downloads."""
+
+    def __init__(self, workers: int = 0, timeout: int = 0, memory_mb: int = 0,
+                 max_pages: int = DEFAULT_MAX_PAGES, max_download_mb: int = 0):
+        self.workers = workers or int(os.getenv('PDF_WORKERS', '2'))
+        self.timeout = timeout or int(os.getenv('PDF_TIMEOUT', '60'))
+        self.memory_mb = memory_mb or int(os.getenv('PDF_MEMORY_MB', '1024'))
+        self.max_pages = max_pages
+        self.max_download = (max_download_mb or int(os.getenv('PDF_MAX_DOWNLOAD_MB', '50'))) * 1024 * 1024
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._events = None
+        self._jobs: Dict[int, Dict] = {}
+        self._ids = itertools.count(1)
+        self._watchdog: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+
+    # -- download ----------------------------------------------------------
+
+    def save_response(self, resp) -> Optional[str]:
+        """Stream a (stream=True) response body to a temp file; return its path.
+
+        Returns None if the body exceeds max_download.
+        """
+        fd, path = tempfile.mkstemp(suffix='.pdf', prefix='pdf-text-')
+        size = 0
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in resp.iter_content(DOWNLOAD_CHUNK):
+                    size += len(chunk)
+                    if size > self.max_download:
+                        logger.warning(f"  PDF larger than {self.max_download // (1024 * 1024)} MB, "
+                                       f"skipping: {resp.url}")
+                        os.remove(path)
+                        return None
+                    f.write(chunk)
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        finally:
+            resp.close()
+        return path
+
+    def download(self, session, url: str, timeout: int = 30, headers: Optional[Dict] = None) -> Optional[str]:
+        """Download a PDF to a temp file (None on HTTP error or failure)."""
+        try:
+            resp = session.get(url, timeout=timeout, stream=True, headers=headers)
+            if resp.status_code != 200:
+                resp.close()
+                return None
+            return self.save_response(resp)
+        except Exception as e:
+            logger.warning(f"  PDF download failed for {url}: {e}")
+            return None
+
+    # -- extraction --------------------------------------------------------
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # SimpleQueue: the put is written before the worker can crash
+                self._events = multiprocessing.SimpleQueue()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    initializer=_init_worker,
+                    initargs=(self.memory_mb, self._events),
+                )
+            if self._watchdog is None:
+                self._watchdog = threading.Thread(target=self._watch, name='pdf-watchdog', daemon=True)
+                self._watchdog.start()
+            return self._pool
+
+    def _reset_pool(self):
+        """Tear down a pool with a hung or crashed worker."""
+        with self._lock:
+            pool, self._pool, self._events = self._pool, None, None
+        if pool is None:
+            return
+        for proc in list(getattr(pool, '_processes', {}).values()):
+            proc.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self, job: Dict):
+        """Submit (or resubmit) a job to the current pool."""
+        with self._lock:
+            job['started'] = job['pid'] = None
+            args = (_extract, job['id'], job['path'], self.max_pages, job['budget'], self.timeout)
+            try:
+                job['inner'] = self._get_pool().submit(*args)
+            except BrokenProcessPool:
+                self._reset_pool()
+                job['inner'] = self._get_pool().submit(*args)
+            job['pool'] = self._pool
+            job['inner'].add_done_callback(lambda inner, job=job: self._settle(job, inner))
+
+    def _drain_events(self):
+        try:
+            while self._events is not None and not self._events.empty():
+                job_id, pid, started = self._events.get()
+                job = self._jobs.get(job_id)
+                if job and job['started'] is None:
+                    job['pid'], job['started'] = pid, started
+        except (OSError, EOFError, ValueError):
+            pass
+
+    def _settle(self, job: Dict, inner: Future):
+        """Done-callback of a pool future: finish the job, or resubmit it
+        if the pool broke under it."""
+        with self._lock:
+            if job.get('inner') is not inner or job['id'] not in self._jobs or inner.cancelled():
+                return          # superseded by a resubmission, or cancelled by a reset
+            exc = inner.exception()
+            if isinstance(exc, BrokenProcessPool):
+                if job['pool'] is self._pool:
+                    self._blame_crash(job['pool'])
+                    logger.warning("  PDF worker crashed — restarting pool")
+                    self._reset_pool()
+                if job['attempts'] < MAX_ATTEMPTS:
+                    self._dispatch(job)
+                    return
+                logger.warning(f"  PDF extraction crashed its worker {job['attempts']} times: {job['path']}")
+            elif exc is not None:
+                logger.warning(f"  PDF extraction failed: {exc}")
+            self._finish(job, None if exc else inner.result())
+
+    def _blame_crash(self, pool: ProcessPoolExecutor):
+        """Count an attempt against the documents whose worker died.  The
+        pool fails its futures before terminating the surviving workers, so
+        the dead ones are those that have already exited; if none can be
+        told apart, every started document is blamed."""
+        self._drain_events()
+        dead = {pid for pid, proc in list(getattr(pool, '_processes', {}).items())
+                if proc.exitcode is not None}
+        for job in self._jobs.values():
+            if job.get('pool') is pool and job['started'] is not None \
+                    and (not dead or job['pid'] in dead):
+                job['attempts'] += 1
+
+    def _finish(self, job: Dict, text: Optional[str]):
+        self._jobs.pop(job['id'], None)
+        if os.path.exists(job['path']):
+            os.remove(job['path'])
+        job['future'].set_result(text)
+
+    def _watch(self):
+        """Watchdog: fail documents running past the timeout, rebuild the
+        pool and resubmit the rest.  Exits when nothing is pending."""
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            with self._lock:
+                if not self._jobs:
+                    self._watchdog = None
+                    return
+                self._drain_events()
+                now = time.time()
+                hung = [job for job in self._jobs.values()
+                        if job['started'] is not None
+                        and now - job['started'] > self.timeout + TIMEOUT_GRACE]
+                if not hung:
+                    continue
+                logger.warning("  PDF worker unresponsive past the timeout — restarting pool")
+                for job in hung:
+                    self._finish(job, None)
+                self._reset_pool()
+                for job in list(self._jobs.values()):
+                    self._dispatch(job)
+
+    def submit(self, path: str, char_budget: Optional[int] = None) -> Future:
+        """Queue extraction of a downloaded PDF; the temp file is removed
+        when the returned future completes.  The future always completes
+        with the text or None."""
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            job = {'id': next(self._ids), 'path': path, 'budget': char_budget,
+                   'future': future, 'attempts': 0, 'started': None, 'pid': None}
+            self._jobs[job['id']] = job
+            self._dispatch(job)
+        return future
+
+    def result(self, fut: Future) -> Optional[str]:
+        """Wait for a submitted extraction (the watchdog bounds the wait)."""
+        try:
+            return fut.result()
+        except CancelledError:
+            return None
+
+    def extract(self, path: str, char_budget: Optional[int] = None) -> Optional[str]:
+        """Extract text from a downloaded PDF (blocking)."""
+        return self.result(self.submit(path, char_budget))
+
+    def fetch_text(self, session, url: str, char_budget: Optional[int] = None) -> Optional[str]:
+        """Download and extract in one call."""
+        path = self.download(session, url)
+        return self.extract(path, char_budget) if path else None
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -8,14 +8,38 @@ URLs that the URL monitor detected as changed.
 Saves screenshots to a configurable output directory as PNG files
 named by state and date (e.g., "Delaware-02-24-2026.png").
 
+Pages are captured concurrently (async Playwright, one browser, one
+isolated context per page).  Each capture has a hard timeout, and a page
+that hangs or crashes — or takes the browser down with it — only costs
+that one screenshot.
+
+Readiness is DOM stability, not networkidle (which never settles on pages
+with analytics beacons, chat widgets or video): after DOMContentLoaded we
+wait until the DOM has been quiet for a profile's settle time and visible
+images have loaded, bounded by a max wait.  Lazy content is triggered by a
+capped number of viewport-height scroll steps.  Fonts, media and known
+analytics/ad hosts are blocked at the network layer.  Per-domain wait
+profiles tune the settle/max/scroll values for slow client-rendered sites.
+
+Env:
+  SCREENSHOT_CONCURRENCY   — pages captured at once (default: 4)
+  SCREENSHOT_BLOCK_TYPES   — resource types to block (default: font,media;
+                             empty string blocks none)
+  SCREENSHOT_BLOCK_DOMAINS — extra hosts to block, comma-separated
+  SCREENSHOT_PROFILES      — JSON file of {host suffix: profile overrides}
+
 Required: pip install playwright && playwright install chromium
 """
 
+import asyncio
+import json
 import logging
 import os
 import re
+import time
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +49,189 @@ def sanitize_filename(name: str) -> str:
     return re.sub(r'[^\w\s-]', '', name).strip().replace(' ', '_')
 
 
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+    'AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/131.0.0.0 Safari/537.36'
+)
+VIEWPORT = {'width': 1280, 'height': 720}
+
+# Remove fixed-height containers that clip content.  SharePoint wraps
+# content in #s4-workspace with overflow:auto + fixed height, so
+# full_page=True only captures the visible viewport, not the real content
+# beneath it.
+UNCLIP_JS = """
+    () => {
+        // Common fixed-height wrappers (SharePoint, CMS frameworks)
+        const selectors = [
+            '#s4-workspace',
+            '#s4-bodyContainer',
+            '#contentRow',
+            '.ms-core-overlay',
+            '[id*="workspace"]',
+            '[id*="Workspace"]',
+        ];
+        for (const sel of selectors) {
+            for (const el of document.querySelectorAll(sel)) {
+                el.style.height = 'auto';
+                el.style.maxHeight = 'none';
+                el.style.overflow = 'visible';
+                el.style.position = 'static';
+            }
+        }
+        // Also fix body/html in case they have overflow hidden
+        document.documentElement.style.overflow = 'visible';
+        document.body.style.overflow = 'visible';
+    }
+"""
+
+# Blocked at the network layer: invisible or irrelevant to the capture
+BLOCK_RESOURCE_TYPES = {'font', 'media'}
+BLOCK_DOMAINS = {
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'googleadservices.com', 'adservice.google.com',
+    'facebook.net', 'connect.facebook.net', 'hotjar.com', 'clarity.ms',
+    'siteimproveanalytics.com', 'siteimproveanalytics.io', 'nr-data.net',
+    'newrelic.com', 'omtrdc.net', 'demdex.net', 'quantserve.com',
+    'scorecardresearch.com', 'snap.licdn.com', 'ads-twitter.com',
+    'analytics.tiktok.com', 'crazyegg.com', 'mouseflow.com',
+}
+
+# Readiness profiles.  settle_ms: DOM quiet period; max_wait_ms: ceiling on
+# waiting for that quiet; scroll_steps: viewport-height scrolls to trigger
+# lazy content; scroll_delay_ms: pause between steps.
+DEFAULT_PROFILE = {
+    'settle_ms': 500,
+    'max_wait_ms': 8000,
+    'scroll_steps': 12,
+    'scroll_delay_ms': 200,
+}
+DOMAIN_PROFILES = {
+    # Client-rendered apps: content arrives well after DOMContentLoaded
+    'my.site.com': {'settle_ms': 1500, 'max_wait_ms': 20000},
+    'forms.office.com': {'settle_ms': 1500, 'max_wait_ms': 15000},
+    'caspio.com': {'settle_ms': 1000, 'max_wait_ms': 12000},
+}
+
+# Resolves once the DOM has seen no mutations for settleMs and the images
+# that matter have finished loading — or after maxMs regardless.  Before the
+# scroll (afterScroll false) that is every eager image plus lazy ones already
+# in the viewport; below-the-fold lazy images are not requested until the
+# scroll reaches them, so waiting on them would always run to maxMs.  After
+# the scroll it is every eager image plus the lazy ones the scroll requested.
+# Only src/srcset/class attribute changes count as mutations, so animations
+# and tickers rewriting style or aria-* attributes don't hold off the settle.
+DOM_STABLE_JS = """
+    ([settleMs, maxMs, afterScroll]) => new Promise(resolve => {
+        const start = performance.now();
+        let last = performance.now();
+        const observer = new MutationObserver(() => { last = performance.now(); });
+        observer.observe(document.documentElement,
+                         {childList: true, subtree: true, characterData: true,
+                          attributes: true, attributeFilter: ['src', 'srcset', 'class']});
+        const inViewport = img => {
+            const r = img.getBoundingClientRect();
+            return r.bottom > 0 && r.top < window.innerHeight;
+        };
+        const awaited = img => img.loading !== 'lazy'
+            || (afterScroll ? img.currentSrc !== '' : inViewport(img));
+        const imagesDone = () => Array.from(document.images)
+            .every(img => img.complete || !awaited(img));
+        const tick = () => {
+            const now = performance.now();
+            if ((now - last >= settleMs && imagesDone()) || now - start >= maxMs) {
+                observer.disconnect();
+                resolve(now - start);
+            } else {
+                setTimeout(tick, 100);
+            }
+        };
+        tick();
+    })
+"""
+
+# Step down the page one viewport at a time (at most maxSteps) to trigger
+# lazy-loaded content, then return to the top so the screenshot starts
+# from the header.  Bounded, so infinite feeds can't loop forever.
+SCROLL_STEPS_JS = """
+    async ([maxSteps, delayMs]) => {
+        const delay = ms => new Promise(r => setTimeout(r, ms));
+        let steps = 0;
+        while (steps < maxSteps) {
+            const before = window.scrollY;
+            window.scrollBy(0, window.innerHeight);
+            steps++;
+            await delay(delayMs);
+            if (window.scrollY === before) break;
+        }
+        window.scrollTo(0, 0);
+        return steps;
+    }
+"""
+
+# Legacy readiness (networkidle + scroll until scrollHeight stops
+# changing), kept for before/after timing comparisons
+SCROLL_JS = """
+    async () => {
+        const delay = ms => new Promise(r => setTimeout(r, ms));
+        const height = () => document.body.scrollHeight;
+        let prev = 0;
+        while (height() !== prev) {
+            prev = height();
+            window.scrollTo(0, height());
+            await delay(300);
+        }
+        window.scrollTo(0, 0);
+    }
+"""
+
+
+def load_block_config() -> Tuple[set, set]:
+    """(resource types, host suffixes) to block, from defaults + env."""
+    types_env = os.getenv('SCREENSHOT_BLOCK_TYPES')
+    types = BLOCK_RESOURCE_TYPES if types_env is None else {
+        t.strip() for t in types_env.split(',') if t.strip()
+    }
+    domains = set(BLOCK_DOMAINS) | {
+        d.strip().lower() for d in os.getenv('SCREENSHOT_BLOCK_DOMAINS', '').split(',') if d.strip()
+    }
+    return types, domains
+
+
+def load_profiles() -> Dict[str, Dict]:
+    """Domain profiles, extended/overridden by the SCREENSHOT_PROFILES file."""
+    profiles = {k: dict(v) for k, v in DOMAIN_PROFILES.items()}
+    path = os.getenv('SCREENSHOT_PROFILES', '')
+    if path:
+        try:
+            with open(path) as f:
+                for host, overrides in json.load(f).items():
+                    profiles.setdefault(host.lower(), {}).update(overrides)
+        except (IOError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable screenshot profiles {path}: {e}")
+    return profiles
+
+
+def _host_matches(host: str, suffix: str) -> bool:
+    return host == suffix or host.endswith('.' + suffix)
+
+
+def wait_profile(url: str, profiles: Dict[str, Dict]) -> Dict:
+    """Readiness profile for a URL: DEFAULT_PROFILE plus the most specific
+    matching domain's overrides."""
+    host = (urlparse(url).hostname or '').lower()
+    profile = dict(DEFAULT_PROFILE)
+    matches = [s for s in profiles if _host_matches(host, s)]
+    if matches:
+        profile.update(profiles[max(matches, key=len)])
+    return profile
+
+
 def capture_screenshots(
     changed: List[Dict],
     output_dir: str = 'screenshots',
     timeout: int = 30000,
+    concurrency: int = 0,
 ) -> Dict[str, str]:
     """Take full-page screenshots of changed URLs.
 
@@ -36,110 +239,172 @@ def capture_screenshots(
         changed: List of dicts with 'name' and 'url' keys (from url_monitor results).
         output_dir: Directory to save screenshots.
         timeout: Page load timeout in milliseconds.
+        concurrency: Pages captured at once (default: SCREENSHOT_CONCURRENCY or 4).
 
     Returns:
         Dict mapping state name to screenshot file path.
     """
+    screenshots, _ = capture_screenshots_timed(changed, output_dir, timeout, concurrency)
+    return screenshots
+
+
+def capture_screenshots_timed(
+    changed: List[Dict],
+    output_dir: str = 'screenshots',
+    timeout: int = 30000,
+    concurrency: int = 0,
+    legacy: bool = False,
+) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+    """capture_screenshots plus per-URL timings.
+
+    Returns (screenshots, timings) where timings maps state name to
+    {'url', 'seconds', 'ok', 'error'}.  legacy=True uses the old
+    networkidle/unbounded-scroll readiness with no request blocking, for
+    before/after comparisons.
+    """
     if not changed:
         logger.info("No changed pages to screenshot")
-        return {}
+        return {}, {}
 
     try:
-        from playwright.sync_api import sync_playwright
+        from playwright.async_api import async_playwright  # noqa: F401
     except ImportError:
         logger.warning("Playwright not installed — skipping screenshots")
-        return {}
+        return {}, {}
 
+    concurrency = concurrency or int(os.getenv('SCREENSHOT_CONCURRENCY', '4'))
     os.makedirs(output_dir, exist_ok=True)
-    screenshots = {}
-
-    logger.info(f"Capturing {len(changed)} screenshots...")
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={'width': 1280, 'height': 720},
-            user_agent=(
-                'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                'AppleWebKit/537.36 (KHTML, like Gecko) '
-                'Chrome/131.0.0.0 Safari/537.36'
-            ),
-        )
-
-        for item in changed:
-            name = item['name']
-            url = item['url']
+
+    logger.info(f"Capturing {len(changed)} screenshots ({concurrency} at a time)...")
+    started = time.monotonic()
+    screenshots, timings = asyncio.run(_capture_all(changed, output_dir, timeout, concurrency, legacy))
+
+    logger.info(f"Captured {len(screenshots)}/{len(changed)} screenshots "
+                f"in {time.monotonic() - started:.1f}s")
+    for name, t in sorted(timings.items(), key=lambda kv: -kv[1]['seconds']):
+        status = 'ok' if t['ok'] else f"FAILED ({t['error']})"
+        logger.info(f"  {t['seconds']:6.1f}s  {name} — {status}")
+    return screenshots, timings
+
+
+class _Browser:
+    """Shared Chromium that is relaunched if a page takes it down."""
+
+    def __init__(self, playwright):
+        self.playwright = playwright
+        self.browser = None
+        self.lock = asyncio.Lock()
+
+    async def get(self):
+        async with self.lock:
+            if self.browser is None or not self.browser.is_connected():
+                if self.browser is not None:
+                    logger.warning("  Browser disconnected — relaunching")
+                self.browser = await self.playwright.chromium.launch(headless=True)
+            return self.browser
+
+    async def close(self):
+        if self.browser is not None and self.browser.is_connected():
+            await self.browser.close()
+
+
+async def _capture_all(changed: List[Dict], output_dir: str, timeout: int,
+                       concurrency: int, legacy: bool = False) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+    from playwright.async_api import async_playwright
+
+    block_types, block_domains = load_block_config()
+    profiles = load_profiles()
+
+    async def block(route):
+        request = route.request
+        host = (urlparse(request.url).hostname or '').lower()
+        if request.resource_type in block_types or any(_host_matches(host, d) for d in block_domains):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    screenshots: Dict[str, str] = {}
+    timings: Dict[str, Dict] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    # Hard per-page ceiling: navigation timeout plus room for scrolling
+    # and the screenshot itself
+    hard_timeout = timeout / 1000 * 2 + 30
+
+    async with async_playwright() as p:
+        shared = _Browser(p)
+
+        async def run(item):
+            name, url = item['name'], item['url']
             date_str = datetime.now().strftime('%m-%d-%Y')
-            filename = f"{sanitize_filename(name)}-{date_str}.png"
-            filepath = os.path.join(output_dir, filename)
-
-            logger.info(f"  Screenshotting: {name} ({url})")
-
-            try:
-                page = context.new_page()
-                page.goto(url, wait_until='networkidle', timeout=timeout)
-
-                # Remove fixed-height containers that clip content.
-                # SharePoint wraps content in #s4-workspace with
-                # overflow:auto + fixed height, so full_page=True
-                # only captures the visible viewport, not the real
-                # content beneath it.
-                page.evaluate("""
-                    () => {
-                        // Common fixed-height wrappers (SharePoint, CMS frameworks)
-                        const selectors = [
-                            '#s4-workspace',
-                            '#s4-bodyContainer',
-                            '#contentRow',
-                            '.ms-core-overlay',
-                            '[id*="workspace"]',
-                            '[id*="Workspace"]',
-                        ];
-                        for (const sel of selectors) {
-                            for (const el of document.querySelectorAll(sel)) {
-                                el.style.height = 'auto';
-                                el.style.maxHeight = 'none';
-                                el.style.overflow = 'visible';
-                                el.style.position = 'static';
-                            }
-                        }
-                        // Also fix body/html in case they have overflow hidden
-                        document.documentElement.style.overflow = 'visible';
-                        document.body.style.overflow = 'visible';
-                    }
-                """)
-
-                # Scroll to bottom to trigger lazy-loaded content,
-                # then back to top so the screenshot starts from the header
-                page.evaluate("""
-                    async () => {
-                        const delay = ms => new Promise(r => setTimeout(r, ms));
-                        const height = () => document.body.scrollHeight;
-                        let prev = 0;
-                        while (height() !== prev) {
-                            prev = height();
-                            window.scrollTo(0, height());
-                            await delay(300);
-                        }
-                        window.scrollTo(0, 0);
-                    }
-                """)
-                page.wait_for_timeout(500)
-
-                page.screenshot(path=filepath, full_page=True)
-                page.close()
-
-                screenshots[name] = filepath
-                logger.info(f"  Saved: {filepath}")
-
-            except Exception as e:
-                logger.warning(f"  Failed to screenshot {name}: {e}")
+            filepath = os.path.join(output_dir, f"{sanitize_filename(name)}-{date_str}.png")
+            async with semaphore:
+                logger.info(f"  Screenshotting: {name} ({url})")
+                started = time.monotonic()
+                error = None
+                context = None
                 try:
-                    page.close()
-                except Exception as close_err:
-                    logger.debug(f"Failed to close page cleanly after screenshot error: {close_err}")
+                    browser = await shared.get()
+                    context = await browser.new_context(viewport=VIEWPORT, user_agent=USER_AGENT)
+                    if legacy:
+                        capture = _capture_page_legacy(context, url, filepath, timeout)
+                    else:
+                        if block_types or block_domains:
+                            await context.route('**/*', block)
+                        capture = _capture_page(context, url, filepath, timeout, wait_profile(url, profiles))
+                    await asyncio.wait_for(capture, hard_timeout)
+                    screenshots[name] = filepath
+                    logger.info(f"  Saved: {filepath}")
+                except asyncio.TimeoutError:
+                    error = f"timed out after {hard_timeout:.0f}s"
+                except Exception as e:
+                    error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                finally:
+                    if context is not None:
+                        try:
+                            await context.close()
+                        except Exception as close_err:
+                            logger.debug(f"Failed to close context cleanly after screenshot: {close_err}")
+                if error:
+                    logger.warning(f"  Failed to screenshot {name}: {error}")
+                timings[name] = {
+                    'url': url,
+                    'seconds': round(time.monotonic() - started, 2),
+                    'ok': error is None,
+                    'error': error,
+                }
 
-        browser.close()
+        try:
+            await asyncio.gather(*(run(item) for item in changed))
+        finally:
+            await shared.close()
 
-    logger.info(f"Captured {len(screenshots)}/{len(changed)} screenshots")
-    return screenshots
+    # Keep the caller's order
+    ordered = {item['name']: screenshots[item['name']] for item in changed if item['name'] in screenshots}
+    return ordered, timings
+
+
+async def _capture_page(context, url: str, filepath: str, timeout: int, profile: Dict):
+    """Load one page in its own context and save a full-page screenshot.
+
+    Waits for DOM stability (see DOM_STABLE_JS), scrolls at most
+    profile['scroll_steps'] viewports, then waits for the DOM to settle
+    again so lazy-loaded content is in the capture.
+    """
+    page = await context.new_page()
+    await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+    await page.evaluate(DOM_STABLE_JS, [profile['settle_ms'], profile['max_wait_ms'], False])
+    await page.evaluate(UNCLIP_JS)
+    await page.evaluate(SCROLL_STEPS_JS, [profile['scroll_steps'], profile['scroll_delay_ms']])
+    await page.evaluate(DOM_STABLE_JS, [profile['settle_ms'], profile['max_wait_ms'] // 2, True])
+    await page.screenshot(path=filepath, full_page=True)
+
+
+async def _capture_page_legacy(context, url: str, filepath: str, timeout: int):
+    """Pre-DOM-stability capture: networkidle, scroll until scrollHeight
+    stops changing, fixed 500ms wait."""
+    page = await context.new_page()
+    await page.goto(url, wait_until='networkidle', timeout=timeout)
+    await page.evaluate(UNCLIP_JS)
+    await page.evaluate(SCROLL_JS)
+    await page.wait_for_timeout(500)
+    await page.screenshot(path=filepath, full_page=True)
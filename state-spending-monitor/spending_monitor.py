@@ -1,11 +1,20 @@
 #!/usr/bin/env python3
 """
-USASpending Award Monitor — tracks RHTP federal award data for all 50 states.
+USASpending Award Monitor — tracks federal award data per program (RHTP's
+50 state cooperative agreements by default).
 
 Queries the USASpending.gov API for award amounts, outlays, and modifications,
 compares with the previous snapshot to detect changes, and updates the
 monday.com board with latest values.  Sends an email summary every run.
 
+Programs (CFDA number, award discovery rules, output paths) are declared in
+programs.json — see award_programs.py.  One pipeline runs per program, all
+sharing a cached USASpending client:
+
+  python spending_monitor.py                     # RHTP only
+  python spending_monitor.py --program rhtp --program <id>
+  python spending_monitor.py --all-programs
+
 Every run logs all board columns (with IDs and types) for easy configuration.
 
 Required env vars:
@@ -22,22 +31,28 @@ Optional column mapping (column title or ID — defaults shown):
   SPENDING_OUTLAYS_COLUMN          — "Total Outlays"
   SPENDING_LAST_MODIFIED_COLUMN    — "USASpending Last Modified"
 
-Snapshots file:
+Snapshots file (per program, from programs.json; the env var overrides RHTP's):
   SPENDING_SNAPSHOTS_FILE          — "spending_snapshots.json"
 """
 
+import argparse
+import hashlib
 import json
 import logging
 import os
 import smtplib
-import time
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import requests
 
+from award_programs import (
+    DEFAULT_PROGRAM, USASpendingClient, award_url, discover_awards, load_programs,
+)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -48,89 +63,110 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# ── RHTP Award ID → State mapping ────────────────────────────────────
-
-AWARD_MAP = {
-    "RHTCMS332041": "Michigan",
-    "RHTCMS332042": "North Carolina",
-    "RHTCMS332043": "North Dakota",
-    "RHTCMS332044": "Washington",
-    "RHTCMS332045": "Rhode Island",
-    "RHTCMS332046": "Georgia",
-    "RHTCMS332047": "Vermont",
-    "RHTCMS332048": "Oklahoma",
-    "RHTCMS332049": "New York",
-    "RHTCMS332050": "New Hampshire",
-    "RHTCMS332051": "Utah",
-    "RHTCMS332052": "Pennsylvania",
-    "RHTCMS332053": "Delaware",
-    "RHTCMS332054": "West Virginia",
-    "RHTCMS332055": "Illinois",
-    "RHTCMS332056": "South Carolina",
-    "RHTCMS332057": "Tennessee",
-    "RHTCMS332058": "Montana",
-    "RHTCMS332059": "Arizona",
-    "RHTCMS332060": "Alabama",
-    "RHTCMS332061": "Arkansas",
-    "RHTCMS332062": "Alaska",
-    "RHTCMS332063": "Mississippi",
-    "RHTCMS332064": "Hawaii",
-    "RHTCMS332065": "Iowa",
-    "RHTCMS332066": "Maryland",
-    "RHTCMS332067": "Florida",
-    "RHTCMS332068": "Texas",
-    "RHTCMS332069": "Massachusetts",
-    "RHTCMS332070": "Indiana",
-    "RHTCMS332071": "Oregon",
-    "RHTCMS332072": "Kansas",
-    "RHTCMS332073": "Connecticut",
-    "RHTCMS332074": "Nevada",
-    "RHTCMS332075": "Maine",
-    "RHTCMS332076": "Wisconsin",
-    "RHTCMS332077": "Minnesota",
-    "RHTCMS332078": "California",
-    "RHTCMS332079": "Kentucky",
-    "RHTCMS332080": "South Dakota",
-    "RHTCMS332081": "Colorado",
-    "RHTCMS332082": "Wyoming",
-    "RHTCMS332083": "New Mexico",
-    "RHTCMS332084": "Idaho",
-    "RHTCMS332085": "Louisiana",
-    "RHTCMS332086": "Nebraska",
-    "RHTCMS332087": "Ohio",
-    "RHTCMS332088": "Virginia",
-    "RHTCMS332089": "New Jersey",
-    "RHTCMS332090": "Missouri",
-}
+# ── Program registry ─────────────────────────────────────────────
+
+PROGRAMS = load_programs()
+
+# RHTP Award ID → State mapping (kept for callers that predate the registry)
+AWARD_MAP = PROGRAMS[DEFAULT_PROGRAM]['awards']
 
 STATE_TO_FAIN = {v: k for k, v in AWARD_MAP.items()}
 
-# Fields we request from the spending_by_award search
-USASPENDING_FIELDS = [
-    "Award ID",
-    "Recipient Name",
-    "Start Date",
-    "End Date",
-    "Award Amount",
-    "Total Outlays",
-    "Awarding Agency",
-    "Awarding Sub Agency",
-    "Award Type",
-    "Description",
-    "Last Modified Date",
-    "CFDA Number",
+# Fields compared between runs, in snapshot order: (record key, USASpending
+# field, is_amount).  The order is fixed so the content hash is stable.
+SNAPSHOT_FIELDS = [
+    ('award_amount', 'Award Amount', True),
+    ('total_outlays', 'Total Outlays', True),
+    ('recipient', 'Recipient Name', False),
+    ('start_date', 'Start Date', False),
+    ('end_date', 'End Date', False),
+    ('description', 'Description', False),
 ]
 
-USASPENDING_API = "https://api.usaspending.gov/api/v2"
+_CENTS = Decimal('0.01')
+
+MONDAY_API = 'https://api.monday.com/v2'
+MONDAY_PAGE_SIZE = 500   # items_page / next_items_page maximum
+MONDAY_BATCH_SIZE = 25   # aliased mutations per request
+
+MONDAY_ITEM_FIELDS = """
+                id
+                name
+                column_values {
+                  id
+                  type
+                  text
+                  value
+                }
+"""
+
+
+class AwardSnapshot(NamedTuple):
+    """Compact per-award snapshot: the compared fields plus a content hash.
+
+    Amounts are kept as fixed two-decimal strings so 1000000 and 1000000.0
+    (or float noise from the API) never register as a change.
+    """
+    award_amount: Optional[str]
+    total_outlays: Optional[str]
+    recipient: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    description: Optional[str]
+    hash: str
+
+
+def _decimal_str(value) -> Optional[str]:
+    """Canonical two-decimal string for an amount (None stays None)."""
+    if value is None or value == '':
+        return None
+    try:
+        return str(Decimal(str(value)).quantize(_CENTS))
+    except (InvalidOperation, ValueError):
+        return str(value)
+
+
+def award_snapshot(record: Dict) -> AwardSnapshot:
+    """Normalize a raw USASpending result (or a legacy snapshot entry)
+    into an AwardSnapshot."""
+    values = []
+    for _key, field, is_amount in SNAPSHOT_FIELDS:
+        value = record.get(field)
+        values.append(_decimal_str(value) if is_amount else value)
+    digest = hashlib.sha256(
+        json.dumps(values, ensure_ascii=False, separators=(',', ':'),
+                   default=str).encode('utf-8')
+    ).hexdigest()
+    return AwardSnapshot(*values, hash=digest)
+
+
+def _load_snapshot_entry(entry: Dict) -> AwardSnapshot:
+    """Read one stored snapshot; entries written before the compact format
+    hold the raw API record and are normalized (and re-hashed) on load."""
+    if 'hash' in entry:
+        return AwardSnapshot(**{k: entry.get(k) for k in AwardSnapshot._fields})
+    return award_snapshot(entry)
 
 
 class SpendingMonitor:
-    def __init__(self):
+    def __init__(
+        self,
+        program: str = DEFAULT_PROGRAM,
+        client: Optional[USASpendingClient] = None,
+    ):
+        self.program = PROGRAMS[program]
+        self.label = self.program['short_name']
+        self.client = client or USASpendingClient()
+        # FAIN → display name: pinned awards, extended by discovery each run
+        self.award_names: Dict[str, str] = dict(self.program['awards'])
+
         self.monday_token = os.getenv('MONDAY_API_TOKEN', '')
-        self.monday_board_id = os.getenv('MONDAY_SPENDING_BOARD_ID', '')
-        self.snapshots_file = os.getenv(
-            'SPENDING_SNAPSHOTS_FILE', 'spending_snapshots.json',
-        )
+        board_env = self.program.get('monday_board_env')
+        self.monday_board_id = os.getenv(board_env, '') if board_env else ''
+        self.snapshots_file = self.program['snapshots_file']
+        self.results_file = self.program['results_file']
+        if program == DEFAULT_PROGRAM:
+            self.snapshots_file = os.getenv('SPENDING_SNAPSHOTS_FILE', self.snapshots_file)
 
         # Drive upload config
         self.drive_folder_id = os.getenv('GOOGLE_DRIVE_SPENDING_FOLDER_ID', '')
@@ -166,187 +202,125 @@ class SpendingMonitor:
     # ── USASpending API ──────────────────────────────────────────────
 
     def fetch_awards_from_usaspending(self) -> Dict[str, Dict]:
-        """Fetch all 50 RHTP awards from USASpending.gov.
+        """Fetch every award for this program from USASpending.gov.
+
+        Discovers FAINs by CFDA number (see award_programs.discover_awards);
+        awards not pinned in programs.json are labelled from the program's
+        label_field when first seen, and that label is saved with the
+        snapshots and reused on later runs.
 
         Returns dict keyed by FAIN with award data as values.
         """
-        all_fains = list(AWARD_MAP.keys())
-        awards = {}
-
-        # Query in batches of 50 (one batch should cover all)
-        logger.info(f"Querying USASpending for {len(all_fains)} RHTP awards...")
-
-        payload = {
-            "subawards": False,
-            "limit": 100,
-            "page": 1,
-            "sort": "Award Amount",
-            "order": "desc",
-            "filters": {
-                "award_type_codes": ["02", "03", "04", "05"],
-                "award_ids": all_fains,
-            },
-            "fields": USASPENDING_FIELDS,
-        }
-
-        try:
-            resp = requests.post(
-                f"{USASPENDING_API}/search/spending_by_award/",
-                json=payload,
-                timeout=60,
+        logger.info(
+            f"Querying USASpending for {self.label} awards "
+            f"(CFDA {self.program.get('cfda', 'n/a')}, "
+            f"{len(self.program['awards'])} pinned)..."
+        )
+        awards = discover_awards(self.client, self.program)
+
+        # Labels given to discovered awards on earlier runs are reused, so a
+        # renamed recipient or a newly colliding label never moves an award to
+        # a different board row or outlays key.
+        for fain, label in self.load_award_labels().items():
+            self.award_names.setdefault(fain, label)
+
+        label_field = self.program['label_field']
+        used = set(self.award_names.values())
+        for fain in sorted(set(awards) - set(self.award_names)):
+            label = awards[fain].get(label_field) or fain
+            if label in used:
+                label = f"{label} ({fain})"
+            used.add(label)
+            self.award_names[fain] = label
+            logger.info(f"  Discovered award {fain}: {label}")
+        for fain, r in awards.items():
+            logger.debug(
+                f"  {self.award_names[fain]}: "
+                f"${r.get('Award Amount') or 0:,.2f} obligated, "
+                f"${r.get('Total Outlays') or 0:,.2f} outlayed"
             )
-            resp.raise_for_status()
-            data = resp.json()
-
-            results = data.get('results', [])
-            logger.info(f"  Got {len(results)} results from spending_by_award")
-
-            for r in results:
-                fain = r.get('Award ID', '')
-                if fain in AWARD_MAP:
-                    awards[fain] = r
-                    logger.info(
-                        f"  {AWARD_MAP[fain]}: "
-                        f"${r.get('Award Amount', 0):,.2f} obligated, "
-                        f"${r.get('Total Outlays', 0):,.2f} outlayed"
-                    )
 
-            # Check for pagination
-            total = data.get('page_metadata', {}).get('total', 0)
-            if total > len(results):
-                logger.info(f"  {total} total results, fetching remaining pages...")
-                page = 2
-                while len(awards) < total and page <= 10:
-                    payload['page'] = page
-                    resp = requests.post(
-                        f"{USASPENDING_API}/search/spending_by_award/",
-                        json=payload,
-                        timeout=60,
-                    )
-                    resp.raise_for_status()
-                    more = resp.json().get('results', [])
-                    if not more:
-                        break
-                    for r in more:
-                        fain = r.get('Award ID', '')
-                        if fain in AWARD_MAP:
-                            awards[fain] = r
-                    page += 1
-                    time.sleep(0.5)
-
-        except requests.RequestException as e:
-            logger.error(f"USASpending API error: {e}")
-
-        # If award_ids search returned nothing, try by CFDA program number
-        if not awards:
-            logger.info("  No results by award_ids, trying CFDA 93.798...")
-            awards = self._fetch_by_cfda()
-
-        # Report missing awards
-        found = set(awards.keys())
-        missing = set(all_fains) - found
+        # Report missing pinned awards
+        missing = set(self.program['awards']) - set(awards)
         if missing:
             logger.warning(
                 f"  {len(missing)} awards not found on USASpending: "
-                f"{', '.join(AWARD_MAP[f] for f in sorted(missing))}"
-            )
-
-        logger.info(f"Fetched {len(awards)}/50 awards from USASpending")
-        return awards
-
-    def _fetch_by_cfda(self) -> Dict[str, Dict]:
-        """Fallback: search by CFDA program number 93.798."""
-        awards = {}
-        payload = {
-            "subawards": False,
-            "limit": 100,
-            "page": 1,
-            "sort": "Award Amount",
-            "order": "desc",
-            "filters": {
-                "award_type_codes": ["02", "03", "04", "05"],
-                "program_numbers": ["93.798"],
-            },
-            "fields": USASPENDING_FIELDS,
-        }
-
-        try:
-            resp = requests.post(
-                f"{USASPENDING_API}/search/spending_by_award/",
-                json=payload,
-                timeout=60,
+                f"{', '.join(self.award_names[f] for f in sorted(missing))}"
             )
-            resp.raise_for_status()
-            results = resp.json().get('results', [])
-            logger.info(f"  CFDA search returned {len(results)} results")
-
-            for r in results:
-                fain = r.get('Award ID', '')
-                if fain in AWARD_MAP:
-                    awards[fain] = r
-
-        except requests.RequestException as e:
-            logger.error(f"  CFDA search failed: {e}")
 
+        logger.info(
+            f"Fetched {len(awards)} {self.label} awards from USASpending "
+            f"({self.client.requests_made} requests, {self.client.cache_hits} cache hits so far)"
+        )
         return awards
 
     # ── monday.com board ─────────────────────────────────────────────
 
+    def _monday(self, query: str, variables: Dict) -> Dict:
+        """POST one GraphQL request to monday.com; raises on HTTP or API errors."""
+        resp = requests.post(
+            MONDAY_API,
+            json={'query': query, 'variables': variables},
+            headers={
+                'Authorization': self.monday_token,
+                'Content-Type': 'application/json',
+            },
+            timeout=30,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        if 'errors' in data:
+            raise RuntimeError(f"monday.com errors: {data['errors']}")
+        return data['data']
+
     def fetch_board_data(self) -> Tuple[List[Dict], Dict[str, Dict]]:
         """Fetch all items and columns from monday.com board.
 
+        Items are read a page at a time, following items_page /
+        next_items_page cursors until the board is exhausted.
+
         Returns (items, columns_metadata).
         Logs every column for discovery/configuration.
         """
         if not self.monday_token or not self.monday_board_id:
-            logger.error("MONDAY_API_TOKEN and MONDAY_BOARD_ID are required")
+            logger.error(
+                f"MONDAY_API_TOKEN and {self.program.get('monday_board_env') or 'a board ID'} "
+                f"are required for {self.label} board updates"
+            )
             return [], {}
 
-        query = """
-        query ($boardId: [ID!]!) {
-          boards(ids: $boardId) {
-            columns {
+        query = f"""
+        query ($boardId: [ID!]!) {{
+          boards(ids: $boardId) {{
+            columns {{
               id
               title
               type
-            }
-            items_page(limit: 500) {
-              items {
-                id
-                name
-                column_values {
-                  id
-                  type
-                  text
-                  value
-                }
-              }
-            }
-          }
-        }
+            }}
+            items_page(limit: {MONDAY_PAGE_SIZE}) {{
+              cursor
+              items {{ {MONDAY_ITEM_FIELDS} }}
+            }}
+          }}
+        }}
+        """
+        next_query = f"""
+        query ($cursor: String!) {{
+          next_items_page(limit: {MONDAY_PAGE_SIZE}, cursor: $cursor) {{
+            cursor
+            items {{ {MONDAY_ITEM_FIELDS} }}
+          }}
+        }}
         """
-        variables = {"boardId": [self.monday_board_id]}
 
         try:
-            resp = requests.post(
-                'https://api.monday.com/v2',
-                json={'query': query, 'variables': variables},
-                headers={
-                    'Authorization': self.monday_token,
-                    'Content-Type': 'application/json',
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            if 'errors' in data:
-                logger.error(f"monday.com errors: {data['errors']}")
-                return [], {}
-
-            board = data['data']['boards'][0]
+            board = self._monday(query, {"boardId": [self.monday_board_id]})['boards'][0]
             columns = board.get('columns', [])
-            items = board['items_page']['items']
+            page = board['items_page']
+            items = list(page['items'])
+            while page.get('cursor'):
+                page = self._monday(next_query, {'cursor': page['cursor']})['next_items_page']
+                items.extend(page['items'])
 
             # Log all columns for discovery
             logger.info("=" * 60)
@@ -387,19 +361,12 @@ class SpendingMonitor:
             logger.error(f"Failed to fetch monday.com board: {e}")
             return [], {}
 
-    def update_monday_item(self, state: str, updates: Dict[str, Any]) -> bool:
-        """Update column values for a state's row on monday.com.
+    def _column_values(self, updates: Dict[str, Any]) -> Dict[str, str]:
+        """Build the change_multiple_column_values payload for one item.
 
         Args:
-            state: State name (must match item name on board).
             updates: Dict of {resolved_col_key: value} to set.
         """
-        item_id = self._item_ids.get(state)
-        if not item_id:
-            logger.warning(f"  No board item found for '{state}'")
-            return False
-
-        # Build column_values JSON for monday.com
         column_values = {}
         for key, value in updates.items():
             col_id = self._resolved_cols.get(key)
@@ -420,69 +387,95 @@ class SpendingMonitor:
             else:
                 # Text and other columns: plain string
                 column_values[col_id] = str(value) if value is not None else ''
+        return column_values
 
-        if not column_values:
-            return False
-
-        mutation = """
-        mutation ($boardId: ID!, $itemId: ID!, $columnValues: JSON!) {
-          change_multiple_column_values(
-            board_id: $boardId,
-            item_id: $itemId,
-            column_values: $columnValues
-          ) {
-            id
-          }
-        }
-        """
-        variables = {
-            'boardId': self.monday_board_id,
-            'itemId': item_id,
-            'columnValues': json.dumps(column_values),
-        }
+    def update_monday_items(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Update column values for many states' rows on monday.com.
 
-        try:
-            resp = requests.post(
-                'https://api.monday.com/v2',
-                json={'query': mutation, 'variables': variables},
-                headers={
-                    'Authorization': self.monday_token,
-                    'Content-Type': 'application/json',
-                },
-                timeout=30,
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        Sends MONDAY_BATCH_SIZE items per request as aliased
+        change_multiple_column_values mutations.  A batch that fails is
+        logged and skipped; the rest still go out.
+
+        Args:
+            updates: Dict of {state: {resolved_col_key: value}}; each state
+                must match an item name on the board.
 
-            if 'errors' in data:
-                logger.warning(f"  monday.com update error for {state}: {data['errors']}")
-                return False
+        Returns the number of items updated.
+        """
+        pending = []
+        for state, values in updates.items():
+            item_id = self._item_ids.get(state)
+            if not item_id:
+                logger.warning(f"  No board item found for '{state}'")
+                continue
+            column_values = self._column_values(values)
+            if column_values:
+                pending.append((state, item_id, column_values))
+
+        updated = 0
+        for start in range(0, len(pending), MONDAY_BATCH_SIZE):
+            batch = pending[start:start + MONDAY_BATCH_SIZE]
+            decl = ['$boardId: ID!']
+            body = []
+            variables: Dict[str, Any] = {'boardId': self.monday_board_id}
+            for i, (_, item_id, column_values) in enumerate(batch):
+                decl += [f'$i{i}: ID!', f'$v{i}: JSON!']
+                body.append(
+                    f'u{i}: change_multiple_column_values(board_id: $boardId, '
+                    f'item_id: $i{i}, column_values: $v{i}) {{ id }}'
+                )
+                variables[f'i{i}'] = item_id
+                variables[f'v{i}'] = json.dumps(column_values)
+            mutation = f"mutation ({', '.join(decl)}) {{\n  " + '\n  '.join(body) + '\n}'
 
-            return True
+            try:
+                data = self._monday(mutation, variables)
+            except Exception as e:
+                names = ', '.join(state for state, _, _ in batch)
+                logger.warning(f"  Failed to update {names}: {e}")
+                continue
 
-        except Exception as e:
-            logger.warning(f"  Failed to update {state}: {e}")
-            return False
+            for i, (state, _, _) in enumerate(batch):
+                if data.get(f'u{i}'):
+                    updated += 1
+                    logger.info(f"  Updated board: {state}")
+        return updated
 
     # ── Snapshots ────────────────────────────────────────────────────
 
-    def load_snapshots(self) -> Dict:
-        """Load previous spending snapshots."""
+    def load_snapshots(self) -> Dict[str, AwardSnapshot]:
+        """Load previous spending snapshots, keyed by FAIN."""
         if os.path.exists(self.snapshots_file):
             with open(self.snapshots_file) as f:
-                return json.load(f)
+                raw = json.load(f)
+            return {fain: _load_snapshot_entry(entry) for fain, entry in raw.items()}
         return {}
 
-    def save_snapshots(self, snapshots: Dict):
-        """Save current spending snapshots."""
+    def load_award_labels(self) -> Dict[str, str]:
+        """Display labels stored with the previous snapshots, keyed by FAIN."""
+        if not os.path.exists(self.snapshots_file):
+            return {}
+        with open(self.snapshots_file) as f:
+            raw = json.load(f)
+        return {fain: entry['label'] for fain, entry in raw.items() if entry.get('label')}
+
+    def save_snapshots(self, snapshots: Dict[str, AwardSnapshot]):
+        """Save current spending snapshots (compact records, one per FAIN,
+        each with the award's display label)."""
         with open(self.snapshots_file, 'w') as f:
-            json.dump(snapshots, f, indent=2, default=str)
+            json.dump(
+                {
+                    fain: {**snap._asdict(), 'label': self.award_names.get(fain, fain)}
+                    for fain, snap in snapshots.items()
+                },
+                f, indent=2, default=str,
+            )
 
     def write_outlays_json(self, api_data: Dict, run_date: str):
-        """Write state_pages/outlays.json — the committed build input that drives
-        the public /work/rht/states/outlays/ page. Runs every weekly pull so the
-        page's obligated/outlaid figures and `as_of` date stay current. Keyed by
-        state display name; only the 50 states in AWARD_MAP are emitted."""
+        """Write the program's outlays file (RHTP: state_pages/outlays.json — the
+        committed build input that drives the public /work/rht/states/outlays/
+        page). Runs every weekly pull so the obligated/outlaid figures and
+        `as_of` date stay current. Keyed by award display name."""
         def _num(v):
             try:
                 return round(float(v), 2)
@@ -490,7 +483,7 @@ class SpendingMonitor:
                 return None
         states = {}
         for fain, r in api_data.items():
-            name = AWARD_MAP.get(fain)
+            name = self.award_names.get(fain)
             if not name:
                 continue
             states[name] = {
@@ -498,38 +491,46 @@ class SpendingMonitor:
                 'obligated': _num(r.get('Award Amount')),
                 'outlaid': _num(r.get('Total Outlays')),
                 'award_last_modified': r.get('Last Modified Date'),
-                'usaspending_url':
-                    f"https://www.usaspending.gov/award/ASST_NON_{fain}_075/",
+                'usaspending_url': award_url(self.program, fain, r),
             }
         doc = {
             'as_of': run_date,
             'source': 'USASpending.gov',
-            'program': '93.798 — Rural Health Transformation Program',
+            'program': f"{self.program.get('cfda', '')} — {self.program['name']}",
             'note': ("obligated = federal funds committed to the state's cooperative "
                      "agreement; outlaid = federal funds actually disbursed to date. "
                      "Pulled weekly from USASpending.gov."),
             'states': dict(sorted(states.items())),
         }
         out_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), 'state_pages', 'outlays.json')
+            os.path.dirname(os.path.abspath(__file__)), self.program['outlays_file'])
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
         with open(out_path, 'w', encoding='utf-8') as f:
             json.dump(doc, f, indent=2, ensure_ascii=False)
         logger.info(f"Wrote {out_path} ({len(states)} states, as_of {run_date})")
 
     def detect_changes(
-        self, previous: Dict, current: Dict,
+        self, previous: Dict[str, AwardSnapshot], current: Dict,
+        snapshots: Optional[Dict[str, AwardSnapshot]] = None,
     ) -> Dict[str, List[Dict]]:
-        """Compare previous and current snapshots to find changes.
+        """Compare previous snapshots with the current API data to find changes.
+
+        Unchanged awards are settled by a single hash comparison; field diffs
+        are only computed for awards whose hash moved.  Pass ``snapshots``
+        (the normalized form of ``current``) to avoid normalizing twice.
 
         Returns dict with 'changed', 'new', 'unchanged' lists.
         """
         changes = {'changed': [], 'new': [], 'unchanged': []}
+        if snapshots is None:
+            snapshots = {fain: award_snapshot(r) for fain, r in current.items()}
 
         for fain, new_data in current.items():
-            state = AWARD_MAP.get(fain, fain)
-            old_data = previous.get(fain)
+            state = self.award_names.get(fain, fain)
+            old_snap = previous.get(fain)
+            new_snap = snapshots[fain]
 
-            if not old_data:
+            if not old_snap:
                 changes['new'].append({
                     'state': state,
                     'fain': fain,
@@ -537,17 +538,27 @@ class SpendingMonitor:
                 })
                 continue
 
+            if old_snap.hash == new_snap.hash:
+                changes['unchanged'].append({
+                    'state': state,
+                    'fain': fain,
+                })
+                continue
+
             # Compare key financial fields
             diffs = []
-            for field in ['Award Amount', 'Total Outlays', 'Recipient Name',
-                          'Start Date', 'End Date', 'Description']:
-                old_val = old_data.get(field)
-                new_val = new_data.get(field)
-                if old_val != new_val:
+            for i, (_key, field, is_amount) in enumerate(SNAPSHOT_FIELDS):
+                if old_snap[i] != new_snap[i]:
+                    old_val = old_snap[i]
+                    if is_amount and old_val is not None:
+                        try:
+                            old_val = float(old_val)
+                        except ValueError:
+                            pass
                     diffs.append({
                         'field': field,
                         'old': old_val,
-                        'new': new_val,
+                        'new': new_data.get(field),
                     })
 
             if diffs:
@@ -576,8 +587,8 @@ class SpendingMonitor:
         real weekly run.
         """
         run_date = datetime.now().strftime('%Y-%m-%d')
-        logger.info(f"Spending Monitor run — {run_date}")
-        logger.info(f"Tracking {len(AWARD_MAP)} RHTP awards")
+        logger.info(f"Spending Monitor run — {self.label} — {run_date}")
+        logger.info(f"Tracking {len(self.award_names)} pinned {self.label} awards")
 
         if outlays_only:
             logger.info("outlays-only dry run — no Monday board or email")
@@ -608,7 +619,8 @@ class SpendingMonitor:
 
         # 3. Load previous snapshots and detect changes
         previous = self.load_snapshots()
-        changes = self.detect_changes(previous, api_data)
+        snapshots = {fain: award_snapshot(r) for fain, r in api_data.items()}
+        changes = self.detect_changes(previous, api_data, snapshots)
 
         logger.info(
             f"Changes: {len(changes['changed'])} changed, "
@@ -631,25 +643,21 @@ class SpendingMonitor:
         # 5. Update monday.com board
         updated_count = 0
         if items:
-            update_items = changes['changed'] + changes['new']
-            for item in update_items:
-                state = item['state']
-                data = item['data']
-                updates = {
+            board_updates = {
+                item['state']: {
                     'award_id': item['fain'],
-                    'obligation': data.get('Award Amount'),
-                    'outlays': data.get('Total Outlays'),
-                    'last_modified': data.get('Last Modified Date'),
+                    'obligation': item['data'].get('Award Amount'),
+                    'outlays': item['data'].get('Total Outlays'),
+                    'last_modified': item['data'].get('Last Modified Date'),
                 }
-                if self.update_monday_item(state, updates):
-                    updated_count += 1
-                    logger.info(f"  Updated board: {state}")
-                time.sleep(0.3)  # Rate limit
+                for item in changes['changed'] + changes['new']
+            }
+            updated_count = self.update_monday_items(board_updates)
 
         logger.info(f"Updated {updated_count} items on monday.com")
 
         # 6. Save new snapshots
-        self.save_snapshots(api_data)
+        self.save_snapshots(snapshots)
         logger.info(f"Saved snapshots to {self.snapshots_file}")
 
         # 6b. Refresh the committed build input for the public /outlays/ page.
@@ -683,38 +691,67 @@ class SpendingMonitor:
         }
         self._write_results(results)
 
-        # 8. Upload results to Google Drive
+        # 8. Upload results to Google Drive — only artifacts whose MD5 differs
+        # from the previous run's copy.  The results file is a run log that
+        # always carries a fresh run_date, so it is archived only alongside
+        # real changes; on quiet weeks this step is two Drive list calls.
         if self.drive_folder_id and (self.drive_creds or self.drive_oauth_token):
             try:
-                from drive_upload import upload_screenshots_to_drive, create_or_get_subfolder, _get_drive_service
-                service, auth_type = _get_drive_service(
-                    credentials_json=self.drive_creds,
-                    refresh_token=self.drive_oauth_token,
-                    client_id=self.drive_client_id,
-                    client_secret=self.drive_client_secret,
+                from drive_upload import (
+                    _get_drive_service, create_or_get_subfolder,
+                    file_md5, find_previous_run_files, upload_files,
                 )
-                subfolder = f"Run {run_date}"
-                subfolder_id = create_or_get_subfolder(
-                    service, self.drive_folder_id, subfolder,
+
+                def service_factory():
+                    return _get_drive_service(
+                        credentials_json=self.drive_creds,
+                        refresh_token=self.drive_oauth_token,
+                        client_id=self.drive_client_id,
+                        client_secret=self.drive_client_secret,
+                    )[0]
+
+                service = service_factory()
+                prefix = 'Run ' if self.program['key'] == DEFAULT_PROGRAM else f"{self.label} Run "
+                subfolder = f"{prefix}{run_date}"
+                previous_files = find_previous_run_files(
+                    service, self.drive_folder_id, exclude_folder=subfolder,
+                    name_prefix=prefix,
                 )
-                # Upload results JSON and snapshots
-                from googleapiclient.http import MediaFileUpload
-                for filepath in ['spending-monitor-results.json', self.snapshots_file]:
-                    if os.path.exists(filepath):
-                        meta = {'name': os.path.basename(filepath), 'parents': [subfolder_id]}
-                        media = MediaFileUpload(filepath, mimetype='application/json')
-                        service.files().create(
-                            body=meta, media_body=media, supportsAllDrives=True,
-                        ).execute()
-                        logger.info(f"  Uploaded to Drive: {filepath}")
+                to_upload = {}
+                for filepath in [self.snapshots_file]:
+                    if not os.path.exists(filepath):
+                        continue
+                    name = os.path.basename(filepath)
+                    prev = previous_files.get(name)
+                    if prev and prev.get('md5Checksum') == file_md5(filepath):
+                        logger.info(
+                            f"  Unchanged since last upload, skipping: {name} "
+                            f"({prev.get('webViewLink', prev['id'])})"
+                        )
+                        continue
+                    to_upload[name] = filepath
+                if (to_upload or changes['changed'] or changes['new']) \
+                        and os.path.exists(self.results_file):
+                    to_upload[os.path.basename(self.results_file)] = self.results_file
+
+                if to_upload:
+                    subfolder_id = create_or_get_subfolder(
+                        service, self.drive_folder_id, subfolder,
+                    )
+                    upload_files(
+                        service_factory, to_upload, subfolder_id,
+                        mimetype='application/json',
+                    )
+                else:
+                    logger.info("Drive: nothing changed since last run — no upload")
             except Exception as e:
                 logger.warning(f"Drive upload failed: {e}")
 
         # 9. Print summary
         print(f"\n{'='*60}")
-        print(f"RHTP SPENDING MONITOR — {run_date}")
+        print(f"{self.label} SPENDING MONITOR — {run_date}")
         print(f"{'='*60}")
-        print(f"Awards found on USASpending: {len(api_data)}/50")
+        print(f"Awards found on USASpending: {len(api_data)}/{len(self.award_names)}")
         print(f"Changed: {len(changes['changed'])}")
         print(f"New: {len(changes['new'])}")
         print(f"Unchanged: {len(changes['unchanged'])}")
@@ -747,9 +784,9 @@ class SpendingMonitor:
         n_unchanged = len(changes['unchanged'])
 
         if n_changed or n_new:
-            subject = f"RHTP Outlay Monitor: {n_changed} changed, {n_new} new ({run_date})"
+            subject = f"{self.label} Outlay Monitor: {n_changed} changed, {n_new} new ({run_date})"
         else:
-            subject = f"RHTP Outlay Monitor: no changes ({run_date})"
+            subject = f"{self.label} Outlay Monitor: no changes ({run_date})"
 
         body = self._format_email(changes, api_data, run_date)
 
@@ -774,8 +811,8 @@ class SpendingMonitor:
     ) -> str:
         """Format plain-text email body."""
         parts = [
-            f"RHTP Outlay Monitor — {run_date}",
-            f"Awards found on USASpending: {len(api_data)}/50",
+            f"{self.label} Outlay Monitor — {run_date}",
+            f"Awards found on USASpending: {len(api_data)}/{len(self.award_names)}",
             f"Changed: {len(changes['changed'])}  |  "
             f"New: {len(changes['new'])}  |  "
             f"Unchanged: {len(changes['unchanged'])}",
@@ -818,15 +855,25 @@ class SpendingMonitor:
 
     def _write_results(self, results: Dict):
         """Write results JSON for GitHub Actions."""
-        with open('spending-monitor-results.json', 'w') as f:
+        with open(self.results_file, 'w') as f:
             json.dump(results, f, indent=2, default=str)
 
 
 def main():
-    import sys
-    outlays_only = '--outlays-only' in sys.argv[1:]
-    monitor = SpendingMonitor()
-    monitor.run(outlays_only=outlays_only)
+    parser = argparse.ArgumentParser(description='USASpending award monitor')
+    parser.add_argument('--outlays-only', action='store_true',
+                        help='Only refresh outlays files — no board, snapshots or email')
+    parser.add_argument('--program', action='append', choices=sorted(PROGRAMS),
+                        help=f'Program id from programs.json (repeatable; default {DEFAULT_PROGRAM})')
+    parser.add_argument('--all-programs', action='store_true',
+                        help='Run every program in programs.json')
+    args = parser.parse_args()
+
+    keys = sorted(PROGRAMS) if args.all_programs else (args.program or [DEFAULT_PROGRAM])
+    client = USASpendingClient()
+    for key in keys:
+        monitor = SpendingMonitor(key, client=client)
+        monitor.run(outlays_only=args.outlays_only)
 
 
 if __name__ == '__main__':
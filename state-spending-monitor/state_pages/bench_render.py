@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Render benchmark for build.py over synthetic inputs.
+
+Clones the real states into N synthetic entities ("Ohio 0042", ...) with the
+same dispatches, authored content, facts, KPIs, maps and screenshots, then
+times render_state for every entity plus the index, methodology and every
+registered cluster page. Nothing is written to disk.
+
+Usage:
+  python bench_render.py [N] [--repeat R]     (default: 5000 entities, best of 3)
+"""
+import argparse, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_argv, sys.argv = sys.argv, sys.argv[:1]
+import build  # noqa: E402
+sys.argv = _argv
+
+PER_STATE = ("dispatches", "AUTHORED", "state_facts", "KPIS", "rural_maps", "screenshots")
+
+def synthesize(n):
+    real = [name for name in build.states_data if name != "CMS"]
+    entities = {}
+    for i in range(n):
+        base = real[i % len(real)]
+        name = f"{base} {i:04d}"
+        entities[name] = build.states_data[base]
+        for table in PER_STATE:
+            data = getattr(build, table)
+            if base in data:
+                data[name] = data[base]
+    build.states_data = entities
+    return list(entities)
+
+def run(names):
+    size = 0
+    t0 = time.perf_counter()
+    cards = []
+    for name in names:
+        page, card = build.render_state(name, build.states_data[name])
+        cards.append(card)
+        size += len(page)
+    t1 = time.perf_counter()
+    size += len(build.render_index(cards)) + len(build.render_methodology(cards))
+    for key, inputs, render in build.CLUSTER_PAGES:
+        size += len(render(names))
+    t2 = time.perf_counter()
+    return t1 - t0, t2 - t1, size
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("entities", nargs="?", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+    names = synthesize(args.entities)
+    states, aggregates, size = min(run(names) for _ in range(args.repeat))
+    print(f"{len(names)} entities  |  state pages {states*1000:.0f} ms "
+          f"({states*1e6/len(names):.0f} us/page)  |  index + methodology + "
+          f"{len(build.CLUSTER_PAGES)} cluster pages {aggregates*1000:.0f} ms  |  "
+          f"{size/1e6:.1f} MB of HTML (best of {args.repeat})")
+
+if __name__ == "__main__":
+    main()
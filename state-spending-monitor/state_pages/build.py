@@ -3,10 +3,25 @@
 Merges  states_data.json (Monday) + dispatch_index.json (Substack export parse)
 + content.json (authored Q&A)  ->  work/rht/states/<slug>/index.html  for all 50
 states, plus a states index. Authored states render full prose; the rest render
-honest structured-derived answers that upgrade automatically once authored."""
-import json, os, re, html, urllib.parse, datetime
+honest structured-derived answers that upgrade automatically once authored.
+
+Builds are incremental: each page's inputs are fingerprinted into
+build_manifest.json and only pages whose inputs (or the template) changed are
+re-rendered. `python build.py --full` re-renders everything; `--jobs N` renders
+state pages in N processes (output is identical to a serial build)."""
+import argparse, gzip, hashlib, json, os, pickle, re, html, time, urllib.parse, datetime, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+try:
+    import brotli          # optional: --precompress also writes .br siblings
+except ImportError:
+    brotli = None
 
 LAST_REVIEWED = datetime.date.today().isoformat()
+# Pages are rendered with this placeholder where the review date goes. The date
+# filled in is the previous one when the page's content (placeholder included)
+# is unchanged, so an unchanged page is never rewritten (see write_page).
+REVIEWED = "%%LAST_REVIEWED%%"
 SITE = "https://www.civicoperator.com"
 TRACKER = "https://www.ruralhealthtransformation.life"
 
@@ -56,40 +71,175 @@ REPO_ROOT = os.environ.get("REPO_ROOT", os.path.abspath(os.path.join(HERE, "..",
 OUT_ROOT = os.path.join(REPO_ROOT, "work", "rht", "states")
 ACT = os.path.join(REPO_ROOT, "work", "rht", "activity", "index.html")
 
-states_data = json.load(open(os.path.join(HERE, "states_data.json"), encoding="utf-8"))
-dispatches  = json.load(open(os.path.join(HERE, "dispatch_index.json"), encoding="utf-8"))
-content     = json.load(open(os.path.join(HERE, "content.json"), encoding="utf-8"))
-PROC_PATH   = os.path.join(HERE, "procurements.json")
-procurements = json.load(open(PROC_PATH, encoding="utf-8")) if os.path.exists(PROC_PATH) else {}
-SHOTS_PATH  = os.path.join(HERE, "screenshots_meta.json")
-screenshots = json.load(open(SHOTS_PATH, encoding="utf-8")) if os.path.exists(SHOTS_PATH) else {}
+# ---------- inputs (compiled build cache) ----------
+# Parsing the JSON inputs (~1.5 MB; kpis.json alone is ~690 KB) and regex-scanning
+# the activity page for its <style> block used to dominate a no-op build.
+# compile_inputs() projects them down to the fields the renderer actually uses
+# and load_inputs() pickles that to BUILD_CACHE, reusing it while this file and
+# every source are unchanged: same size + mtime, or (after a fresh checkout resets
+# mtimes) same content hash. BUILD_CACHE=0 in the environment bypasses it.
+SOURCES = {
+    "states_data": os.path.join(HERE, "states_data.json"),
+    "dispatch_index": os.path.join(HERE, "dispatch_index.json"),
+    "content": os.path.join(HERE, "content.json"),
+    "procurements": os.path.join(HERE, "procurements.json"),
+    "screenshots_meta": os.path.join(HERE, "screenshots_meta.json"),
+    "rural_maps": os.path.join(HERE, "rural_maps.json"),
+    "kpis": os.path.join(HERE, "kpis.json"),
+    "state_facts": os.path.join(HERE, "state_facts.json"),
+    "outlays": os.path.join(HERE, "outlays.json"),
+    "programs": os.path.join(HERE, "..", "programs.json"),
+    "activity": ACT,
+}
+BUILD_CACHE = os.path.join(HERE, ".build-cache.pickle")
+
+def _read(path, binary=False):
+    """A whole file as bytes or UTF-8 text (handle closed before returning)."""
+    with (open(path, "rb") if binary else open(path, encoding="utf-8")) as f:
+        return f.read()
+
+GENERATOR_SOURCE = _read(__file__, binary=True)
+LOAD_TIMINGS = {}   # phase -> seconds, plus "cache": how the inputs were obtained
+
+def _load_json(key, default=None):
+    path = SOURCES[key]
+    if default is not None and not os.path.exists(path):
+        return default
+    t = time.perf_counter()
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    LOAD_TIMINGS[f"json:{key}"] = time.perf_counter() - t
+    return data
+
+def compile_inputs():
+    """Parse every source and keep only what the pages render from."""
+    content = _load_json("content")
+    kpis_raw = _load_json("kpis", {"states": []})
+    rhtp = _load_json("programs")["rhtp"]
+    t = time.perf_counter()
+    with open(ACT, encoding="utf-8") as f:
+        style = re.search(r"<style>.*?</style>", f.read(), re.S).group(0)
+    LOAD_TIMINGS["style"] = time.perf_counter() - t
+    return {
+        "states_data": _load_json("states_data"),
+        "dispatches": {name: [{"date": it["date"], "url": it["url"], "headline": it["headline"]}
+                              for it in items]
+                       for name, items in _load_json("dispatch_index").items()},
+        "questions": content["questions"],
+        "authored": content["authored"],
+        "procurements": _load_json("procurements", {}),
+        "screenshots": _load_json("screenshots_meta", {}),
+        "rural_maps": _load_json("rural_maps", {}),
+        # only the topic list and narrative URL are public (see kpi_block)
+        "kpis": {s["state"]: {"tracked": s["tracked"],
+                              "source": {"url": (s.get("source") or {}).get("url")}}
+                 for s in kpis_raw.get("states", []) if s.get("tracked")},
+        "state_facts": _load_json("state_facts", {}),
+        "outlays": _load_json("outlays", {}),
+        "rhtp_award_fain": {state: fain for fain, state in rhtp["awards"].items()},
+        "rhtp_agency_code": rhtp.get("agency_code", "075"),
+        "style": style,
+    }
+
+def _source_stats():
+    return {k: ([st.st_size, st.st_mtime_ns] if (st := _stat(p)) else None) for k, p in SOURCES.items()}
+
+def _stat(path):
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def _source_hashes():
+    out = {}
+    for k, p in SOURCES.items():
+        try:
+            with open(p, "rb") as f:
+                out[k] = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            out[k] = None
+    return out
+
+def load_inputs():
+    t0 = time.perf_counter()
+    generator = hashlib.sha256(GENERATOR_SOURCE).hexdigest()
+    stats = _source_stats()
+    use_cache = os.environ.get("BUILD_CACHE", "1") != "0"
+    cached = None
+    if use_cache and os.path.exists(BUILD_CACHE):
+        try:
+            with open(BUILD_CACHE, "rb") as f:
+                cached = pickle.load(f)
+        except Exception:
+            cached = None
+    if cached and cached.get("generator") == generator:
+        if cached["stats"] == stats:
+            LOAD_TIMINGS["cache"] = "hit"
+            LOAD_TIMINGS["total"] = time.perf_counter() - t0
+            return cached["inputs"]
+        hashes = _source_hashes()
+        if cached["hashes"] == hashes:
+            LOAD_TIMINGS["cache"] = "hit (rehashed)"
+            _write_cache(dict(cached, stats=stats))
+            LOAD_TIMINGS["total"] = time.perf_counter() - t0
+            return cached["inputs"]
+    else:
+        hashes = _source_hashes() if use_cache else None
+    inputs = compile_inputs()
+    LOAD_TIMINGS["cache"] = "compiled" if use_cache else "disabled"
+    if use_cache:
+        _write_cache({"generator": generator, "stats": stats, "hashes": hashes, "inputs": inputs})
+    LOAD_TIMINGS["total"] = time.perf_counter() - t0
+    return inputs
+
+def _write_cache(entry):
+    t = time.perf_counter()
+    tmp = BUILD_CACHE + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, BUILD_CACHE)
+    except OSError as e:
+        print(f"Could not write build cache {BUILD_CACHE}: {e}")
+    LOAD_TIMINGS["cache_write"] = time.perf_counter() - t
+
+def format_load_timings():
+    ms = lambda k: f"{LOAD_TIMINGS.get(k, 0) * 1000:.1f} ms"
+    line = f"Inputs loaded in {ms('total')} (build cache: {LOAD_TIMINGS.get('cache')})"
+    parsed = sum(v for k, v in LOAD_TIMINGS.items() if k.startswith("json:"))
+    if parsed:
+        line += f"  |  JSON parse {parsed * 1000:.1f} ms, STYLE scan {ms('style')}"
+    if "cache_write" in LOAD_TIMINGS:
+        line += f", cache write {ms('cache_write')}"
+    return line
+
+INPUTS = load_inputs()
+states_data = INPUTS["states_data"]
+dispatches  = INPUTS["dispatches"]
+procurements = INPUTS["procurements"]
+screenshots = INPUTS["screenshots"]
 # per-state rural-geography detail: survey tier, FORHP baseline county/tract counts,
 # authoritative source URL, and (for the ~15 states with one) the authentic
 # state-published rural map. Materialized from G:/RHT/Geographies (CSV + curated
 # provenance) by gen_rural_maps.py so the CI build never needs the Drive mount.
-RURAL_PATH  = os.path.join(HERE, "rural_maps.json")
-rural_maps  = json.load(open(RURAL_PATH, encoding="utf-8")) if os.path.exists(RURAL_PATH) else {}
-KPI_PATH    = os.path.join(HERE, "kpis.json")
-kpis_raw    = json.load(open(KPI_PATH, encoding="utf-8")) if os.path.exists(KPI_PATH) else {"states": []}
+rural_maps  = INPUTS["rural_maps"]
 # self-declared metrics/objectives extracted from each state's CMS project narrative,
 # keyed by state display name. Only `tracked` (the topic list) is surfaced publicly;
-# the detailed baseline->target rows stay for the paywalled tracker.
-KPIS        = {s["state"]: s for s in kpis_raw.get("states", []) if s.get("tracked")}
+# the detailed baseline->target rows stay for the paywalled tracker (and out of the
+# build cache).
+KPIS        = INPUTS["kpis"]
 # per-state factual add-ons: rural-geography classification + exact CMS/USAspending
 # obligated award. NB: the maturity "Stage" analysis is intentionally NOT here —
 # it lives in the paid Field Guide, not this public repo.
-FACTS_PATH  = os.path.join(HERE, "state_facts.json")
-state_facts = json.load(open(FACTS_PATH, encoding="utf-8")) if os.path.exists(FACTS_PATH) else {}
+state_facts = INPUTS["state_facts"]
 # weekly USASpending pull: obligated (committed) + outlaid (actually disbursed) per
 # state. Written by spending_monitor.py each Monday run; drives the /outlays/ page.
-OUTLAYS_PATH = os.path.join(HERE, "outlays.json")
-outlays_data = json.load(open(OUTLAYS_PATH, encoding="utf-8")) if os.path.exists(OUTLAYS_PATH) else {}
-QUESTIONS   = content["questions"]
-AUTHORED    = content["authored"]
+outlays_data = INPUTS["outlays"]
+QUESTIONS   = INPUTS["questions"]
+AUTHORED    = INPUTS["authored"]
 
-STYLE = re.search(r"<style>.*?</style>", open(ACT, encoding="utf-8").read(), re.S).group(0)
+STYLE = INPUTS["style"]
 EXTRA_CSS = """
-<style>
 .facts{display:grid;grid-template-columns:repeat(auto-fit,minmax(240px,1fr));gap:2px 22px;background:#fff;border:1px solid #eadbcd;border-radius:10px;padding:16px 20px;margin:16px 0 8px;}
 .facts div{padding:7px 0;border-bottom:1px solid #f1e6d9;}
 .facts .k{font-family:'Poppins',sans-serif;font-weight:600;font-size:.7rem;letter-spacing:.05em;text-transform:uppercase;color:#8a7f72;}
@@ -165,7 +315,7 @@ EXTRA_CSS = """
 .related a{color:#005f75;font-weight:600;font-family:'Poppins',sans-serif;text-decoration:none;margin-right:18px;}
 .related a:hover{text-decoration:underline;}
 .rowlink{color:#005f75;text-decoration:none;} .rowlink:hover{text-decoration:underline;}
-</style>"""
+"""
 
 # Global header: identical link set to the hand-authored pages (Work / About / Book a call).
 NAV = """<header class="sitebar">
@@ -193,6 +343,98 @@ SUBNAV = """<div class="rht-subnav">
 def slug(name): return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
 def strip_tags(s): return re.sub(r"\s+", " ", html.unescape(re.sub(r"<[^>]+>", "", s))).strip()
 
+# ---------- template layer ----------
+# Every generated page is PAGE filled in: the shared head (charset, viewport,
+# title, description), the page's own head tags, analytics, the stylesheet link,
+# JSON-LD, then NAV + SUBNAV around the page body. Fragments are split into
+# literal chunks once at import, so rendering is one "".join; rows and lists are
+# built with joins rather than string += in loops.
+class Fragment:
+    """A template with {slot} placeholders ({{ and }} for literal braces),
+    compiled once into literal chunks and slot positions. Keyword arguments
+    fill slots with constants at compile time."""
+    _SLOT = re.compile(r"\{\{|\}\}|\{(\w+)\}")
+
+    def __init__(self, text, **fixed):
+        self.parts, self.slots, literal, pos = [], [], [], 0
+        for m in self._SLOT.finditer(text):
+            literal.append(text[pos:m.start()])
+            if m.group(1) in fixed:
+                literal.append(fixed[m.group(1)])
+            elif m.group(1):
+                self.parts.append("".join(literal))
+                literal = []
+                self.slots.append((len(self.parts), m.group(1)))
+                self.parts.append(None)
+            else:
+                literal.append(m.group(0)[0])
+            pos = m.end()
+        literal.append(text[pos:])
+        self.parts.append("".join(literal))
+
+    def render(self, **values):
+        out = list(self.parts)
+        for i, name in self.slots:
+            v = values[name]
+            out[i] = v if isinstance(v, str) else str(v)
+        return "".join(out)
+
+PAGE = Fragment("""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{title}</title>
+<meta name="description" content="{description}">
+{head}
+{analytics}
+{styles}
+<script type="application/ld+json">
+{ld}
+</script>
+</head>
+<body>
+{chrome}
+<div class="ai">
+{body}
+</div>
+</body>
+</html>""")
+CHROME = NAV + "\n" + SUBNAV
+
+def render_page(title, description, head, analytics, ld, body):
+    return PAGE.render(title=title, description=description, head=head, analytics=analytics,
+                       styles=PAGE_STYLES, ld=ld, chrome=CHROME, body=body)
+
+STATES_TRAIL = [("Home", "/"), ("RHT", "/work/rht"), ("States", "/work/rht/states/")]
+SEP = '<span class="sep">&rsaquo;</span>'
+
+def crumbs(trail, current):
+    """Visible breadcrumb: linked trail, then the current page as plain text."""
+    links = [f'<a href="{u}">{n}</a>' for n, u in trail] + [f"<span>{current}</span>"]
+    return f'<nav class="crumbs" aria-label="Breadcrumb">{SEP.join(links)}</nav>'
+
+LD_TRAIL = [("Home", "/"), ("Work", "/work"), ("RHT", "/work/rht")]
+
+def breadcrumb_ld(trail):
+    return {"@type": "BreadcrumbList", "itemListElement": [
+        {"@type": "ListItem", "position": i + 1, "name": n, "item": SITE + u}
+        for i, (n, u) in enumerate(trail)]}
+
+RELATED_ALL_STATES = '<a href="/work/rht/states/">&larr; All 50 state profiles</a>'
+RELATED_CLUSTERS = "\n".join([
+    '<a href="/work/rht/states/outlays/">Federal money disbursed by state &rarr;</a>',
+    '<a href="/work/rht/states/rural-definitions/">How states define &ldquo;rural&rdquo; &rarr;</a>',
+    '<a href="/work/rht/states/agencies/">Administering agencies by state &rarr;</a>',
+    '<a href="/work/rht/states/methodology">Methodology &amp; sources &rarr;</a>',
+])
+
+def related(*links):
+    return '<p class="related">\n' + "\n".join(links) + "\n</p>"
+
+def table_rows(rows):
+    return "".join("<tr>" + "".join(f"<td>{c}</td>" for c in r) + "</tr>" for r in rows)
+
 def award_str(m):
     if not m: return None
     try: v = float(m)
@@ -316,46 +558,30 @@ def derived_answers(name, d):
 # ---------- dispatch list ----------
 def dispatch_html(name):
     items = dispatches.get(name, [])
-    out = ""
+    out = []
     for it in items:
         base, _, frag = it["url"].partition("#")
         url = base + "#" + urllib.parse.quote(frag) if frag else base
-        out += (f'<div class="item"><span class="d">{it["date"]}</span>'
-                f'<a href="{html.escape(url)}" target="_blank" rel="noopener">{html.escape(it["headline"])}</a></div>')
-    return out, len(items)
+        out.append(f'<div class="item"><span class="d">{it["date"]}</span>'
+                   f'<a href="{html.escape(url)}" target="_blank" rel="noopener">{html.escape(it["headline"])}</a></div>')
+    return "".join(out), len(items)
 
 # ---------- federal award link ----------
 # Direct USAspending award pages for each state's RHTP cooperative agreement
 # (CFDA 93.798, awarding agency HHS/CMS, sub-tier code _075). Keyed by state
 # display name -> award FAIN. The prior free-text ?query= search matched nothing
 # on USAspending's site; these land straight on the state's $-figure award page.
-# Source: USAspending spending_by_award API, program_numbers=["93.798"].
-RHTP_AWARD_FAIN = {
-    "Alabama": "RHTCMS332060", "Alaska": "RHTCMS332062", "Arizona": "RHTCMS332059",
-    "Arkansas": "RHTCMS332061", "California": "RHTCMS332078", "Colorado": "RHTCMS332081",
-    "Connecticut": "RHTCMS332073", "Delaware": "RHTCMS332053", "Florida": "RHTCMS332067",
-    "Georgia": "RHTCMS332046", "Hawaii": "RHTCMS332064", "Idaho": "RHTCMS332084",
-    "Illinois": "RHTCMS332055", "Indiana": "RHTCMS332070", "Iowa": "RHTCMS332065",
-    "Kansas": "RHTCMS332072", "Kentucky": "RHTCMS332079", "Louisiana": "RHTCMS332085",
-    "Maine": "RHTCMS332075", "Maryland": "RHTCMS332066", "Massachusetts": "RHTCMS332069",
-    "Michigan": "RHTCMS332041", "Minnesota": "RHTCMS332077", "Mississippi": "RHTCMS332063",
-    "Missouri": "RHTCMS332090", "Montana": "RHTCMS332058", "Nebraska": "RHTCMS332086",
-    "Nevada": "RHTCMS332074", "New Hampshire": "RHTCMS332050", "New Jersey": "RHTCMS332089",
-    "New Mexico": "RHTCMS332083", "New York": "RHTCMS332049", "North Carolina": "RHTCMS332042",
-    "North Dakota": "RHTCMS332043", "Ohio": "RHTCMS332087", "Oklahoma": "RHTCMS332048",
-    "Oregon": "RHTCMS332071", "Pennsylvania": "RHTCMS332052", "Rhode Island": "RHTCMS332045",
-    "South Carolina": "RHTCMS332056", "South Dakota": "RHTCMS332080", "Tennessee": "RHTCMS332057",
-    "Texas": "RHTCMS332068", "Utah": "RHTCMS332051", "Vermont": "RHTCMS332047",
-    "Virginia": "RHTCMS332088", "Washington": "RHTCMS332044", "West Virginia": "RHTCMS332054",
-    "Wisconsin": "RHTCMS332076", "Wyoming": "RHTCMS332082",
-}
+# Source of truth is the program registry (../programs.json, "rhtp" -> awards),
+# shared with spending_monitor.py.
+RHTP_AWARD_FAIN = INPUTS["rhtp_award_fain"]
+RHTP_AGENCY_CODE = INPUTS["rhtp_agency_code"]
 
 def usaspending_url(name):
     """Direct award page when we have the state's RHTP FAIN; else fall back to
     a keyword search (broader match than the old full-phrase query)."""
     fain = RHTP_AWARD_FAIN.get(name)
     if fain:
-        return f"https://www.usaspending.gov/award/ASST_NON_{fain}_075/"
+        return f"https://www.usaspending.gov/award/ASST_NON_{fain}_{RHTP_AGENCY_CODE}/"
     q = urllib.parse.quote("Rural Health Transformation")
     return f"https://www.usaspending.gov/search/?query={q}"
 
@@ -365,15 +591,15 @@ def procurement_block(name):
         return (f'<div class="st"><h2>Procurements &amp; official documents</h2>'
                 f'<p class="note-q">No RFPs, RFAs, NOFOs or awards are on record for {name} yet. '
                 f'Solicitations will appear here, each linked to its primary source, as the state publishes them.</p></div>')
-    rows = ""
+    cells = []
     for r in items:
         title = html.escape(r["title"])
         if r.get("source"):
             title = f'<a href="{html.escape(r["source"])}" target="_blank" rel="noopener">{title}</a>'
         dt = html.escape(r.get("doctype") or "&mdash;") if r.get("doctype") else "&mdash;"
         dt_cell = f'<span class="dt">{dt}</span>' if r.get("doctype") else "&mdash;"
-        rows += (f'<tr><td>{title}</td><td>{dt_cell}</td>'
-                 f'<td>{r.get("published") or "&mdash;"}</td><td>{r.get("deadline") or "&mdash;"}</td></tr>')
+        cells.append((title, dt_cell, r.get("published") or "&mdash;", r.get("deadline") or "&mdash;"))
+    rows = table_rows(cells)
     return (f'<div class="st"><h2>Procurements &amp; official documents <span class="n">&middot; {len(items)}</span></h2>'
             f'<p class="note-q">RFPs, RFAs, NOFOs and awards on record for {name}, each row linked to its primary source '
             f'document. Compiled from state .gov portals and the program’s reporting; newest first.</p>'
@@ -448,6 +674,31 @@ def rural_map_block(name):
             f'Source: {cap_src}. See <a href="/work/rht/states/rural-definitions/#map-{sl}">'
             f'how every state defines rural</a>.</figcaption></figure>')
 
+STATE_HEAD = Fragment("""<link rel="icon" href="/favicon.ico">
+<meta property="og:title" content="{name} Rural Health Transformation Program State Profile">
+<meta property="og:description" content="Exact CMS award, administering agency, committed metrics, rural definition, official sources and a dated activity log for {name}'s Rural Health Transformation Program.">
+<meta property="og:type" content="website">
+<meta property="og:url" content="{page_url}">
+<link rel="canonical" href="{page_url}">""")
+STATE_BODY = Fragment("""{crumbs}
+<h1>{name} Rural Health Transformation Program State Profile</h1>
+<p class="lede">{lede}</p>
+{hub_line}
+{hero}
+{rural_map}
+<div class="rule"></div>
+<div class="st"><h2>At a glance</h2>
+<div class="facts">{fact_rows}</div></div>
+{kpis}
+<div class="st"><h2>Questions &amp; answers</h2><div class="faq">{faq}</div></div>
+{disp_block}
+<div class="st"><h2>Related</h2>{related}</div>
+<p class="gov">Independent reference profile compiled and maintained by <strong>Civic Operator LLC</strong> from primary sources (CMS, {name} .gov program and procurement pages, the Governor's newsroom) and the Rural Health Transformation Grant Tracker. Official-source data and dispatch links refresh nightly; profiles are regenerated weekly from the latest reporting and changes reviewed before publication. Last reviewed {reviewed}. &middot; <a href="/work/rht/states/methodology">Methodology &amp; sources</a> &middot; <a href="/work/rht/states">All states</a></p>
+<footer>Rural Health Transformation Grant Tracker &middot; {name} &middot; <a href="{tracker}/" style="color:#007a99;">ruralhealthtransformation.life</a></footer>""",
+    tracker=TRACKER, reviewed=REVIEWED,
+    related=related(RELATED_ALL_STATES, RELATED_CLUSTERS,
+                    f'<a href="{TRACKER}/" target="_blank" rel="noopener">Newsletter analysis &rarr;</a>'))
+
 def render_state(name, d):
     sl = slug(name)
     auth = AUTHORED.get(name)
@@ -495,12 +746,11 @@ def render_state(name, d):
     ]
     fact_rows = "".join(f'<div><div class="k">{k}</div><div class="v">{v}</div></div>' for k, v in facts)
 
-    faq = ""
-    ld_faq = []
-    for (q, (ah, at)) in zip(qs, answers):
-        faq += f'<details><summary>{html.escape(q)}</summary><div class="a">{ah}</div></details>'
-        ld_faq.append({"@type": "Question", "name": q,
-                       "acceptedAnswer": {"@type": "Answer", "text": at or strip_tags(ah)}})
+    faq = "".join(f'<details><summary>{html.escape(q)}</summary><div class="a">{ah}</div></details>'
+                  for q, (ah, _) in zip(qs, answers))
+    ld_faq = [{"@type": "Question", "name": q,
+               "acceptedAnswer": {"@type": "Answer", "text": at or strip_tags(ah)}}
+              for q, (ah, at) in zip(qs, answers)]
 
     # ---- JSON-LD @graph: WebPage + GovernmentService + Dataset + FAQPage + BreadcrumbList ----
     page_url = f"{SITE}/work/rht/states/{sl}/"
@@ -527,7 +777,7 @@ def render_state(name, d):
                        f"exact federal award, administering agency, how the state defines rural, "
                        f"the performance measures it committed to CMS, official sources and dated activity.",
         "isAccessibleForFree": True, "creator": {"@type": "Organization", "name": "Civic Operator LLC"},
-        "dateModified": LAST_REVIEWED,
+        "dateModified": REVIEWED,
         "variableMeasured": [
             *([{"@type": "PropertyValue", "name": "CMS Year-1 federal award (obligated)",
                 "unitText": "USD", "value": int(round(_ob)) if _ob else usd}] if (_ob or usd) else []),
@@ -542,17 +792,14 @@ def render_state(name, d):
         "name": f"{name} Rural Health Transformation Program State Profile",
         "isPartOf": {"@type": "CollectionPage", "@id": f"{SITE}/work/rht/states/"},
         "about": {"@id": page_url + "#service"},
-        "dateModified": LAST_REVIEWED,
+        "dateModified": REVIEWED,
         "publisher": {"@type": "Organization", "name": "Civic Operator LLC", "url": SITE},
         **({"primaryImageOfPage": {"@type": "ImageObject",
             "url": f"{SITE}/img/states/{sl}.webp",
             "caption": f"{name}'s official Rural Health Transformation Program page"}}
            if name in screenshots else {}),
     }
-    breadcrumb = {"@type": "BreadcrumbList", "itemListElement": [
-        {"@type": "ListItem", "position": i + 1, "name": n, "item": SITE + u}
-        for i, (n, u) in enumerate([("Home", "/"), ("Work", "/work"), ("RHT", "/work/rht"),
-                                    ("States", "/work/rht/states/"), (name, f"/work/rht/states/{sl}/")])]}
+    breadcrumb = breadcrumb_ld(LD_TRAIL + [("States", "/work/rht/states/"), (name, f"/work/rht/states/{sl}/")])
     faqpage = {"@type": "FAQPage", "@id": page_url + "#faq", "mainEntity": ld_faq}
     ld = json.dumps({"@context": "https://schema.org",
                      "@graph": [webpage, gov_service, dataset, faqpage, breadcrumb]},
@@ -567,79 +814,62 @@ def render_state(name, d):
                   f'related <a href="{TRACKER}/" target="_blank" rel="noopener" style="color:#007a99;">Tracker '
                   f'analysis</a>.</p>{disp}</div>') if ndisp else ""
 
-    analytics = ga_tag("state_profile", name)
-    page = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{name} Rural Health Transformation Program &mdash; CMS award, lead agency, committed metrics &amp; activity &middot; Civic Operator</title>
-<meta name="description" content="{name}'s CMS Rural Health Transformation Program at a glance: the exact Year-1 federal award, administering agency and contacts, how the state defines rural, the metrics it committed to CMS, official .gov sources, and a dated activity log. Independent reference by Civic Operator.">
-<link rel="icon" href="/favicon.ico">
-<meta property="og:title" content="{name} Rural Health Transformation Program State Profile">
-<meta property="og:description" content="Exact CMS award, administering agency, committed metrics, rural definition, official sources and a dated activity log for {name}'s Rural Health Transformation Program.">
-<meta property="og:type" content="website">
-<meta property="og:url" content="{page_url}">
-<link rel="canonical" href="{page_url}">
-{analytics}
-{STYLE}
-{EXTRA_CSS}
-<script type="application/ld+json">
-{ld}
-</script>
-</head>
-<body>
-{NAV}
-{SUBNAV}
-<div class="ai">
-<nav class="crumbs" aria-label="Breadcrumb"><a href="/">Home</a><span class="sep">&rsaquo;</span><a href="/work/rht">RHT</a><span class="sep">&rsaquo;</span><a href="/work/rht/states/">States</a><span class="sep">&rsaquo;</span><span>{name}</span></nav>
-<h1>{name} Rural Health Transformation Program State Profile</h1>
-<p class="lede">{lede}</p>
-{hub_line}
-{hero_block(name)}
-{rural_map_block(name)}
-<div class="rule"></div>
-<div class="st"><h2>At a glance</h2>
-<div class="facts">{fact_rows}</div></div>
-{kpi_block(name)}
-<div class="st"><h2>Questions &amp; answers</h2><div class="faq">{faq}</div></div>
-{disp_block}
-<div class="st"><h2>Related</h2><p class="related">
-<a href="/work/rht/states/">&larr; All 50 state profiles</a>
-<a href="/work/rht/states/outlays/">Federal money disbursed by state &rarr;</a>
-<a href="/work/rht/states/rural-definitions/">How states define &ldquo;rural&rdquo; &rarr;</a>
-<a href="/work/rht/states/agencies/">Administering agencies by state &rarr;</a>
-<a href="/work/rht/states/methodology">Methodology &amp; sources &rarr;</a>
-<a href="{TRACKER}/" target="_blank" rel="noopener">Newsletter analysis &rarr;</a>
-</p></div>
-<p class="gov">Independent reference profile compiled and maintained by <strong>Civic Operator LLC</strong> from primary sources (CMS, {name} .gov program and procurement pages, the Governor's newsroom) and the Rural Health Transformation Grant Tracker. Official-source data and dispatch links refresh nightly; profiles are regenerated weekly from the latest reporting and changes reviewed before publication. Last reviewed {LAST_REVIEWED}. &middot; <a href="/work/rht/states/methodology">Methodology &amp; sources</a> &middot; <a href="/work/rht/states">All states</a></p>
-<footer>Rural Health Transformation Grant Tracker &middot; {name} &middot; <a href="{TRACKER}/" style="color:#007a99;">ruralhealthtransformation.life</a></footer>
-</div>
-</body>
-</html>"""
-    d_out = os.path.join(OUT_ROOT, sl)
-    os.makedirs(d_out, exist_ok=True)
-    open(os.path.join(d_out, "index.html"), "w", encoding="utf-8").write(page)
-    return {"name": name, "slug": sl, "award": award_str(d.get("award_m")),
+    page = render_page(
+        f"{name} Rural Health Transformation Program &mdash; CMS award, lead agency, committed metrics &amp; activity &middot; Civic Operator",
+        f"{name}'s CMS Rural Health Transformation Program at a glance: the exact Year-1 federal award, administering agency and contacts, how the state defines rural, the metrics it committed to CMS, official .gov sources, and a dated activity log. Independent reference by Civic Operator.",
+        STATE_HEAD.render(name=name, page_url=page_url),
+        ga_tag("state_profile", name), ld,
+        STATE_BODY.render(crumbs=crumbs(STATES_TRAIL, name), name=name, lede=lede, hub_line=hub_line,
+                          hero=hero_block(name), rural_map=rural_map_block(name), fact_rows=fact_rows,
+                          kpis=kpi_block(name), faq=faq, disp_block=disp_block))
+    return page, state_card(name, d)
+
+def state_card(name, d):
+    """The per-state summary the index, methodology and cluster pages are built
+    from. Cheap to compute, so skipped (unchanged) states still contribute one."""
+    auth = AUTHORED.get(name)
+    return {"name": name, "slug": slug(name), "award": award_str(d.get("award_m")),
             "award_firm": award_firm_compact(name),
             "rural_geography": (state_facts.get(name) or {}).get("rural_geography"),
-            "usd": usd, "ndisp": ndisp, "status": status}
+            "usd": award_usd(auth, d), "ndisp": len(dispatches.get(name, [])),
+            "status": "authored" if auth else "derived"}
 
 # ---------- index page (hub root) ----------
+def index_card(c):
+    aw = c.get("award_firm") or (f'~{c["award"]}' if c["award"] else "&mdash;")
+    rg = c.get("rural_geography")
+    rg_bit = f' &middot; {html.escape(rg)}' if rg else ""
+    return (f'<a class="card" href="/work/rht/states/{c["slug"]}/">'
+            f'<div class="nm">{c["name"]}</div>'
+            f'<div class="meta">{aw} &middot; {c["ndisp"]} dispatch{"es" if c["ndisp"]!=1 else ""}{rg_bit}</div></a>')
+
+INDEX_HEAD = f"""<meta property="og:title" content="Rural Health Transformation Program — State-by-State Reference Guide">
+<meta property="og:description" content="Exact CMS awards, administering agencies, rural definitions, committed metrics and official sources for all 50 states' Rural Health Transformation Programs.">
+<link rel="icon" href="/favicon.ico">
+<link rel="canonical" href="{SITE}/work/rht/states/">"""
+INDEX_BODY = Fragment("""{crumbs}
+<h1>Rural Health Transformation Program State-by-State Reference Guide</h1>
+<div class="intro">
+<p>The <strong>Rural Health Transformation Program (RHTP)</strong> is a $50 billion, five-year CMS program &mdash; created by Section 71401 of the One Big Beautiful Bill Act (2025) &mdash; that awarded every U.S. state a share to transform rural health care. Each state administers its own award through a designated agency, on its own timeline, with its own procurements.</p>
+<p>This is an <strong>independent reference</strong> to that program, state by state. Each profile collects the facts that are otherwise scattered across dozens of web sites: the state’s CMS award, its administering agency and contacts, its official program and procurement pages, and a dated log of activity &mdash; each entry deep-linked to the source. It is maintained by Civic Operator LLC as a neutral archive; commentary and analysis live separately on the newsletter.</p>
+</div>
+{how}
+<div class="st"><h2>Compare across states</h2>
+<p class="note-q">Single-dimension reference tables that cut across all 50 states, each linking back to the full profiles.</p>
+{related}</div>
+<div class="st"><h2>Browse all {count} states</h2>
+<p class="note-q">Each card: state &middot; exact CMS Year-1 award &middot; dated dispatches &middot; how it defines rural. Open a state for its full profile.</p>
+<div class="grid">{grid}</div></div>
+<p class="gov">Maintained by <strong>Civic Operator LLC</strong>. Official-source data and dispatch links refresh nightly; profiles are regenerated weekly and reviewed before publication. Last reviewed {reviewed}. &middot; <a href="/work/rht/states/methodology">Methodology &amp; sources</a> &middot; <a href="/work/rht/activity">Quarterly activity index</a></p>
+<footer>Rural Health Transformation Program &middot; State-by-state reference &middot; Civic Operator LLC &middot; <a href="{tracker}/" style="color:#007a99;">Newsletter &amp; analysis</a></footer>""",
+    tracker=TRACKER, reviewed=REVIEWED, related=related(RELATED_CLUSTERS))
+
 def render_index(cards):
     cards_sorted = sorted(cards, key=lambda c: c["name"])
-    grid = ""
-    for c in cards_sorted:
-        aw = c.get("award_firm") or (f'~{c["award"]}' if c["award"] else "&mdash;")
-        rg = c.get("rural_geography")
-        rg_bit = f' &middot; {html.escape(rg)}' if rg else ""
-        grid += (f'<a class="card" href="/work/rht/states/{c["slug"]}/">'
-                 f'<div class="nm">{c["name"]}</div>'
-                 f'<div class="meta">{aw} &middot; {c["ndisp"]} dispatch{"es" if c["ndisp"]!=1 else ""}{rg_bit}</div></a>')
+    grid = "".join(index_card(c) for c in cards_sorted)
     total_disp = sum(c["ndisp"] for c in cards)
     total_usd = sum(c.get("usd") or 0 for c in cards)
     total_b = f"${total_usd/1_000_000_000:.1f}B"
-    total_proc = sum(len(procurements.get(c["name"], [])) for c in cards)
     stats = (f'<div class="stats">'
              f'<div class="stat"><div class="num">{len(cards)}</div><div class="lbl">States tracked</div></div>'
              f'<div class="stat"><div class="num">{total_b}</div><div class="lbl">Year-1 CMS awards</div></div>'
@@ -655,62 +885,19 @@ def render_index(cards):
         {"@type": "CollectionPage", "@id": f"{SITE}/work/rht/states/",
          "url": f"{SITE}/work/rht/states/", "name": "Rural Health Transformation Program — State Profiles",
          "description": "Independent, state-by-state reference profiles of the CMS Rural Health Transformation Program.",
-         "dateModified": LAST_REVIEWED,
+         "dateModified": REVIEWED,
          "isPartOf": {"@type": "WebSite", "name": "Civic Operator", "url": SITE},
          "publisher": {"@id": f"{SITE}/#organization"},
          "hasPart": [{"@type": "WebPage", "name": c["name"],
                       "url": f'{SITE}/work/rht/states/{c["slug"]}/'} for c in cards_sorted]},
-        {"@type": "BreadcrumbList", "itemListElement": [
-            {"@type": "ListItem", "position": i+1, "name": n, "item": SITE+u} for i, (n, u) in
-            enumerate([("Home", "/"), ("Work", "/work"), ("RHT", "/work/rht"), ("States", "/work/rht/states/")])]}
+        breadcrumb_ld(LD_TRAIL + [("States", "/work/rht/states/")])
     ]}, ensure_ascii=False, indent=1)
-    analytics = ga_tag("reference_hub")
-    page = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Rural Health Transformation Program &mdash; State-by-State Reference &middot; Civic Operator</title>
-<meta name="description" content="An independent, state-by-state reference for the $50B CMS Rural Health Transformation Program: exact Year-1 federal awards, administering agencies, how each state defines rural, the metrics states committed to CMS, official .gov sources, and a dated activity log for all 50 states.">
-<meta property="og:title" content="Rural Health Transformation Program — State-by-State Reference Guide">
-<meta property="og:description" content="Exact CMS awards, administering agencies, rural definitions, committed metrics and official sources for all 50 states' Rural Health Transformation Programs.">
-<link rel="icon" href="/favicon.ico">
-<link rel="canonical" href="{SITE}/work/rht/states/">
-{analytics}
-{STYLE}
-{EXTRA_CSS}
-<script type="application/ld+json">
-{coll}
-</script>
-</head>
-<body>
-{NAV}
-{SUBNAV}
-<div class="ai">
-<nav class="crumbs" aria-label="Breadcrumb"><a href="/">Home</a><span class="sep">&rsaquo;</span><a href="/work/rht">RHT</a><span class="sep">&rsaquo;</span><span>States</span></nav>
-<h1>Rural Health Transformation Program State-by-State Reference Guide</h1>
-<div class="intro">
-<p>The <strong>Rural Health Transformation Program (RHTP)</strong> is a $50 billion, five-year CMS program &mdash; created by Section 71401 of the One Big Beautiful Bill Act (2025) &mdash; that awarded every U.S. state a share to transform rural health care. Each state administers its own award through a designated agency, on its own timeline, with its own procurements.</p>
-<p>This is an <strong>independent reference</strong> to that program, state by state. Each profile collects the facts that are otherwise scattered across dozens of web sites: the state’s CMS award, its administering agency and contacts, its official program and procurement pages, and a dated log of activity &mdash; each entry deep-linked to the source. It is maintained by Civic Operator LLC as a neutral archive; commentary and analysis live separately on the newsletter.</p>
-</div>
-{how}
-<div class="st"><h2>Compare across states</h2>
-<p class="note-q">Single-dimension reference tables that cut across all 50 states, each linking back to the full profiles.</p>
-<p class="related">
-<a href="/work/rht/states/outlays/">Federal money disbursed by state &rarr;</a>
-<a href="/work/rht/states/rural-definitions/">How states define &ldquo;rural&rdquo; &rarr;</a>
-<a href="/work/rht/states/agencies/">Administering agencies by state &rarr;</a>
-<a href="/work/rht/states/methodology">Methodology &amp; sources &rarr;</a>
-</p></div>
-<div class="st"><h2>Browse all {len(cards)} states</h2>
-<p class="note-q">Each card: state &middot; exact CMS Year-1 award &middot; dated dispatches &middot; how it defines rural. Open a state for its full profile.</p>
-<div class="grid">{grid}</div></div>
-<p class="gov">Maintained by <strong>Civic Operator LLC</strong>. Official-source data and dispatch links refresh nightly; profiles are regenerated weekly and reviewed before publication. Last reviewed {LAST_REVIEWED}. &middot; <a href="/work/rht/states/methodology">Methodology &amp; sources</a> &middot; <a href="/work/rht/activity">Quarterly activity index</a></p>
-<footer>Rural Health Transformation Program &middot; State-by-state reference &middot; Civic Operator LLC &middot; <a href="{TRACKER}/" style="color:#007a99;">Newsletter &amp; analysis</a></footer>
-</div>
-</body>
-</html>"""
-    open(os.path.join(OUT_ROOT, "index.html"), "w", encoding="utf-8").write(page)
+    page = render_page(
+        "Rural Health Transformation Program &mdash; State-by-State Reference &middot; Civic Operator",
+        "An independent, state-by-state reference for the $50B CMS Rural Health Transformation Program: exact Year-1 federal awards, administering agencies, how each state defines rural, the metrics states committed to CMS, official .gov sources, and a dated activity log for all 50 states.",
+        INDEX_HEAD, ga_tag("reference_hub"), coll,
+        INDEX_BODY.render(crumbs=crumbs(STATES_TRAIL[:2], "States"), how=how, count=len(cards), grid=grid))
+    return page
 
 # ---------- methodology / sources / about ----------
 def render_methodology(cards):
@@ -752,64 +939,40 @@ def render_methodology(cards):
 <p>We keep a strict line between <strong>facts</strong> (award amounts, agencies, official documents, procurements, dates &mdash; here) and <strong>analysis</strong> (interpretation, trends, implications &mdash; on the newsletter). Profiles link into the newsletter’s dated briefs for context, but the reference layer stays neutral.</p>
 
 <h2>Editorial ownership</h2>
-<p>Compiled and maintained by <strong>Civic Operator LLC</strong>. Last reviewed {LAST_REVIEWED}.</p>
+<p>Compiled and maintained by <strong>Civic Operator LLC</strong>. Last reviewed {REVIEWED}.</p>
 </div>"""
     coll = json.dumps({"@context": "https://schema.org", "@graph": [
         ORG,
         {"@type": "WebPage", "@id": f"{SITE}/work/rht/states/methodology/",
          "url": f"{SITE}/work/rht/states/methodology/",
          "name": "Methodology & Sources — RHTP State Reference",
-         "dateModified": LAST_REVIEWED,
+         "dateModified": REVIEWED,
          "publisher": {"@id": f"{SITE}/#organization"}},
-        {"@type": "BreadcrumbList", "itemListElement": [
-            {"@type": "ListItem", "position": i+1, "name": n, "item": SITE+u} for i, (n, u) in
-            enumerate([("Home", "/"), ("Work", "/work"), ("RHT", "/work/rht"),
-                       ("States", "/work/rht/states/"), ("Methodology", "/work/rht/states/methodology/")])]}
+        breadcrumb_ld(LD_TRAIL + [("States", "/work/rht/states/"), ("Methodology", "/work/rht/states/methodology/")])
     ]}, ensure_ascii=False, indent=1)
-    analytics = ga_tag("methodology")
-    page = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Methodology &amp; Sources &mdash; RHTP State Reference &middot; Civic Operator</title>
-<meta name="description" content="How the Civic Operator Rural Health Transformation Program state reference is sourced, derived, updated, and maintained &mdash; and how it separates neutral reference from newsletter analysis.">
-<link rel="icon" href="/favicon.ico">
-<link rel="canonical" href="{SITE}/work/rht/states/methodology/">
-{analytics}
-{STYLE}
-{EXTRA_CSS}
-<script type="application/ld+json">
-{coll}
-</script>
-</head>
-<body>
-{NAV}
-{SUBNAV}
-<div class="ai">
-<nav class="crumbs" aria-label="Breadcrumb"><a href="/">Home</a><span class="sep">&rsaquo;</span><a href="/work/rht">RHT</a><span class="sep">&rsaquo;</span><a href="/work/rht/states/">States</a><span class="sep">&rsaquo;</span><span>Methodology</span></nav>
+    page = render_page(
+        "Methodology &amp; Sources &mdash; RHTP State Reference &middot; Civic Operator",
+        "How the Civic Operator Rural Health Transformation Program state reference is sourced, derived, updated, and maintained &mdash; and how it separates neutral reference from newsletter analysis.",
+        f'<link rel="icon" href="/favicon.ico">\n<link rel="canonical" href="{SITE}/work/rht/states/methodology/">',
+        ga_tag("methodology"), coll,
+        f"""{crumbs(STATES_TRAIL, "Methodology")}
 <p class="eyebrow">Rural Health Transformation Program &middot; Reference</p>
 <h1>Methodology &amp; Sources</h1>
 {body}
-<footer>Rural Health Transformation Program &middot; Methodology &middot; Civic Operator LLC &middot; <a href="/work/rht/states" style="color:#007a99;">All states</a></footer>
-</div>
-</body>
-</html>"""
-    d_out = os.path.join(OUT_ROOT, "methodology")
-    os.makedirs(d_out, exist_ok=True)
-    open(os.path.join(d_out, "index.html"), "w", encoding="utf-8").write(page)
+<footer>Rural Health Transformation Program &middot; Methodology &middot; Civic Operator LLC &middot; <a href="/work/rht/states" style="color:#007a99;">All states</a></footer>""")
+    return page
 
 # ---------- cross-state cluster pages ----------
 # Progressive-enhancement click-to-sort for cluster tables. Served order is
 # unchanged (neutral default holds with JS off). Numeric columns (detected by
 # stripping $ , and spaces) sort numerically; others sort as text.
-SORT_CSS = """<style>
+SORT_CSS = """
 table.ptab.sortable th{cursor:pointer;user-select:none;white-space:nowrap;}
 table.ptab.sortable th:focus-visible{outline:2px solid #007a99;outline-offset:-2px;}
 table.ptab.sortable th::after{content:'';display:inline-block;width:0;height:0;margin-left:7px;vertical-align:middle;border-left:4px solid transparent;border-right:4px solid transparent;border-top:5px solid currentColor;opacity:.25;}
 table.ptab.sortable th[aria-sort=ascending]::after{border-top:0;border-bottom:5px solid currentColor;opacity:.85;}
 table.ptab.sortable th[aria-sort=descending]::after{opacity:.85;}
-</style>"""
+"""
 SORT_JS = """<script>
 (function(){
   var t=document.querySelector('table.ptab.sortable'); if(!t||!t.tHead) return;
@@ -838,6 +1001,21 @@ SORT_JS = """<script>
 })();
 </script>"""
 
+CLUSTER_HEAD = Fragment("""<meta property="og:title" content="{h1} — RHTP">
+<meta property="og:description" content="{description}">
+<link rel="icon" href="/favicon.ico">
+<link rel="canonical" href="{page_url}">""")
+CLUSTER_BODY = Fragment("""{crumbs}
+<h1>{h1}</h1>
+<div class="intro">{intro}</div>
+<div class="st">{note_html}
+<div class="ptab-wrap"><table class="{tbl_cls}"><thead><tr>{thead}</tr></thead><tbody>{tbody}</tbody></table></div></div>{sort_js}
+{extra_html}
+<div class="st"><h2>Related</h2>{related}</div>
+<p class="gov">Independent reference compiled and maintained by <strong>Civic Operator LLC</strong> from primary sources. Last reviewed {reviewed}. &middot; <a href="/work/rht/states/methodology">Methodology &amp; sources</a> &middot; <a href="/work/rht/states">All states</a></p>
+<footer>Rural Health Transformation Program &middot; {h1} &middot; Civic Operator LLC &middot; <a href="{tracker}/" style="color:#007a99;">Newsletter &amp; analysis</a></footer>""",
+    tracker=TRACKER, reviewed=REVIEWED, related=related(RELATED_ALL_STATES, RELATED_CLUSTERS))
+
 def render_cluster(slug_, h1, title, description, intro, headers, rows, note=None,
                    sortable=False, extra_html=""):
     """Generic single-dimension reference table across all 50 states. Each row
@@ -847,70 +1025,37 @@ def render_cluster(slug_, h1, title, description, intro, headers, rows, note=Non
     with JS off. extra_html is injected after the table (e.g. a map gallery)."""
     page_url = f"{SITE}/work/rht/states/{slug_}/"
     thead = "".join(f'<th scope="col">{h}</th>' for h in headers)
-    tbody = ""
-    for r in rows:
-        tds = "".join(f"<td>{c}</td>" for c in r)
-        tbody += f"<tr>{tds}</tr>"
     ld = json.dumps({"@context": "https://schema.org", "@graph": [
         {"@type": ["CollectionPage", "Dataset"], "@id": page_url, "url": page_url,
          "name": title, "description": strip_tags(intro), "isAccessibleForFree": True,
-         "dateModified": LAST_REVIEWED,
+         "dateModified": REVIEWED,
          "isPartOf": {"@type": "CollectionPage", "@id": f"{SITE}/work/rht/states/"},
          "creator": {"@type": "Organization", "name": "Civic Operator LLC", "url": SITE},
          "publisher": {"@type": "Organization", "name": "Civic Operator LLC", "url": SITE}},
-        {"@type": "BreadcrumbList", "itemListElement": [
-            {"@type": "ListItem", "position": i+1, "name": n, "item": SITE+u} for i, (n, u) in
-            enumerate([("Home", "/"), ("Work", "/work"), ("RHT", "/work/rht"),
-                       ("States", "/work/rht/states/"), (h1, f"/work/rht/states/{slug_}/")])]}
+        breadcrumb_ld(LD_TRAIL + [("States", "/work/rht/states/"), (h1, f"/work/rht/states/{slug_}/")])
     ]}, ensure_ascii=False, indent=1)
     note_html = f'<p class="note-q">{note}</p>' if note else ""
-    analytics = ga_tag("cluster")
-    tbl_cls = "ptab sortable" if sortable else "ptab"
-    sort_css = SORT_CSS if sortable else ""
-    sort_js = SORT_JS if sortable else ""
-    page = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>{title} &middot; Civic Operator</title>
-<meta name="description" content="{description}">
-<meta property="og:title" content="{h1} — RHTP">
-<meta property="og:description" content="{description}">
-<link rel="icon" href="/favicon.ico">
-<link rel="canonical" href="{page_url}">
-{analytics}
-{STYLE}
-{EXTRA_CSS}
-<script type="application/ld+json">
-{ld}
-</script>
-</head>
-<body>
-{NAV}
-{SUBNAV}
-<div class="ai">
-<nav class="crumbs" aria-label="Breadcrumb"><a href="/">Home</a><span class="sep">&rsaquo;</span><a href="/work/rht">RHT</a><span class="sep">&rsaquo;</span><a href="/work/rht/states/">States</a><span class="sep">&rsaquo;</span><span>{h1}</span></nav>
-<h1>{h1}</h1>
-<div class="intro">{intro}</div>
-<div class="st">{note_html}{sort_css}
-<div class="ptab-wrap"><table class="{tbl_cls}"><thead><tr>{thead}</tr></thead><tbody>{tbody}</tbody></table></div></div>{sort_js}
-{extra_html}
-<div class="st"><h2>Related</h2><p class="related">
-<a href="/work/rht/states/">&larr; All 50 state profiles</a>
-<a href="/work/rht/states/outlays/">Federal money disbursed by state &rarr;</a>
-<a href="/work/rht/states/rural-definitions/">How states define &ldquo;rural&rdquo; &rarr;</a>
-<a href="/work/rht/states/agencies/">Administering agencies by state &rarr;</a>
-<a href="/work/rht/states/methodology">Methodology &amp; sources &rarr;</a>
-</p></div>
-<p class="gov">Independent reference compiled and maintained by <strong>Civic Operator LLC</strong> from primary sources. Last reviewed {LAST_REVIEWED}. &middot; <a href="/work/rht/states/methodology">Methodology &amp; sources</a> &middot; <a href="/work/rht/states">All states</a></p>
-<footer>Rural Health Transformation Program &middot; {h1} &middot; Civic Operator LLC &middot; <a href="{TRACKER}/" style="color:#007a99;">Newsletter &amp; analysis</a></footer>
-</div>
-</body>
-</html>"""
-    d_out = os.path.join(OUT_ROOT, slug_)
-    os.makedirs(d_out, exist_ok=True)
-    open(os.path.join(d_out, "index.html"), "w", encoding="utf-8").write(page)
+    page = render_page(
+        f"{title} &middot; Civic Operator", description,
+        CLUSTER_HEAD.render(h1=h1, description=description, page_url=page_url),
+        ga_tag("cluster"), ld,
+        CLUSTER_BODY.render(crumbs=crumbs(STATES_TRAIL, h1), h1=h1, intro=intro, note_html=note_html,
+                            tbl_cls="ptab sortable" if sortable else "ptab",
+                            thead=thead, tbody=table_rows(rows),
+                            sort_js=SORT_JS if sortable else "", extra_html=extra_html))
+    return page
+
+# Cross-state cluster pages. Each is one function registered with
+# @cluster_page(slug, inputs): render(names) returns the page HTML via
+# render_cluster, inputs(names) returns the data it renders from (fingerprinted
+# into the build manifest). main() builds every registered page.
+CLUSTER_PAGES = []
+
+def cluster_page(key, inputs):
+    def register(render):
+        CLUSTER_PAGES.append((key, inputs, render))
+        return render
+    return register
 
 DEF_SHORT = {
     "Uses its own rural definition": "Own definition",
@@ -918,6 +1063,19 @@ DEF_SHORT = {
     "Federal HRSA rural default": "Federal (HRSA) default",
 }
 
+# map gallery on the rural-definitions page
+RURAL_GALLERY_CSS = """
+.rgal{display:grid;grid-template-columns:repeat(auto-fill,minmax(240px,1fr));gap:16px;margin:14px 0 2px;}
+.rmap{margin:0;border:1px solid #eadbcd;border-radius:10px;background:#fff;overflow:hidden;display:flex;flex-direction:column;}
+.rmap img{display:block;width:100%;height:180px;object-fit:contain;background:#faf6f0;border-bottom:1px solid #f0e6d9;padding:6px;}
+.rmap figcaption{padding:10px 12px 12px;display:flex;flex-direction:column;gap:3px;}
+.rmap-state{font-weight:650;color:#1c1206;text-decoration:none;font-size:1rem;}
+.rmap-state:hover{color:#007a99;text-decoration:underline;}
+.rmap-note{color:#6f6456;font-size:.82rem;line-height:1.4;}
+.rmap-src{color:#007a99;font-size:.78rem;text-decoration:none;margin-top:2px;}
+.rmap-src:hover{text-decoration:underline;}
+"""
+
 def _rural_gallery(names):
     """Gallery of the authentic state-published rural maps we hold — each a
     screenshot of the state's own map, linked to its primary .gov source. Fallback
@@ -953,18 +1111,7 @@ def _rural_gallery(names):
                      "name": "State-published RHTP rural maps",
                      "numberOfItems": len(items),
                      "associatedMedia": items}, ensure_ascii=False, indent=1)
-    css = """<style>
-.rgal{display:grid;grid-template-columns:repeat(auto-fill,minmax(240px,1fr));gap:16px;margin:14px 0 2px;}
-.rmap{margin:0;border:1px solid #eadbcd;border-radius:10px;background:#fff;overflow:hidden;display:flex;flex-direction:column;}
-.rmap img{display:block;width:100%;height:180px;object-fit:contain;background:#faf6f0;border-bottom:1px solid #f0e6d9;padding:6px;}
-.rmap figcaption{padding:10px 12px 12px;display:flex;flex-direction:column;gap:3px;}
-.rmap-state{font-weight:650;color:#1c1206;text-decoration:none;font-size:1rem;}
-.rmap-state:hover{color:#007a99;text-decoration:underline;}
-.rmap-note{color:#6f6456;font-size:.82rem;line-height:1.4;}
-.rmap-src{color:#007a99;font-size:.78rem;text-decoration:none;margin-top:2px;}
-.rmap-src:hover{text-decoration:underline;}
-</style>"""
-    return (f'<div class="st" id="maps">{css}'
+    return (f'<div class="st" id="maps">'
             f'<h2>Authentic state-published rural maps ({len(have)})</h2>'
             f'<p>The {len(have)} states below publish their own map of where &ldquo;rural&rdquo; '
             f'is under the RHTP. Each image here is that state&rsquo;s own map, captured from its '
@@ -974,6 +1121,9 @@ def _rural_gallery(names):
             f'<div class="rgal">{"".join(cards)}</div>'
             f'<script type="application/ld+json">\n{ld}\n</script></div>')
 
+@cluster_page("rural-definitions", lambda names: [
+    sorted(names), {n: rural_maps.get(n) for n in names},
+    {n: (state_facts.get(n) or {}).get("rural_geography") for n in names}])
 def render_rural_definitions(names):
     """Enriched cross-state rural-definition table + a gallery of the authentic
     state-published rural maps. Definition basis comes from state_facts; the
@@ -1018,7 +1168,7 @@ def render_rural_definitions(names):
         f"&mdash; <em>not</em> the state&rsquo;s own count, which often differs. It is a factual "
         f"classification, not a ranking. See <a href=\"/work/rht/states/methodology\">Methodology</a> "
         f"for how this is derived.</p>")
-    render_cluster(
+    return render_cluster(
         "rural-definitions", "How states define &ldquo;rural&rdquo;",
         "How every state defines rural for its Rural Health Transformation Program",
         "How each U.S. state defines &ldquo;rural&rdquo; for its CMS Rural Health Transformation Program &mdash; own definition, county list, or federal HRSA default &mdash; with each state's rural share on a common federal baseline, a link to its source, and a gallery of the 15 authentic state-published rural maps. By Civic Operator.",
@@ -1028,10 +1178,13 @@ def render_rural_definitions(names):
         note="How each state defines rural for RHTP, with its rural share on a common federal baseline and a link to its source. Click a column header to sort; click a state for its full profile.",
         sortable=True, extra_html=_rural_gallery(names))
 
-def render_agencies(cards_by_name):
+@cluster_page("agencies", lambda names: {
+    n: [(state_facts.get(n) or {}).get("agency_name"), states_data[n].get("program"),
+        states_data[n].get("hub_url")] for n in names})
+def render_agencies(names):
     rows = []
-    for name in sorted(cards_by_name):
-        d = cards_by_name[name]
+    for name in sorted(names):
+        d = states_data[name]
         sl = slug(name)
         prof = f'<a class="rowlink" href="/work/rht/states/{sl}/">{name}</a>'
         ag = (state_facts.get(name) or {}).get("agency_name") or d.get("program")
@@ -1039,7 +1192,7 @@ def render_agencies(cards_by_name):
         hub = clean_url(d.get("hub_url"))
         hub_cell = f'<a href="{html.escape(hub)}" target="_blank" rel="noopener">Official hub</a>' if hub else "&mdash;"
         rows.append((prof, agency, hub_cell))
-    render_cluster(
+    return render_cluster(
         "agencies", "Administering agencies by state",
         "RHTP administering agency for every state",
         "The state agency administering each state's CMS Rural Health Transformation Program, with a link to its official .gov hub. All 50 states, by Civic Operator.",
@@ -1047,6 +1200,7 @@ def render_agencies(cards_by_name):
         ["State", "Administering agency", "Official hub"], rows,
         note="The designated lead agency running RHTP in each state (federal award recipient of record). Click a state for its full profile.")
 
+@cluster_page("outlays", lambda names: [sorted(names), outlays_data, outlays_data.get("as_of", LAST_REVIEWED)])
 def render_outlays(names):
     """Money-actually-disbursed cluster page. Neutral, alphabetical: obligated
     (committed) vs outlaid (disbursed) for every state, fed by the weekly
@@ -1082,7 +1236,7 @@ def render_outlays(names):
         f"about {pct:.1f}%. Federal award pages report each state&rsquo;s outlays one grant at a "
         "time; this is a maintained side-by-side comparison of all 50. See "
         "<a href=\"/work/rht/states/methodology\">Methodology</a> for sourcing.</p>")
-    render_cluster(
+    return render_cluster(
         "outlays", "RHTP outlays by state",
         "RHTP outlays by state — federal money actually disbursed",
         ("How much CMS Rural Health Transformation Program money has actually been disbursed "
@@ -1095,20 +1249,522 @@ def render_outlays(names):
               f"full profile."),
         sortable=True)
 
+# ---------- shared stylesheet ----------
+# The activity page's <style> block (its embedded fonts included), EXTRA_CSS and
+# the cluster pages' CSS ship as one file named by its content hash,
+# /css/rht-states.<hash>.css, linked from every page instead of inlined into
+# each. A CSS change gives a new name (and, through TEMPLATE_VERSION, re-renders
+# every page to link it), so the file can be cached indefinitely. Superseded
+# files are removed only after every page has been written, and the previous
+# version is kept (KEEP_STYLESHEETS, tracked in the manifest) so HTML still held
+# by a CDN or browser keeps resolving its stylesheet.
+STYLESHEET = "\n".join(block.strip() for block in (
+    STYLE[len("<style>"):-len("</style>")], EXTRA_CSS, SORT_CSS, RURAL_GALLERY_CSS)) + "\n"
+STYLESHEET_NAME = f"rht-states.{hashlib.sha256(STYLESHEET.encode('utf-8')).hexdigest()[:10]}.css"
+STYLESHEET_URL = f"/css/{STYLESHEET_NAME}"
+CSS_ROOT = os.path.join(REPO_ROOT, "css")
+PAGE_STYLES = f'<link rel="stylesheet" href="{STYLESHEET_URL}">'
+KEEP_STYLESHEETS = 2   # the current stylesheet and the one before it
+STYLESHEET_RE = re.compile(r"(rht-states\.[0-9a-f]+\.css)(?:\.gz|\.br)?")
+
+def write_stylesheet():
+    """Write the current stylesheet if missing. Returns True if it was written."""
+    os.makedirs(CSS_ROOT, exist_ok=True)
+    path = os.path.join(CSS_ROOT, STYLESHEET_NAME)
+    written = not os.path.exists(path)
+    if written:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(STYLESHEET)
+    return written
+
+def kept_stylesheets(previous):
+    """This build's stylesheet first, then the most recent earlier ones from the
+    manifest, up to KEEP_STYLESHEETS names."""
+    return ([STYLESHEET_NAME] + [n for n in previous if n != STYLESHEET_NAME])[:KEEP_STYLESHEETS]
+
+def prune_stylesheets(kept):
+    """Delete stylesheets (and their .gz/.br siblings) not in kept; run after
+    every page is written. Returns the number of files removed."""
+    removed = 0
+    for fn in os.listdir(CSS_ROOT):
+        m = STYLESHEET_RE.fullmatch(fn)
+        if m and m.group(1) not in kept:
+            os.remove(os.path.join(CSS_ROOT, fn))
+            removed += 1
+    return removed
+
+# ---------- output post-processing (minify, precompress) ----------
+# Every page is minified before it is hashed and written: comments go, whitespace
+# runs in text collapse to one space, whitespace next to block-level tags (and
+# all of it inside <head>) is dropped, and JSON-LD is re-serialized compactly.
+# <pre>, <textarea>, <style> and other <script> bodies pass through verbatim,
+# and whitespace between inline tags is kept, so nothing that renders moves.
+# finish_page() checks that against the page's DOM text and fails the build if
+# the text or structured data differ.
+BLOCK_TAGS = {
+    "!doctype", "html", "head", "body", "title", "meta", "link", "div", "p",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "dl", "dt", "dd",
+    "table", "caption", "thead", "tbody", "tfoot", "tr", "th", "td", "nav",
+    "header", "footer", "main", "section", "article", "aside", "figure",
+    "figcaption", "details", "summary", "br", "hr", "blockquote", "form"}
+RAW_TAGS = {"pre", "textarea", "script", "style"}
+_ATTRS = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+TOKEN_RE = re.compile(rf"<!--.*?-->|<(pre|textarea|script|style)\b{_ATTRS}>.*?</\1\s*>|<(/?[!\w]+){_ATTRS}>",
+                      re.S | re.I)
+LD_RE = re.compile(r'(<script type="application/ld\+json">)(.*?)(</script>)', re.S)
+WS_RE = re.compile(r"[ \t\n\r\f]+")   # HTML whitespace (not &nbsp;)
+
+def _squeeze(text, after_block, before_block):
+    text = WS_RE.sub(" ", text)
+    if after_block:
+        text = text.lstrip(" ")
+    if before_block:
+        text = text.rstrip(" ")
+    return text
+
+def _compact_ld(m):
+    return m.group(1) + json.dumps(json.loads(m.group(2)), ensure_ascii=False,
+                                   separators=(",", ":")) + m.group(3)
+
+def minify_html(page):
+    out, text, pos = [], [], 0
+    prev_block, in_head = True, False
+    for m in TOKEN_RE.finditer(page):
+        text.append(page[pos:m.start()])
+        pos = m.end()
+        tag = m.group(0)
+        if tag.startswith("<!--"):
+            continue                      # dropped; the text either side joins up
+        name = (m.group(1) or m.group(2)).lower()
+        block = in_head or name.lstrip("/") in BLOCK_TAGS
+        out.append(_squeeze("".join(text), prev_block, block))
+        text = []
+        if tag.startswith('<script type="application/ld+json">'):
+            tag = LD_RE.sub(_compact_ld, tag)
+        out.append(tag)
+        if name in ("head", "/head"):
+            in_head = name == "head"
+        prev_block = block
+    text.append(page[pos:])
+    out.append(_squeeze("".join(text), prev_block, True))
+    return "".join(out)
+
+class _DomText(HTMLParser):
+    """A page as rendered text: whitespace-collapsed runs split at block-level
+    tags, plus the bodies of raw elements (JSON-LD parsed) in order."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.runs, self.raw, self._open = [""], [], None
+
+    def handle_starttag(self, tag, attrs):
+        if self._open:
+            return
+        if tag in RAW_TAGS:
+            self._open = (tag, dict(attrs).get("type"), [])
+        elif tag in BLOCK_TAGS:
+            self.runs.append("")
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        if self._open and tag == self._open[0]:
+            tag, kind, data = self._open
+            body = "".join(data)
+            self.raw.append((tag, json.loads(body) if kind == "application/ld+json" else body))
+            self._open = None
+        elif not self._open and tag in BLOCK_TAGS:
+            self.runs.append("")
+
+    def handle_data(self, data):
+        if self._open:
+            self._open[2].append(data)
+        else:
+            self.runs[-1] += data
+
+def dom_text(page):
+    parser = _DomText()
+    parser.feed(page)
+    parser.close()
+    runs = (WS_RE.sub(" ", r).strip(" ") for r in parser.runs)
+    return [r for r in runs if r], parser.raw
+
+def finish_page(key, page):
+    """(minified page, template output size in bytes). Raises ValueError if
+    minifying changed what the page renders."""
+    small = minify_html(page)
+    if dom_text(small) != dom_text(page):
+        raise ValueError(f"minifying {key} changed its rendered text or JSON-LD")
+    return small, len(page.encode("utf-8"))
+
+def page_kind(key):
+    if key in ("index", "methodology"):
+        return key
+    return "cluster" if any(key == k for k, _, _ in CLUSTER_PAGES) else "state"
+
+def format_sizes(sizes):
+    """Size report for the pages rendered this build, by page kind."""
+    lines = ["HTML bytes for pages rendered this build (template -> minified, gzipped):"]
+    for kind, (n, raw, small, gz) in sizes.items():
+        lines.append(f"  {kind:<12}{n:>4} pages  {raw / 1024:8.1f} KB -> {small / 1024:8.1f} KB"
+                     f"  ({(small - raw) / raw:+.1%})  gzip {gz / 1024:7.1f} KB")
+    return "\n".join(lines)
+
+def precompress(path, enabled):
+    """With enabled, keep path.gz (and path.br, given the brotli module) as
+    current as path; otherwise remove siblings older than path. Returns the
+    number of siblings written."""
+    written, data = 0, None
+    mtime = os.path.getmtime(path)
+    for ext, compress in ((".gz", lambda b: gzip.compress(b, 9, mtime=0)),
+                          (".br", brotli and (lambda b: brotli.compress(b, quality=11)))):
+        sibling = path + ext
+        current = os.path.exists(sibling) and os.path.getmtime(sibling) >= mtime
+        if enabled and compress and not current:
+            if data is None:
+                data = _read(path, binary=True)
+            with open(sibling, "wb") as f:
+                f.write(compress(data))
+            written += 1
+        elif not current and os.path.exists(sibling):
+            os.remove(sibling)
+    return written
+
+# ---------- build manifest (incremental builds, stable review dates) ----------
+# Each page is recorded with a fingerprint of exactly the inputs it renders from
+# ("inputs"), a hash of its rendered HTML with the date left as the REVIEWED
+# placeholder ("content"), the date it carries ("reviewed"), its size as
+# written ("bytes") and its repo path.
+# A page is re-rendered only when its inputs, or TEMPLATE_VERSION (this
+# generator + the activity-page STYLE), changed; it is rewritten only when its
+# content hash changed, and only then gets today's date. scripts/
+# generate_sitemap.py reads the dates as <lastmod>.
+MANIFEST_PATH = os.path.join(HERE, "build_manifest.json")
+TEMPLATE_VERSION = hashlib.sha256(GENERATOR_SOURCE + STYLE.encode("utf-8")).hexdigest()[:16]
+
+def fingerprint(*parts):
+    blob = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+def state_fingerprint(name):
+    """This state's slice of every input file."""
+    return fingerprint(
+        states_data.get(name), dispatches.get(name), QUESTIONS, AUTHORED.get(name),
+        procurements.get(name), KPIS.get(name), state_facts.get(name),
+        (outlays_data.get("states") or {}).get(name), rural_maps.get(name),
+        screenshots.get(name), RHTP_AWARD_FAIN.get(name))
+
+def page_path(key):
+    return os.path.join(OUT_ROOT, "index.html") if key == "index" else os.path.join(OUT_ROOT, key, "index.html")
+
+def load_manifest():
+    """(previous build's page records, whether it used this template, the
+    stylesheets it kept, newest first)."""
+    if not os.path.exists(MANIFEST_PATH):
+        return {}, False, []
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            m = json.load(f)
+    except (ValueError, OSError):
+        return {}, False, []
+    return m.get("pages", {}), m.get("template") == TEMPLATE_VERSION, m.get("stylesheets", [])
+
+def save_manifest(pages, stylesheets):
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump({"template": TEMPLATE_VERSION, "pages": pages, "stylesheets": stylesheets},
+                  f, indent=1, sort_keys=True)
+        f.write("\n")
+
+def is_current(previous, key, fp):
+    return (previous.get(key) or {}).get("inputs") == fp and os.path.exists(page_path(key))
+
+DATE_MODIFIED_RE = re.compile(r'"dateModified":\s*"(\d{4}-\d{2}-\d{2})"')
+
+def review_date(key, content, page, previous):
+    """Keep the previous date for unchanged content, else today. Without a
+    manifest record, a page already on disk that differs only by its date
+    keeps that date (so a first incremental build doesn't touch every page)."""
+    prev = previous.get(key) or {}
+    if prev.get("content") == content and prev.get("reviewed"):
+        return prev["reviewed"]
+    path = page_path(key)
+    if not prev and os.path.exists(path):
+        old = _read(path)
+        m = DATE_MODIFIED_RE.search(old)
+        if m and page.replace(REVIEWED, m.group(1)) == old:
+            return m.group(1)
+    return LAST_REVIEWED
+
+def write_page(key, page, previous):
+    """Fill in the review date and write the page if its bytes changed.
+    Returns (manifest record, whether the file was written)."""
+    content = hashlib.sha256(page.encode("utf-8")).hexdigest()[:16]
+    date = review_date(key, content, page, previous)
+    data = page.replace(REVIEWED, date).encode("utf-8")
+    path = page_path(key)
+    written = not os.path.exists(path) or _read(path, binary=True) != data
+    if written:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    record = {"content": content, "reviewed": date, "bytes": len(data),
+              "path": os.path.relpath(path, REPO_ROOT).replace(os.sep, "/")}
+    return record, written
+
+# ---------- parallel state rendering ----------
+# Workers are forked after the inputs above are loaded, so they share them
+# copy-on-write instead of re-parsing, and send back the finished (minified)
+# page, the card and their timings; the parent does all writes (write_page needs
+# the manifest). Where fork is unavailable the module is re-imported per worker,
+# which reloads the same inputs.
+def _render_state_job(item):
+    t0 = time.perf_counter()
+    page, card = render_state(*item)
+    t1 = time.perf_counter()
+    finished = finish_page(slug(item[0]), page)
+    return finished, card, (t1 - t0, time.perf_counter() - t1)
+
+def render_states(items, jobs=1):
+    """render_state + finish_page over (name, d) pairs; returns
+    ((page, template bytes), card, (render s, finish s)) in input order."""
+    if jobs <= 1 or len(items) < 2:
+        return [_render_state_job(item) for item in items]
+    ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items)), mp_context=ctx) as pool:
+        return list(pool.map(_render_state_job, items, chunksize=max(1, len(items) // (jobs * 4))))
+
+# ---------- build report (--profile) ----------
+# Every build times its phases; --profile also writes them, with each page's
+# timings and bytes, to build-report.json and (under GitHub Actions) appends a
+# Markdown summary to $GITHUB_STEP_SUMMARY. Page sizes are compared with the
+# previous build's manifest, so a template change that bloats pages shows up in
+# the run summary. --cprofile / --tracemalloc add the top functions / allocation
+# sites of main() (input loading happens at import and is timed separately).
+REPORT_PATH = os.path.join(HERE, "build-report.json")
+CPROFILE_PATH = os.path.join(HERE, "build-profile.prof")
+REPORT_TOP = 10
+
+def timed(timings, phase, fn, *args):
+    t = time.perf_counter()
+    try:
+        return fn(*args)
+    finally:
+        timings[phase] = timings.get(phase, 0) + time.perf_counter() - t
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+def build_report(args, timings, page_stats, pages, previous, cpu=None, memory=None):
+    kinds = {}
+    for key, rec in pages.items():
+        k = kinds.setdefault(page_kind(key), {"pages": 0, "rendered": 0, "bytes": 0, "previous_bytes": 0})
+        k["pages"] += 1
+        k["rendered"] += key in page_stats
+        k["bytes"] += rec.get("bytes") or 0
+        prev = (previous.get(key) or {}).get("bytes")
+        k["previous_bytes"] = None if prev is None or k["previous_bytes"] is None else k["previous_bytes"] + prev
+    report = {
+        "date": LAST_REVIEWED,
+        "template": TEMPLATE_VERSION,
+        "options": {"full": args.full, "jobs": args.jobs, "precompress": args.precompress},
+        "inputs": {"cache": LOAD_TIMINGS.get("cache"),
+                   **{k: _ms(v) for k, v in LOAD_TIMINGS.items() if k != "cache"}},
+        "phases_ms": {k: _ms(v) for k, v in timings.items()},
+        "kinds": kinds,
+        "stylesheet": {"url": STYLESHEET_URL, "bytes": len(STYLESHEET.encode("utf-8"))},
+        "pages": {key: dict(page_stats.get(key, {}), kind=page_kind(key),
+                            bytes=rec.get("bytes"), rendered=key in page_stats)
+                  for key, rec in sorted(pages.items())},
+    }
+    if cpu is not None:
+        report["cprofile"] = cpu
+    if memory is not None:
+        report["tracemalloc"] = memory
+    return report
+
+def cprofile_top(profiler):
+    """The REPORT_TOP functions by cumulative time, saving the full profile."""
+    import pstats
+    profiler.dump_stats(CPROFILE_PATH)
+    rows = sorted(pstats.Stats(profiler).stats.items(), key=lambda kv: kv[1][3], reverse=True)
+    return {"file": os.path.relpath(CPROFILE_PATH, REPO_ROOT).replace(os.sep, "/"),
+            "top_cumulative": [
+                {"function": f"{fn} ({os.path.basename(path)}:{line})", "calls": nc,
+                 "cumulative_ms": _ms(ct), "own_ms": _ms(tt)}
+                for (path, line, fn), (cc, nc, tt, ct, callers) in rows[:REPORT_TOP]]}
+
+def tracemalloc_top(tracemalloc):
+    current, peak = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics("lineno")[:REPORT_TOP]
+    tracemalloc.stop()
+    return {"current_kb": round(current / 1024, 1), "peak_kb": round(peak / 1024, 1),
+            "top_lines": [{"line": f"{os.path.basename(st.traceback[0].filename)}:{st.traceback[0].lineno}",
+                           "kb": round(st.size / 1024, 1), "blocks": st.count} for st in top]}
+
+def format_summary(report):
+    """The report as GitHub-flavoured Markdown for the job summary."""
+    rendered = sum(k["rendered"] for k in report["kinds"].values())
+    total = sum(k["pages"] for k in report["kinds"].values())
+    out = ["### RHT state pages build", "",
+           f"Rendered {rendered} of {total} pages  ·  build cache: {report['inputs']['cache']}"
+           f"  ·  total {report['phases_ms'].get('total', 0):.0f} ms", "",
+           "| phase | ms |", "|---|---:|"]
+    out += [f"| inputs: {k} | {v} |" for k, v in report["inputs"].items() if k != "cache"]
+    out += [f"| {k} | {v} |" for k, v in report["phases_ms"].items()]
+    out += ["", "| page type | pages | rendered | KB | vs previous build |", "|---|---:|---:|---:|---:|"]
+    for kind, k in report["kinds"].items():
+        delta = "n/a" if k["previous_bytes"] is None else f"{(k['bytes'] - k['previous_bytes']) / 1024:+.1f} KB"
+        out.append(f"| {kind} | {k['pages']} | {k['rendered']} | {k['bytes'] / 1024:.1f} | {delta} |")
+    timed_pages = [(key, p) for key, p in report["pages"].items() if p["rendered"]]
+    if timed_pages:
+        slowest = sorted(timed_pages, key=lambda kp: kp[1]["render_ms"] + kp[1]["finish_ms"], reverse=True)
+        out += ["", "Slowest pages (render + minify/check): " + ", ".join(
+            f"{key} {p['render_ms'] + p['finish_ms']:.1f} ms" for key, p in slowest[:5])]
+    largest = sorted(report["pages"].items(), key=lambda kp: kp[1]["bytes"] or 0, reverse=True)
+    out += ["", "Largest pages: " + ", ".join(f"{key} {(p['bytes'] or 0) / 1024:.1f} KB" for key, p in largest[:5])]
+    if "cprofile" in report:
+        out += ["", "| function (cProfile, cumulative) | calls | ms |", "|---|---:|---:|"]
+        out += [f"| `{r['function']}` | {r['calls']} | {r['cumulative_ms']} |"
+                for r in report["cprofile"]["top_cumulative"]]
+    if "tracemalloc" in report:
+        mem = report["tracemalloc"]
+        out += ["", f"Memory (tracemalloc): peak {mem['peak_kb'] / 1024:.1f} MB  ·  "
+                + ", ".join(f"`{r['line']}` {r['kb']:.0f} KB" for r in mem["top_lines"][:5])]
+    return "\n".join(out) + "\n"
+
+def write_report(report):
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+        f.write("\n")
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        with open(summary, "a", encoding="utf-8") as f:
+            f.write(format_summary(report))
+    return summary
+
 # ---------- run ----------
-os.makedirs(OUT_ROOT, exist_ok=True)
-cards = []
-for name, d in states_data.items():
-    if name == "CMS":
-        continue
-    cards.append(render_state(name, d))
-render_index(cards)
-render_methodology(cards)
-_state_names = [n for n in states_data if n != "CMS"]
-render_rural_definitions(_state_names)
-render_agencies({n: states_data[n] for n in _state_names})
-render_outlays(_state_names)
-auth = sum(1 for c in cards if c["status"] == "authored")
-print(f"Generated {len(cards)} state pages + index + methodology + 3 cluster pages  |  authored: {auth}  |  derived: {len(cards)-auth}")
-print(f"Total dispatches linked: {sum(c['ndisp'] for c in cards)}  |  Year-1 awards: ${sum(c.get('usd') or 0 for c in cards)/1e9:.1f}B")
-print("Output:", OUT_ROOT)
+def main():
+    ap = argparse.ArgumentParser(description="Build the RHT state reference pages.")
+    ap.add_argument("--full", action="store_true",
+                    help="re-render every page, ignoring build_manifest.json")
+    ap.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                    help="render state pages in N worker processes (default: 1, serial)")
+    ap.add_argument("--precompress", action="store_true",
+                    help="also write .gz (and .br, with the brotli module) next to every page and the stylesheet")
+    ap.add_argument("--profile", action="store_true",
+                    help="write phase timings and per-page bytes to build-report.json "
+                         "(and a summary to $GITHUB_STEP_SUMMARY)")
+    ap.add_argument("--cprofile", action="store_true",
+                    help="with --profile: run under cProfile (parent process only), saving build-profile.prof")
+    ap.add_argument("--tracemalloc", action="store_true",
+                    help="with --profile: trace allocations and report the peak and top sites")
+    args = ap.parse_args()
+    args.profile = args.profile or args.cprofile or args.tracemalloc
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    if args.tracemalloc:
+        import tracemalloc
+        tracemalloc.start()
+    t_build = time.perf_counter()
+    timings, page_stats = {}, {}
+
+    os.makedirs(OUT_ROOT, exist_ok=True)
+    css_written = timed(timings, "stylesheet", write_stylesheet)
+    previous, same_template, previous_css = timed(timings, "manifest load", load_manifest)
+    stylesheets = kept_stylesheets(previous_css)
+    reusable = previous if same_template and not args.full else {}
+    pages, rendered, written, sizes = {}, [], [], {}
+
+    def emit(key, fp, finished, render_s, finish_s):
+        page, template_bytes = finished
+        t = time.perf_counter()
+        record, changed = write_page(key, page, previous)
+        write_s = time.perf_counter() - t
+        timings["write pages"] = timings.get("write pages", 0) + write_s
+        pages[key] = dict(record, inputs=fp)
+        rendered.append(key)
+        if changed:
+            written.append(key)
+        gz = len(gzip.compress(page.encode("utf-8"), 6, mtime=0))
+        kind = sizes.setdefault(page_kind(key), [0, 0, 0, 0])
+        for i, v in enumerate((1, template_bytes, record["bytes"], gz)):
+            kind[i] += v
+        page_stats[key] = {"render_ms": _ms(render_s), "finish_ms": _ms(finish_s), "write_ms": _ms(write_s),
+                           "template_bytes": template_bytes, "gzip_bytes": gz, "written": changed}
+
+    def skip(key, fp):
+        pages[key] = dict(previous[key], inputs=fp)
+
+    stale, fps = [], {}
+    for name, d in states_data.items():
+        if name == "CMS":
+            continue
+        sl = slug(name)
+        fps[sl] = fp = state_fingerprint(name)
+        if is_current(reusable, sl, fp):
+            skip(sl, fp)
+        else:
+            stale.append((name, d))
+    fresh = {}
+    results = timed(timings, "state pages (wall: render + minify)", render_states, stale, args.jobs)
+    for (name, d), (finished, card, (render_s, finish_s)) in zip(stale, results):
+        timings["render_state"] = timings.get("render_state", 0) + render_s
+        timings["minify + DOM check"] = timings.get("minify + DOM check", 0) + finish_s
+        emit(slug(name), fps[slug(name)], finished, render_s, finish_s)
+        fresh[name] = card
+    cards = [fresh.get(name) or state_card(name, d)
+             for name, d in states_data.items() if name != "CMS"]
+
+    _state_names = [n for n in states_data if n != "CMS"]
+    aggregates = [
+        ("index", fingerprint(cards), render_index, cards),
+        ("methodology", fingerprint([c.get("usd") for c in cards]), render_methodology, cards),
+    ] + [(key, fingerprint(inputs(_state_names)), render, _state_names)
+         for key, inputs, render in CLUSTER_PAGES]
+    for key, fp, render, arg in aggregates:
+        if is_current(reusable, key, fp):
+            skip(key, fp)
+            continue
+        t0 = time.perf_counter()
+        page = timed(timings, render.__name__, render, arg)
+        t1 = time.perf_counter()
+        finished = timed(timings, "minify + DOM check", finish_page, key, page)
+        emit(key, fp, finished, t1 - t0, time.perf_counter() - t1)
+    timed(timings, "manifest save", save_manifest, pages, stylesheets)
+    t = time.perf_counter()
+    siblings = sum(precompress(os.path.join(REPO_ROOT, rec["path"]), args.precompress)
+                   for rec in pages.values())
+    siblings += precompress(os.path.join(CSS_ROOT, STYLESHEET_NAME), args.precompress)
+    timings["precompress"] = time.perf_counter() - t
+    css_pruned = timed(timings, "stylesheet prune", prune_stylesheets, stylesheets)
+    timings["total"] = LOAD_TIMINGS.get("total", 0) + time.perf_counter() - t_build
+
+    auth = sum(1 for c in cards if c["status"] == "authored")
+    print(f"Generated {len(cards)} state pages + index + methodology + {len(CLUSTER_PAGES)} cluster pages  |  authored: {auth}  |  derived: {len(cards)-auth}")
+    print(f"Total dispatches linked: {sum(c['ndisp'] for c in cards)}  |  Year-1 awards: ${sum(c.get('usd') or 0 for c in cards)/1e9:.1f}B")
+    print(f"Rendered {len(rendered)} of {len(pages)} pages"
+          + ("" if args.full else " (unchanged inputs skipped; --full re-renders all)")
+          + f"  |  wrote {len(written)} with changed content"
+          + (f"  |  {siblings} .gz/.br siblings refreshed" if args.precompress else ""))
+    if sizes:
+        print(format_sizes(sizes))
+    print(f"{format_load_timings()}  |  render + write {(time.perf_counter() - t_build) * 1000:.1f} ms")
+    print(f"Stylesheet: {STYLESHEET_URL} ({len(STYLESHEET.encode('utf-8')) / 1024:.1f} KB, "
+          + ("written" if css_written else "unchanged")
+          + (f"; {css_pruned} superseded files removed)" if css_pruned else ")"))
+    print("Output:", OUT_ROOT)
+
+    if args.profile:
+        cpu = memory = None
+        if profiler:
+            profiler.disable()
+            cpu = cprofile_top(profiler)
+        if args.tracemalloc:
+            memory = tracemalloc_top(tracemalloc)
+        summary = write_report(build_report(args, timings, page_stats, pages, previous, cpu, memory))
+        print(f"Build report: {REPORT_PATH}" + (f"  |  summary appended to {summary}" if summary else ""))
+
+if __name__ == "__main__":
+    main()
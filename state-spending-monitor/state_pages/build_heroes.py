@@ -10,10 +10,17 @@ screenshots_meta.json so build.py can caption them honestly.
 Date is parsed from the FILENAME (mtimes are a bulk-sync date, unreliable).
 Handles "State MM-DD-YYYY.png", "State-MM-DD-YYYY.png", "State-MM-DD-YYYY(1).png",
 and "State Month DD YYYY.png".
+
+The hero band's perceptual hash is recorded in the meta; a state whose
+newest capture's band is within VISUAL_CHANGE_THRESHOLD bits of the last
+built one keeps its existing WebP (only the caption date moves).
 """
-import os, re, json, datetime
+import os, re, sys, json, datetime
 from PIL import Image
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from visual_hash import VISUAL_CHANGE_THRESHOLD, hamming, phash  # noqa: E402
+
 STATES_ROOT = os.environ.get("STATES_ROOT", r"G:/My Drive/RHT/States")
 HERE = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT = os.environ.get("REPO_ROOT", os.path.abspath(os.path.join(HERE, "..", "..")))
@@ -65,7 +72,11 @@ def most_recent(folder):
 
 def main():
     os.makedirs(OUT_IMG, exist_ok=True)
-    meta, made, total = {}, 0, 0
+    try:
+        previous = json.load(open(META, encoding="utf-8"))
+    except (IOError, ValueError):
+        previous = {}
+    meta, made, kept, total = {}, 0, 0, 0
     for st in STATES:
         folder = os.path.join(STATES_ROOT, f"{st}-RHT")
         if not os.path.isdir(folder):
@@ -81,15 +92,22 @@ def main():
         w, h = im.size
         band = min(h, int(w * BAND_RATIO))
         im = im.crop((0, 0, w, band))
+        band_hash = phash(im)
+        out = os.path.join(OUT_IMG, f"{slug(st)}.webp")
+        meta[st] = {"date": d.isoformat(), "src": fn, "hero_phash": band_hash}
+        prev_hash = previous.get(st, {}).get("hero_phash")
+        if prev_hash and os.path.exists(out) and hamming(prev_hash, band_hash) < VISUAL_CHANGE_THRESHOLD:
+            meta[st]["hero_phash"] = prev_hash   # keep the reference the WebP was built from
+            kept += 1
+            continue
         if w > TARGET_W:
             im = im.resize((TARGET_W, int(band * TARGET_W / w)), Image.LANCZOS)
-        out = os.path.join(OUT_IMG, f"{slug(st)}.webp")
         im.save(out, "WEBP", quality=WEBP_QUALITY, method=6)
         kb = os.path.getsize(out) // 1024
         total += kb; made += 1
-        meta[st] = {"date": d.isoformat(), "src": fn}
     json.dump(meta, open(META, "w", encoding="utf-8"), ensure_ascii=False, indent=1)
     print(f"Built {made} hero thumbnails -> {OUT_IMG}  ({total} KB total, avg {total//max(made,1)} KB)")
+    print(f"Kept {kept} unchanged (hero band within {VISUAL_CHANGE_THRESHOLD} bits of last build)")
     print(f"Meta -> {META}")
     oldest = min(meta.values(), key=lambda v: v["date"])["date"] if meta else "-"
     newest = max(meta.values(), key=lambda v: v["date"])["date"] if meta else "-"
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Round-trip tests for drive_upload.py against the in-memory fake_drive.FakeDrive.
+
+Covers the request counts of a baseline upload (resumable chunks and batched
+permission grants included), folder-cache hits on a re-run, and recovery
+when the cached folder has been trashed.  Needs google-api-python-client
+for MediaFileUpload.
+
+Usage:
+  python -m unittest test_drive_upload
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+import drive_upload
+from drive_upload import (
+    BATCH_LIMIT, RESUMABLE_CHUNKSIZE, RESUMABLE_THRESHOLD, FolderCache,
+    upload_screenshots_to_drive,
+)
+from fake_drive import FakeDrive
+
+STATES = 51
+SUBFOLDER = 'Baseline test'
+# Every tenth capture is a long page big enough to go resumable
+LONG_PAGE = RESUMABLE_THRESHOLD + 1024
+PAGE = 200 * 1024
+
+
+def create_trips(count: int) -> int:
+    """Round-trips for the file creates of the first `count` captures:
+    one each, or one to open the session plus one per chunk if resumable."""
+    chunks = math.ceil(LONG_PAGE / RESUMABLE_CHUNKSIZE)
+    return sum(1 + chunks if i % 10 == 0 else 1 for i in range(count))
+
+
+class DriveUploadRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        tmp = self._tmp.name
+
+        saved_cache = drive_upload._folder_cache
+        self.addCleanup(setattr, drive_upload, '_folder_cache', saved_cache)
+        drive_upload._folder_cache = FolderCache(os.path.join(tmp, 'folders.json'))
+
+        self.screenshots = {}
+        for i in range(STATES):
+            path = os.path.join(tmp, f"state-{i:02d}.png")
+            size = LONG_PAGE if i % 10 == 0 else PAGE
+            with open(path, 'wb') as f:
+                f.write(os.urandom(size))
+            self.screenshots[f"State {i:02d}"] = path
+        self.drive = FakeDrive()
+
+    def upload(self, count=STATES):
+        return upload_screenshots_to_drive(
+            dict(list(self.screenshots.items())[:count]), 'root',
+            subfolder_name=SUBFOLDER, service_factory=self.drive.service,
+        )
+
+    def folder(self):
+        return next(f for f in self.drive.files.values()
+                    if f['name'] == SUBFOLDER and not f['trashed'])
+
+    def test_baseline_upload(self):
+        links = self.upload()
+
+        self.assertEqual(set(links), set(self.screenshots))
+        uploaded = [f for f in self.drive.files.values() if f['mimeType'] == 'image/png']
+        self.assertEqual(len(uploaded), STATES)
+        self.assertTrue(all(self.drive.is_public(f['id']) for f in uploaded))
+        self.assertTrue(self.drive.is_public(self.folder()['id']))
+
+        # Folder search + folder create, the file creates, and every
+        # permission grant (folder and files) in batches
+        calls = self.drive.calls
+        batches = math.ceil((STATES + 1) / BATCH_LIMIT)
+        self.assertEqual(calls['files.list'], 1)
+        self.assertEqual(calls['files.create'], STATES + 1)
+        self.assertEqual(calls['permissions.create'], 0)
+        self.assertEqual(calls['batched permissions.create'], STATES + 1)
+        self.assertEqual(calls['batch'], batches)
+        self.assertEqual(self.drive.round_trips, 2 + create_trips(STATES) + batches)
+
+    def test_rerun_uses_cached_folder(self):
+        self.upload()
+        folder_id = self.folder()['id']
+        lists, before = self.drive.calls['files.list'], self.drive.round_trips
+
+        links = self.upload(5)
+
+        self.assertEqual(len(links), 5)
+        self.assertEqual(self.drive.calls['files.list'], lists)
+        self.assertEqual(self.folder()['id'], folder_id)
+        # No folder search or create: just the file creates and one batch
+        self.assertEqual(self.drive.round_trips - before, create_trips(5) + 1)
+
+    def test_trashed_cached_folder_is_recreated(self):
+        self.upload(2)
+        stale = self.folder()['id']
+        self.drive.trash(stale)
+
+        links = self.upload(2)
+
+        self.assertEqual(len(links), 2)
+        fresh = self.folder()['id']
+        self.assertNotEqual(fresh, stale)
+        self.assertEqual(drive_upload._folder_cache.get('root', SUBFOLDER), fresh)
+        new_files = [f for f in self.drive.files.values()
+                     if f['mimeType'] == 'image/png' and fresh in f['parents']]
+        self.assertEqual(len(new_files), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,9 @@ Modes:
   --url <url>     Test mode: screenshot one URL, upload to Drive
   --baseline      Baseline mode: screenshot all 51 RHTP state URLs from
                   monday.com and upload to Drive in a dated subfolder
+  --compare       Timing mode: capture all state URLs with the legacy
+                  (networkidle) readiness and the current DOM-stability
+                  readiness and report before/after timings (no upload)
 
 Reuses screenshots.py and drive_upload.py.
 """
@@ -57,8 +60,9 @@ def test_single_url(url: str):
 def baseline_all():
     """Screenshot all 51 RHTP URLs from monday.com."""
     from url_monitor import URLMonitor
-    from screenshots import capture_screenshots
+    from screenshots import capture_screenshots_timed
     from drive_upload import upload_screenshots_to_drive
+    from visual_hash import ScreenshotHashStore
 
     monitor = URLMonitor()
     urls = monitor.fetch_urls_from_monday()
@@ -66,14 +70,25 @@ def baseline_all():
         logger.error("No URLs found on monday.com board")
         sys.exit(1)
 
-    logger.info(f"Taking baseline screenshots of {len(urls)} URLs...")
+    # Skip pages whose monitored text hasn't changed since their last capture
+    snapshots = monitor.load_snapshots()
+    for item in urls:
+        item['hash'] = snapshots.get(item['url'], {}).get('hash')
+    hash_store = ScreenshotHashStore()
+    to_capture, skipped = hash_store.needs_capture(urls)
+
+    logger.info(f"Taking baseline screenshots of {len(to_capture)} URLs "
+                f"({len(skipped)} skipped, text unchanged since last capture)...")
 
     # Use dated output dir
     date_str = datetime.now().strftime('%Y-%m-%d')
     output_dir = f'screenshots/baseline-{date_str}'
-    screenshots = capture_screenshots(urls, output_dir=output_dir, timeout=45000)
+    captured, timings = capture_screenshots_timed(to_capture, output_dir=output_dir, timeout=45000)
+    screenshots, unchanged = hash_store.classify(captured, to_capture)
+    hash_store.save()
 
-    logger.info(f"Captured {len(screenshots)}/{len(urls)} screenshots")
+    logger.info(f"Captured {len(captured)}/{len(to_capture)} screenshots, "
+                f"{len(screenshots)} visually changed")
 
     # Upload to Drive in a dated subfolder
     folder_id = os.getenv('GOOGLE_DRIVE_FOLDER_ID', '')
@@ -92,7 +107,7 @@ def baseline_all():
         print(f"\n{'='*60}")
         print(f"BASELINE SCREENSHOTS — {date_str}")
         print(f"{'='*60}")
-        print(f"Uploaded {len(links)}/{len(urls)} to Drive subfolder: {subfolder}")
+        print(f"Uploaded {len(links)}/{len(screenshots)} to Drive subfolder: {subfolder}")
         for name, link in sorted(links.items()):
             print(f"  {name}: {link}")
     else:
@@ -103,11 +118,59 @@ def baseline_all():
     if summary_file:
         with open(summary_file, 'a') as f:
             f.write(f"# Baseline Screenshots — {date_str}\n\n")
-            f.write(f"Captured **{len(screenshots)}** of **{len(urls)}** state pages\n\n")
+            f.write(f"Captured **{len(captured)}** of **{len(to_capture)}** state pages "
+                    f"({len(skipped)} skipped with unchanged text, "
+                    f"{len(unchanged)} visually unchanged and not uploaded)\n\n")
             if folder_id and (creds or oauth_token):
                 f.write("| State | Drive Link |\n|-------|------------|\n")
                 for name, link in sorted(links.items()):
                     f.write(f"| {name} | [View]({link}) |\n")
+                f.write("\n")
+            f.write("| State | Capture time | Result |\n|-------|-------------:|--------|\n")
+            for name, t in sorted(timings.items(), key=lambda kv: -kv[1]['seconds']):
+                result = 'ok' if t['ok'] else t['error']
+                f.write(f"| {name} | {t['seconds']:.1f}s | {result} |\n")
+
+
+def compare_readiness():
+    """Capture every state URL with legacy and current readiness; report timings."""
+    from statistics import median
+    from url_monitor import URLMonitor
+    from screenshots import capture_screenshots_timed
+
+    urls = URLMonitor().fetch_urls_from_monday()
+    if not urls:
+        logger.error("No URLs found on monday.com board")
+        sys.exit(1)
+
+    runs = {}
+    for label, legacy in (('before', True), ('after', False)):
+        logger.info(f"Capturing {len(urls)} URLs — {label} ({'legacy' if legacy else 'DOM stability'})")
+        _, runs[label] = capture_screenshots_timed(
+            urls, output_dir=f'screenshots/compare-{label}', timeout=45000, legacy=legacy,
+        )
+
+    lines = ["# Screenshot readiness — before/after\n",
+             "| State | Before | After | Change |",
+             "|-------|-------:|------:|-------:|"]
+    for name in sorted(runs['before']):
+        b, a = runs['before'][name], runs['after'].get(name)
+        before = f"{b['seconds']:.1f}s" if b['ok'] else 'failed'
+        after = (f"{a['seconds']:.1f}s" if a['ok'] else 'failed') if a else '—'
+        change = f"{a['seconds'] - b['seconds']:+.1f}s" if a and a['ok'] and b['ok'] else ''
+        lines.append(f"| {name} | {before} | {after} | {change} |")
+    for label in ('before', 'after'):
+        ok = [t['seconds'] for t in runs[label].values() if t['ok']]
+        if ok:
+            lines.append(f"\n**{label}:** {len(ok)}/{len(urls)} captured, "
+                         f"median {median(ok):.1f}s, total {sum(ok):.0f}s")
+    report = '\n'.join(lines) + '\n'
+    print(report)
+
+    summary_file = os.getenv('GITHUB_STEP_SUMMARY')
+    if summary_file:
+        with open(summary_file, 'a') as f:
+            f.write(report)
 
 
 if __name__ == '__main__':
@@ -115,9 +178,13 @@ if __name__ == '__main__':
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument('--url', help='Screenshot a single test URL')
     group.add_argument('--baseline', action='store_true', help='Screenshot all 51 state URLs')
+    group.add_argument('--compare', action='store_true',
+                       help='Before/after capture timings for legacy vs DOM-stability readiness')
     args = parser.parse_args()
 
     if args.url:
         test_single_url(args.url)
     elif args.baseline:
         baseline_all()
+    elif args.compare:
+        compare_readiness()
@@ -27,8 +27,9 @@ import time
 import ipaddress
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from urllib.parse import urlparse
+from urllib.parse import urljoin, urlparse
 import smtplib
+from email.mime.image import MIMEImage
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -42,6 +43,8 @@ except ImportError as e:
     print("Install with: pip install requests beautifulsoup4 lxml")
     exit(1)
 
+from pdf_text import HAS_PYPDF, PDFExtractor, is_pdf_response
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -102,6 +105,9 @@ class URLMonitor:
         self.session.mount('https://', HTTPAdapter(max_retries=retry))
         self.session.mount('http://', HTTPAdapter(max_retries=retry))
 
+        # Monitored PDFs are diffed on their extracted text
+        self.pdf_extractor = PDFExtractor()
+
 
     def is_safe_target_url(self, url: str) -> bool:
         """Allow only http(s) URLs that do not target local/private networks."""
@@ -354,6 +360,17 @@ class URLMonitor:
     # Page fetching and text extraction
     # ------------------------------------------------------------------
 
+    # Cap on .gov links kept per snapshot (feeds validate_urls' candidate index)
+    MAX_GOV_LINKS = 200
+    # Cap on outbound {url, label} links kept per snapshot (feeds the newsletter)
+    MAX_PAGE_LINKS = 500
+    # Character budget for text extracted from monitored PDFs
+    PDF_TEXT_CHARS = 100_000
+    # Snapshot 'format' of PDFs hashed on extracted text.  Snapshots saved
+    # before PDFs were extracted hashed the raw bytes parsed as HTML and
+    # carry no format; they are re-baselined quietly on first encounter.
+    PDF_TEXT_FORMAT = 'pdf-text'
+
     def fetch_page_text(self, url: str) -> Optional[str]:
         """Fetch a URL and extract meaningful text content (no nav/script/style).
 
@@ -361,24 +378,46 @@ class URLMonitor:
         server responds with 403 (URL exists but blocks automated access).
         Returns None only on connection failures or 4xx/5xx other than 403.
         """
+        page = self.fetch_page(url)
+        return page['text'] if page else None
+
+    def fetch_page(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a URL; return {'text', 'gov_links', 'links'} or None on failure.
+
+        'text' follows fetch_page_text's contract (PDFs are routed to the
+        shared PDF extractor and diffed on their text).  'gov_links' lists the
+        absolute .gov URLs the page links to (nav included, deduplicated,
+        fragments dropped), which validate_urls.py uses as replacement
+        candidates when a board URL breaks.  'links' is the main content's
+        {url, label} link list (see extract_links).  PDFs also carry
+        'format': PDF_TEXT_FORMAT, which is stored in their snapshot.
+        """
         if not self.is_safe_target_url(url):
             logger.warning(f"Blocked unsafe URL target: {url}")
             return None
 
         try:
-            resp = self.session.get(url, timeout=20, allow_redirects=True)
+            resp = self.session.get(url, timeout=20, allow_redirects=True, stream=True)
             if resp.status_code == 403:
                 logger.info(f"  URL exists but returned 403 (access restricted): {url}")
-                return '__ACCESS_RESTRICTED__'
+                resp.close()
+                return {'text': '__ACCESS_RESTRICTED__', 'gov_links': [], 'links': []}
             resp.raise_for_status()
+            if HAS_PYPDF and is_pdf_response(resp.url, resp.headers.get('Content-Type', '')):
+                return self.fetch_pdf(resp)
         except requests.exceptions.RequestException as e:
             logger.warning(f"Failed to fetch {url}: {type(e).__name__}")
             return None
 
         soup = BeautifulSoup(resp.content, 'html.parser')
+        gov_links = self.extract_gov_links(soup, resp.url)
 
-        # Remove noise elements
-        for tag in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'noscript', 'iframe']):
+        # Remove noise elements (header/footer after the outbound links are
+        # read, matching what the newsletter sees on a live fetch)
+        for tag in soup.find_all(['script', 'style', 'nav', 'noscript', 'iframe']):
+            tag.decompose()
+        links = self.extract_links(soup, resp.url)
+        for tag in soup.find_all(['header', 'footer']):
             tag.decompose()
 
         # Try to find main content area
@@ -391,7 +430,63 @@ class URLMonitor:
         # Normalize whitespace: collapse blank lines, strip trailing spaces
         lines = [line.strip() for line in text.splitlines()]
         lines = [line for line in lines if line]
-        return '\n'.join(lines)
+        return {'text': '\n'.join(lines), 'gov_links': gov_links, 'links': links}
+
+    def fetch_pdf(self, resp) -> Optional[Dict[str, Any]]:
+        """Extract a PDF response's text via the shared PDF extractor
+        (streamed to disk, parsed out of process, page/char capped)."""
+        path = self.pdf_extractor.save_response(resp)
+        text = self.pdf_extractor.extract(path, self.PDF_TEXT_CHARS) if path else None
+        if text is None:
+            logger.warning(f"  Could not extract PDF text: {resp.url}")
+            return None
+        lines = [line.strip() for line in text.splitlines()]
+        return {
+            'text': '\n'.join(line for line in lines if line),
+            'gov_links': [],
+            'links': [],
+            'format': self.PDF_TEXT_FORMAT,
+        }
+
+    def extract_links(self, soup, base_url: str) -> List[Dict[str, str]]:
+        """Absolute {url, label} links from the main content area, deduplicated.
+
+        Stored in the snapshot so newsletter.py can pick a changed page's key
+        links without re-fetching it (same shape as newsletter.page_links).
+        """
+        content = soup.find('main') or soup.find('article') or soup.find(role='main') or soup
+        seen = set()
+        links = []
+        for a in content.find_all('a', href=True):
+            href = a['href'].strip()
+            if not href or href.startswith(('#', 'mailto:', 'javascript:')):
+                continue
+            link = urljoin(base_url, href)
+            if link in seen:
+                continue
+            seen.add(link)
+            links.append({'url': link, 'label': a.get_text(strip=True)[:100] or href.split('/')[-1]})
+            if len(links) >= self.MAX_PAGE_LINKS:
+                break
+        return links
+
+    def extract_gov_links(self, soup, base_url: str) -> List[str]:
+        """Absolute http(s) links to .gov hosts, in page order, deduplicated."""
+        seen = set()
+        links = []
+        for a in soup.find_all('a', href=True):
+            link = urljoin(base_url, a['href'].strip()).split('#')[0]
+            parsed = urlparse(link)
+            host = (parsed.hostname or '').lower()
+            if parsed.scheme not in ('http', 'https') or not host.endswith('.gov'):
+                continue
+            if link in seen or link == base_url:
+                continue
+            seen.add(link)
+            links.append(link)
+            if len(links) >= self.MAX_GOV_LINKS:
+                break
+        return links
 
     # ------------------------------------------------------------------
     # Change detection
@@ -531,7 +626,8 @@ class URLMonitor:
             item_id = item.get('item_id', '')
             logger.info(f"Checking: {name} ({url})")
 
-            text = self.fetch_page_text(url)
+            page = self.fetch_page(url)
+            text = page['text'] if page else None
             if text is None:
                 results['errors'].append({'name': name, 'url': url, 'error': 'fetch failed'})
                 # Preserve previous snapshot on fetch failure
@@ -559,12 +655,21 @@ class URLMonitor:
                 'name': name,
                 'hash': current_hash,
                 'content': text,
+                'gov_links': page['gov_links'],
+                'links': page['links'],
                 'last_checked': datetime.now().isoformat(),
             }
+            if page.get('format'):
+                new_snapshots[url]['format'] = page['format']
 
             if url not in previous:
                 results['new'].append({'name': name, 'url': url})
                 logger.info(f"  NEW — first time seeing this URL")
+            elif (page.get('format') == self.PDF_TEXT_FORMAT
+                  and 'format' not in previous[url]
+                  and previous[url]['hash'] != '__ACCESS_RESTRICTED__'):
+                results['unchanged'].append({'name': name, 'url': url, 'note': 're-baselined (PDF now diffed on its text)'})
+                logger.info(f"  RE-BASELINE — PDF snapshot predates text extraction, no change reported")
             elif self.is_binary_garbage(previous[url].get('content', '')):
                 results['new'].append({'name': name, 'url': url, 'note': 're-baselined (old snapshot was corrupt)'})
                 logger.info(f"  RE-BASELINE — old snapshot was binary garbage, saving clean version")
@@ -578,6 +683,7 @@ class URLMonitor:
                     results['changed'].append({
                         'name': name,
                         'url': url,
+                        'hash': current_hash,
                         'diff': diff,
                         'previous_check': previous[url].get('last_checked', 'unknown'),
                     })
@@ -588,6 +694,7 @@ class URLMonitor:
 
             time.sleep(1)  # Rate limiting
 
+        self.pdf_extractor.close()
         self.save_snapshots(new_snapshots)
 
         logger.info("=" * 60)
@@ -630,12 +737,21 @@ class URLMonitor:
         body = self._format_email(results)
 
         try:
-            msg = MIMEMultipart('alternative')
+            msg = MIMEMultipart('mixed')
             msg['From'] = self.smtp_user
             msg['To'] = self.notification_email
             msg['Subject'] = subject
             msg.attach(MIMEText(body, 'plain'))
 
+            # "What changed" crops (see visual_diff.py) as image attachments
+            for item in changed:
+                path = item.get('visual_diff')
+                if path and os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        image = MIMEImage(f.read(), _subtype='png')
+                    image.add_header('Content-Disposition', 'attachment', filename=os.path.basename(path))
+                    msg.attach(image)
+
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
                 server.starttls()
                 server.login(self.smtp_user, self.smtp_password)
@@ -666,6 +782,8 @@ class URLMonitor:
                 parts.append(f">> {item['name']}")
                 parts.append(f"   {item['url']}")
                 parts.append(f"   Last checked: {item.get('previous_check', 'unknown')}")
+                if item.get('visual_diff'):
+                    parts.append(f"   What changed (image): {os.path.basename(item['visual_diff'])} (attached)")
                 parts.append(f"   Changes:")
                 for line in item['diff'].splitlines():
                     parts.append(f"   {line}")
@@ -721,6 +839,8 @@ class URLMonitor:
             for item in changed:
                 parts.append(f"### {item['name']}")
                 parts.append(f"URL: {item['url']}\n")
+                if item.get('visual_diff_link'):
+                    parts.append(f"[What changed (screenshot crop)]({item['visual_diff_link']})\n")
                 parts.append("```diff")
                 parts.append(item['diff'])
                 parts.append("```\n")
@@ -753,19 +873,41 @@ def main():
     with open('url-monitor-results.json', 'w') as f:
         json.dump(results, f, indent=2, default=str)
 
-    # Take screenshots of changed pages
+    # Take screenshots of changed pages.  Pages whose text hash matches
+    # their last capture are skipped, and captures perceptually identical to
+    # the previous one are dropped before upload (see visual_hash.py).
     if results['changed']:
         try:
             from screenshots import capture_screenshots
-            screenshots = capture_screenshots(results['changed'])
+            from visual_hash import ScreenshotHashStore
+            hash_store = ScreenshotHashStore()
+            to_capture, skipped = hash_store.needs_capture(results['changed'])
+            if skipped:
+                logger.info(f"Skipping {len(skipped)} screenshots (text unchanged since last capture)")
+            captured = capture_screenshots(to_capture)
+            screenshots, unchanged = hash_store.classify(captured, to_capture)
+            hash_store.save()
             results['screenshots'] = {
                 name: os.path.basename(path)
                 for name, path in screenshots.items()
             }
+            results['screenshots_visually_unchanged'] = sorted(unchanged)
         except Exception as e:
             logger.warning(f"Screenshot capture failed: {e}")
             screenshots = {}
 
+        # "What changed" crops against each state's previous capture
+        visual_diffs = {}
+        if screenshots:
+            try:
+                from visual_diff import diff_changed_captures
+                visual_diffs = diff_changed_captures(screenshots)
+                for item in results['changed']:
+                    if item['name'] in visual_diffs:
+                        item['visual_diff'] = visual_diffs[item['name']]['path']
+            except Exception as e:
+                logger.warning(f"Visual diff failed: {e}")
+
         # Upload screenshots to Google Drive
         drive_folder = os.getenv('GOOGLE_DRIVE_FOLDER_ID', '')
         drive_creds = os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON', '')
@@ -773,14 +915,20 @@ def main():
         if screenshots and drive_folder and (drive_creds or oauth_token):
             try:
                 from drive_upload import upload_screenshots_to_drive
+                uploads = dict(screenshots)
+                uploads.update({f"{name} (what changed)": d['path'] for name, d in visual_diffs.items()})
                 drive_links = upload_screenshots_to_drive(
-                    screenshots, drive_folder,
+                    uploads, drive_folder,
                     credentials_json=drive_creds,
                     refresh_token=oauth_token,
                     client_id=os.getenv('GOOGLE_CLIENT_ID', ''),
                     client_secret=os.getenv('GOOGLE_CLIENT_SECRET', ''),
                 )
                 results['drive_links'] = drive_links
+                for item in results['changed']:
+                    link = drive_links.get(f"{item['name']} (what changed)")
+                    if link:
+                        item['visual_diff_link'] = link
             except Exception as e:
                 logger.warning(f"Drive upload failed: {e}")
 
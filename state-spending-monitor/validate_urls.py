@@ -6,10 +6,20 @@ for broken ones, and updates the board.
 Usage:
   python validate_urls.py                  # check only (dry run)
   python validate_urls.py --fix            # check + update broken URLs on monday.com
-  python validate_urls.py --report-only    # just print the report, no changes
+  python validate_urls.py --report-only    # reachability only (no body download), no changes
+  python validate_urls.py --workers 8      # validate concurrently (max 2 requests per host)
+
+Replacement URLs come from a local candidate index first — URLs in the URL
+monitor's snapshots.json (plus the .gov links it saw on each page) and the
+hub_url / rfp_link / advisory / gov_news fields of state_pages/states_data.json.
+Google is only searched when no indexed candidate verifies, and search results
+are cached in search_cache.json for SEARCH_CACHE_TTL_DAYS.
 
 Required env vars: MONDAY_API_TOKEN, MONDAY_BOARD_ID
 Optional: MONDAY_URL_COLUMN_ID (column title or ID, default: auto-detect)
+          SNAPSHOTS_FILE (URL monitor snapshots, default: snapshots.json)
+          SEARCH_CACHE_FILE (default: search_cache.json)
+          SEARCH_CACHE_TTL_DAYS (default: 7)
 """
 
 import argparse
@@ -17,7 +27,9 @@ import json
 import logging
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
@@ -41,6 +53,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+HERE = os.path.dirname(os.path.abspath(__file__))
+STATES_DATA_FILE = os.path.join(HERE, 'state_pages', 'states_data.json')
+
+# states_data.json fields that hold state-owned URLs worth indexing
+STATE_URL_FIELDS = ['hub_url', 'rfp_link', 'advisory', 'gov_news']
+
+
+def _site_domain(host: str) -> str:
+    """Registrable-ish domain: last two labels, three for *.xx.us hosts."""
+    labels = host.lower().split('.')
+    keep = 3 if labels[-1] == 'us' else 2
+    return '.'.join(labels[-keep:])
+
+
+class CandidateIndex:
+    """Known URLs that can stand in for a broken board URL, grouped by state.
+
+    Built from the URL monitor's snapshots (page URLs, their text and the
+    .gov links seen on them) and the state URLs in states_data.json.
+    """
+
+    # A domain referenced by more states than this is treated as shared
+    SHARED_DOMAIN_STATES = 2
+
+    def __init__(self, rht_terms: List[str]):
+        self.rht_terms = rht_terms
+        # url -> {'states': set of state names, 'sources': set, 'text': str}
+        self.entries: Dict[str, dict] = {}
+
+    def add(self, url: str, state: Optional[str], source: str, text: str = ''):
+        if not url or not url.startswith('http'):
+            return
+        entry = self.entries.setdefault(url, {'states': set(), 'sources': set(), 'text': ''})
+        if state:
+            entry['states'].add(state)
+        entry['sources'].add(source)
+        if text and not entry['text']:
+            entry['text'] = text
+
+    @classmethod
+    def build(cls, rht_terms: List[str], snapshots_file: str,
+              states_data_file: str = STATES_DATA_FILE) -> 'CandidateIndex':
+        index = cls(rht_terms)
+        if os.path.exists(snapshots_file):
+            try:
+                with open(snapshots_file) as f:
+                    snapshots = json.load(f)
+                for url, snap in snapshots.items():
+                    state = snap.get('name')
+                    index.add(url, state, 'snapshot', snap.get('content', ''))
+                    for link in snap.get('gov_links', []):
+                        index.add(link, state, 'outbound')
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Could not read {snapshots_file}: {e}")
+        if os.path.exists(states_data_file):
+            with open(states_data_file, encoding='utf-8') as f:
+                states = json.load(f)
+            for state, d in states.items():
+                for field in STATE_URL_FIELDS:
+                    index.add(d.get(field), state, field)
+        logger.info(f"Candidate index: {len(index.entries)} known URLs")
+        return index
+
+    def rank(self, state: str, broken_url: Optional[str] = None, limit: int = 8) -> List[str]:
+        """Best candidate URLs for a state, highest score first.
+
+        Score = domain match (same site as the broken URL or as any URL
+        indexed for the state, state name in the host, .gov) + RHT-term
+        density of the indexed page text and the URL itself.
+        """
+        slug = re.sub(r'[^a-z]', '', state.lower())
+        # Domains linked from many states' pages (cms.gov, hhs.gov, ...) are
+        # federal/shared and never stand in for a state page.
+        domain_states: Dict[str, set] = {}
+        for u, e in self.entries.items():
+            domain_states.setdefault(_site_domain(urlparse(u).hostname or ''), set()).update(e['states'])
+        shared = {d for d, states in domain_states.items() if len(states) > self.SHARED_DOMAIN_STATES}
+        state_domains = {d for d, states in domain_states.items() if state in states} - shared
+        broken_domain = _site_domain(urlparse(broken_url).hostname or '') if broken_url else ''
+
+        scored = []
+        for url, entry in self.entries.items():
+            if url == broken_url:
+                continue
+            host = (urlparse(url).hostname or '').lower()
+            domain = _site_domain(host)
+            if domain in shared and domain != broken_domain:
+                continue
+            in_state = state in entry['states']
+            domain_match = domain == broken_domain or domain in state_domains
+            if not (in_state or domain_match or slug in host.replace('.', '').replace('-', '')):
+                continue
+
+            score = 0.0
+            if domain == broken_domain:
+                score += 3
+            elif domain_match:
+                score += 2
+            if slug in host.replace('-', ''):
+                score += 1
+            if in_state:
+                score += 2
+            if host.endswith('.gov'):
+                score += 1
+            lowered_url = url.lower()
+            if 'rural' in lowered_url:
+                score += 1
+            if 'transformation' in lowered_url or 'rhtp' in lowered_url:
+                score += 2
+            text = entry['text'].lower()
+            if text:
+                hits = sum(text.count(t) for t in self.rht_terms)
+                score += min(hits * 1000.0 / max(len(text), 1), 5)
+            scored.append((score, url))
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [url for _score, url in scored[:limit]]
+
 
 class URLValidator:
 
@@ -52,7 +182,33 @@ class URLValidator:
         '{state} CMS rural health transformation 2026',
     ]
 
-    def __init__(self):
+    # Page text that marks a URL as RHT-related (matched case-insensitively)
+    RHT_TERMS = ['rural health transformation', 'rhtp', 'rht program', 'rural health funding']
+
+    # Body scan: chunk size and the most we read before giving up on a match
+    SCAN_CHUNK = 16 * 1024
+    SCAN_MAX_BYTES = 5 * 1024 * 1024
+
+    # HEAD answers that aren't trusted: many .gov servers reject or mishandle
+    # HEAD (403/405/501, but also 400 and 404), so any 4xx is retried as a GET
+    HEAD_FALLBACK_STATUSES = set(range(400, 500)) | {501}
+
+    # Indexed replacement candidates are verified in their own pool of this
+    # size (still per_host-limited), whatever --workers is
+    CANDIDATE_WORKERS = 4
+
+    # Cached Google result lists are reused for this long
+    SEARCH_CACHE_TTL_DAYS = float(os.getenv('SEARCH_CACHE_TTL_DAYS', '7'))
+
+    def __init__(self, workers: int = 1, per_host: int = 2):
+        self.snapshots_file = os.getenv('SNAPSHOTS_FILE', 'snapshots.json')
+        self.search_cache_file = os.getenv('SEARCH_CACHE_FILE', 'search_cache.json')
+        self._candidate_index: Optional[CandidateIndex] = None
+        self._search_cache: Optional[Dict[str, dict]] = None
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self._host_limits: Dict[str, threading.Semaphore] = {}
+        self._host_lock = threading.Lock()
         self.monday_token = os.getenv('MONDAY_API_TOKEN', '')
         self.monday_board_id = os.getenv('MONDAY_BOARD_ID', '')
         self.monday_url_column = os.getenv('MONDAY_URL_COLUMN_ID', '')
@@ -76,8 +232,9 @@ class URLValidator:
         })
         self.session.trust_env = False
         retry = Retry(total=3, backoff_factor=2, status_forcelist=[500, 502, 503, 504])
-        self.session.mount('https://', HTTPAdapter(max_retries=retry))
-        self.session.mount('http://', HTTPAdapter(max_retries=retry))
+        pool = max(10, self.workers)
+        self.session.mount('https://', HTTPAdapter(max_retries=retry, pool_maxsize=pool))
+        self.session.mount('http://', HTTPAdapter(max_retries=retry, pool_maxsize=pool))
 
     # ------------------------------------------------------------------
     # monday.com API
@@ -204,74 +361,215 @@ class URLValidator:
     # URL checking
     # ------------------------------------------------------------------
 
-    def check_url(self, url: str) -> dict:
-        """Check if a URL is reachable and has RHT-related content."""
+    def check_url(self, url: str, check_content: bool = True) -> dict:
+        """Check if a URL is reachable and has RHT-related content.
+
+        With check_content the URL is fetched with one streamed GET and the
+        body is scanned in chunks, stopping at the first RHT term.  With
+        check_content=False (reachability only) a HEAD is enough, retried as
+        a streamed GET whose body is never read when the server answers HEAD
+        with a 4xx or 501; has_rht_content stays None.
+        """
         result = {'url': url, 'status': None, 'ok': False, 'has_rht_content': False, 'error': None}
 
         try:
-            resp = self.session.get(url, timeout=20, allow_redirects=True)
+            if check_content:
+                resp = self.session.get(url, timeout=20, allow_redirects=True, stream=True)
+            else:
+                resp = self.session.head(url, timeout=20, allow_redirects=True)
+                if resp.status_code in self.HEAD_FALLBACK_STATUSES:
+                    resp.close()
+                    resp = self.session.get(url, timeout=20, allow_redirects=True, stream=True)
             result['status'] = resp.status_code
             result['final_url'] = resp.url
 
-            if resp.status_code != 200:
-                result['error'] = f'HTTP {resp.status_code}'
-                return result
+            try:
+                if resp.status_code != 200:
+                    result['error'] = f'HTTP {resp.status_code}'
+                    return result
+
+                result['ok'] = True
 
-            result['ok'] = True
+                if not check_content:
+                    result['has_rht_content'] = None
+                    return result
 
-            # Check for RHT-related content
-            text = resp.text.lower()
-            rht_terms = ['rural health transformation', 'rhtp', 'rht program', 'rural health funding']
-            result['has_rht_content'] = any(term in text for term in rht_terms)
+                # Check for RHT-related content
+                result['has_rht_content'] = self._scan_for_terms(resp)
+            finally:
+                resp.close()
 
         except requests.exceptions.RequestException as e:
             result['error'] = type(e).__name__
 
         return result
 
-    def find_replacement_url(self, state_name: str) -> Optional[str]:
+    def _scan_for_terms(self, resp) -> bool:
+        """Stream a response body and stop as soon as any RHT term appears.
+
+        Chunks are lowercased as bytes (the terms are ASCII); a tail the
+        length of the longest term is carried over so matches spanning two
+        chunks are still found.
+        """
+        terms = [t.encode('ascii') for t in self.RHT_TERMS]
+        keep = max(len(t) for t in terms) - 1
+        tail = b''
+        read = 0
+        for chunk in resp.iter_content(chunk_size=self.SCAN_CHUNK):
+            if not chunk:
+                continue
+            window = tail + chunk.lower()
+            if any(t in window for t in terms):
+                return True
+            tail = window[-keep:]
+            read += len(chunk)
+            if read >= self.SCAN_MAX_BYTES:
+                break
+        return False
+
+    def _host_limit(self, url: str) -> threading.Semaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.Semaphore(self.per_host)
+            return self._host_limits[host]
+
+    def check_urls(self, urls: List[str], check_content: bool = True) -> List[dict]:
+        """Check many URLs, returning results in input order.
+
+        With workers == 1 the URLs are checked one at a time with a 1s pause
+        between them.  Otherwise they run in a thread pool, with at most
+        per_host requests in flight against any one host.
+        """
+        if self.workers == 1:
+            results = []
+            for i, url in enumerate(urls):
+                if i:
+                    time.sleep(1)
+                results.append(self.check_url(url, check_content))
+            return results
+
+        return self._check_pooled(urls, check_content, self.workers)
+
+    def _check_pooled(self, urls: List[str], check_content: bool, workers: int) -> List[dict]:
+        """check_url over urls in a pool of `workers` threads, per_host-limited."""
+        def _check(url: str) -> dict:
+            with self._host_limit(url):
+                return self.check_url(url, check_content)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as pool:
+            return list(pool.map(_check, urls))
+
+    @property
+    def candidate_index(self) -> CandidateIndex:
+        if self._candidate_index is None:
+            self._candidate_index = CandidateIndex.build(self.RHT_TERMS, self.snapshots_file)
+        return self._candidate_index
+
+    def find_replacement_url(self, state_name: str, broken_url: Optional[str] = None) -> Optional[str]:
+        """Find a working URL for a state's RHT program page.
+
+        Checks the local candidate index first; Google is only searched when
+        no indexed candidate verifies.
+        """
+        url = self.find_local_replacement(state_name, broken_url)
+        if url:
+            return url
+        return self.search_replacement_url(state_name)
+
+    def find_local_replacement(self, state_name: str, broken_url: Optional[str] = None) -> Optional[str]:
+        """Verify the top-ranked indexed candidates concurrently; return the best
+        reachable one (RHT content preferred, else a reachable .gov URL)."""
+        candidates = self.candidate_index.rank(state_name, broken_url)
+        if not candidates:
+            return None
+        logger.info(f"  Verifying {len(candidates)} indexed candidates for {state_name}")
+        checks = self._check_pooled(candidates, True, self.CANDIDATE_WORKERS)
+        for check in checks:
+            if check['ok'] and check['has_rht_content']:
+                logger.info(f"Found replacement for {state_name} (local index): {check['url']}")
+                return check['url']
+        for check in checks:
+            if check['ok'] and (urlparse(check['url']).hostname or '').endswith('.gov') \
+                    and 'rural' in check['url'].lower():
+                logger.info(f"Found replacement for {state_name} (local index): {check['url']}")
+                return check['url']
+        return None
+
+    def _load_search_cache(self) -> Dict[str, dict]:
+        if self._search_cache is None:
+            self._search_cache = {}
+            if os.path.exists(self.search_cache_file):
+                try:
+                    with open(self.search_cache_file) as f:
+                        self._search_cache = json.load(f)
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"Ignoring unreadable search cache: {e}")
+        return self._search_cache
+
+    def search_result_urls(self, query: str) -> Tuple[Optional[List[str]], bool]:
+        """Result URLs for a Google query, from cache when fresh.
+
+        Returns (urls or None on failure, whether a live request was made).
+        """
+        cache = self._load_search_cache()
+        hit = cache.get(query)
+        if hit and time.time() - hit['fetched'] < self.SEARCH_CACHE_TTL_DAYS * 86400:
+            return hit['urls'], False
+
+        # Use Google search via a simple scrape
+        search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}&num=5"
+        resp = self.session.get(search_url, timeout=15)
+        if resp.status_code != 200:
+            return None, True
+
+        soup = BeautifulSoup(resp.text, 'html.parser')
+        urls = []
+        for a_tag in soup.find_all('a', href=True):
+            href = a_tag['href']
+            # Google wraps URLs in /url?q=...
+            if '/url?q=' in href:
+                urls.append(href.split('/url?q=')[1].split('&')[0])
+
+        cache[query] = {'fetched': time.time(), 'urls': urls}
+        with open(self.search_cache_file, 'w') as f:
+            json.dump(cache, f, indent=2)
+        return urls, True
+
+    def search_replacement_url(self, state_name: str) -> Optional[str]:
         """Search Google for a state's RHT program page and return the best URL."""
         for query_template in self.SEARCH_QUERIES:
             query = query_template.format(state=state_name)
+            live = True
             try:
-                # Use Google search via a simple scrape
-                search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}&num=5"
-                resp = self.session.get(search_url, timeout=15)
-                if resp.status_code != 200:
+                result_urls, live = self.search_result_urls(query)
+                if result_urls is None:
                     continue
 
-                soup = BeautifulSoup(resp.text, 'html.parser')
-
                 # Extract URLs from search results
-                for a_tag in soup.find_all('a', href=True):
-                    href = a_tag['href']
-                    # Google wraps URLs in /url?q=...
-                    if '/url?q=' in href:
-                        actual_url = href.split('/url?q=')[1].split('&')[0]
-                        parsed = urlparse(actual_url)
-                        # Prefer .gov domains
-                        if parsed.netloc.endswith('.gov') and 'rural' in actual_url.lower():
-                            # Verify it works
-                            check = self.check_url(actual_url)
-                            if check['ok']:
-                                logger.info(f"Found replacement for {state_name}: {actual_url}")
-                                return actual_url
+                for actual_url in result_urls:
+                    parsed = urlparse(actual_url)
+                    # Prefer .gov domains
+                    if parsed.netloc.endswith('.gov') and 'rural' in actual_url.lower():
+                        # Verify it works
+                        check = self.check_url(actual_url)
+                        if check['ok']:
+                            logger.info(f"Found replacement for {state_name}: {actual_url}")
+                            return actual_url
 
                 # If no .gov found, try any relevant result
-                for a_tag in soup.find_all('a', href=True):
-                    href = a_tag['href']
-                    if '/url?q=' in href:
-                        actual_url = href.split('/url?q=')[1].split('&')[0]
-                        if 'rural' in actual_url.lower() and 'health' in actual_url.lower():
-                            check = self.check_url(actual_url)
-                            if check['ok'] and check['has_rht_content']:
-                                logger.info(f"Found replacement for {state_name}: {actual_url}")
-                                return actual_url
+                for actual_url in result_urls:
+                    if 'rural' in actual_url.lower() and 'health' in actual_url.lower():
+                        check = self.check_url(actual_url)
+                        if check['ok'] and check['has_rht_content']:
+                            logger.info(f"Found replacement for {state_name}: {actual_url}")
+                            return actual_url
 
             except Exception as e:
                 logger.warning(f"Search failed for '{query}': {e}")
 
-            time.sleep(2)  # Rate limit between searches
+            if live:
+                time.sleep(2)  # Rate limit between live searches
 
         logger.warning(f"No replacement found for {state_name}")
         return None
@@ -280,15 +578,28 @@ class URLValidator:
     # Main
     # ------------------------------------------------------------------
 
-    def run(self, fix: bool = False) -> dict:
-        """Validate all URLs and optionally fix broken ones."""
+    def run(self, fix: bool = False, check_content: bool = True) -> dict:
+        """Validate all URLs and optionally fix broken ones.
+
+        check_content=False only tests reachability (no page bodies).
+        """
         logger.info("=" * 60)
-        logger.info(f"URL Validator — {'FIX mode' if fix else 'CHECK mode'}")
+        logger.info(f"URL Validator — {'FIX mode' if fix else 'CHECK mode'}"
+                    f"{'' if check_content else ' (reachability only)'}"
+                    f", {self.workers} worker(s)")
         logger.info("=" * 60)
 
         items, col_id = self.fetch_board_items()
         logger.info(f"Found {len(items)} items on board")
 
+        with_url = [item for item in items if item['url']]
+        started = time.monotonic()
+        checks = dict(zip(
+            (item['item_id'] for item in with_url),
+            self.check_urls([item['url'] for item in with_url], check_content),
+        ))
+        logger.info(f"Checked {len(with_url)} URLs in {time.monotonic() - started:.1f}s")
+
         results = {
             'total': len(items),
             'valid': [],
@@ -308,11 +619,16 @@ class URLValidator:
                 results['no_url'].append({'name': name, 'item_id': item_id})
                 continue
 
-            logger.info(f"Checking: {name} — {url}")
-            check = self.check_url(url)
+            logger.info(f"Checked: {name} — {url}")
+            check = checks[item_id]
 
             if check['ok']:
-                rht_note = " (has RHT content)" if check['has_rht_content'] else " (no RHT keywords found)"
+                if check['has_rht_content'] is None:
+                    rht_note = ""
+                elif check['has_rht_content']:
+                    rht_note = " (has RHT content)"
+                else:
+                    rht_note = " (no RHT keywords found)"
                 logger.info(f"  VALID{rht_note}")
                 results['valid'].append({
                     'name': name,
@@ -330,7 +646,7 @@ class URLValidator:
 
                 if fix:
                     logger.info(f"  Searching for replacement...")
-                    new_url = self.find_replacement_url(name)
+                    new_url = self.find_replacement_url(name, url)
                     if new_url:
                         self.update_item_url(item_id, col_id, new_url, name)
                         results['fixed'].append({
@@ -343,8 +659,6 @@ class URLValidator:
                     else:
                         results['no_replacement'].append({'name': name, 'url': url})
 
-            time.sleep(1)
-
         # Print summary
         logger.info("=" * 60)
         logger.info(f"Results: {len(results['valid'])} valid, "
@@ -395,7 +709,10 @@ class URLValidator:
             parts.append("| State | URL | RHT Content |")
             parts.append("|-------|-----|-------------|")
             for item in results['valid']:
-                rht = "Yes" if item['has_rht_content'] else "No"
+                if item['has_rht_content'] is None:
+                    rht = "—"
+                else:
+                    rht = "Yes" if item['has_rht_content'] else "No"
                 parts.append(f"| {item['name']} | {item['url']} | {rht} |")
 
         return '\n'.join(parts)
@@ -404,11 +721,17 @@ class URLValidator:
 def main():
     parser = argparse.ArgumentParser(description='Validate and fix URLs on monday.com board')
     parser.add_argument('--fix', action='store_true', help='Replace broken URLs with found replacements')
-    parser.add_argument('--report-only', action='store_true', help='Just print report, no changes')
+    parser.add_argument('--report-only', action='store_true',
+                        help='Reachability only: HEAD/status check, no page bodies, no changes')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Concurrent URL checks (default 1 = sequential)')
+    parser.add_argument('--per-host', type=int, default=2,
+                        help='Max concurrent requests per host when --workers > 1')
     args = parser.parse_args()
 
-    validator = URLValidator()
-    results = validator.run(fix=args.fix)
+    validator = URLValidator(workers=args.workers, per_host=args.per_host)
+    results = validator.run(fix=args.fix and not args.report_only,
+                            check_content=not args.report_only)
 
     # Save results
     with open('validation-results.json', 'w') as f:
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+"What changed" images for page screenshots.
+
+Compares a state's new full-page capture with its previous reference
+capture and writes a compact annotated image of just the changed regions
+(before | after, changed blocks outlined) for the email and issue.
+
+  1. Alignment — both captures are downsampled to ALIGN_WIDTH px wide and
+     their rows fingerprinted; a sequence match over the fingerprints finds
+     the aligned (shifted) segments, so content inserted near the top
+     doesn't make everything below it "changed" (the in-place alignment
+     wins when it fits better).  Rows with no counterpart are changed
+     bands outright.
+  2. Pre-pass — aligned segments are block-diffed at the downsampled
+     resolution; only strips with a candidate difference go on.
+  3. Full-resolution pass — candidate strips are diffed tile by tile
+     (STRIP_HEIGHT rows of each image at a time) with a NumPy block mask;
+     neither image is held as a full-resolution array.
+  4. Changed blocks are grouped into regions, the largest MAX_REGIONS are
+     cropped with padding and stacked into the output image.
+
+Each PNG is decoded in full, once: PNG rows are one zlib stream, so
+Pillow cannot decode a strip or crop without decoding everything above
+it, and the alignment pass needs every row anyway.  A decoded capture is
+width x height x 3 bytes (about 23 MB for 1280x6000), held only for the
+duration of one diff; the NumPy arrays are per strip as described above.
+
+The previous capture for each state lives in SCREENSHOT_REFERENCE_DIR
+(default screenshots/reference), cached between runs with the hash store.
+
+Requires numpy and Pillow; without them no diff images are produced.
+"""
+
+import difflib
+import logging
+import os
+import shutil
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw
+    HAS_DIFF_DEPS = True
+except ImportError:
+    HAS_DIFF_DEPS = False
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_DIR = os.getenv('SCREENSHOT_REFERENCE_DIR', os.path.join('screenshots', 'reference'))
+
+ALIGN_WIDTH = 128          # px width of the alignment / pre-pass images
+BLOCK = 16                 # full-res block size (px)
+STRIP_HEIGHT = 512         # rows per full-res tile (multiple of BLOCK)
+PIXEL_DELTA = 32           # per-pixel channel delta that counts as different
+BLOCK_FRACTION = 0.02      # share of a block's pixels that must differ
+PREPASS_DELTA = 8          # downsampled pixel delta that flags a strip
+REGION_GAP = 2             # blocks; changed blocks this close merge
+PADDING = 24               # px around each cropped region
+MAX_REGIONS = 6
+OUTPUT_WIDTH = 1280
+OUTLINE = (220, 30, 30)
+
+
+def _open_rgb(path: str):
+    """Decode a capture as RGB.  Playwright's PNGs already are, so no
+    converted copy is made for them (convert() always copies)."""
+    img = Image.open(path)
+    img.load()
+    return img if img.mode == 'RGB' else img.convert('RGB')
+
+
+def _downsampled(img) -> 'np.ndarray':
+    w, h = img.size
+    height = max(1, round(h * ALIGN_WIDTH / w))
+    return np.asarray(img.convert('L').resize((ALIGN_WIDTH, height), Image.BILINEAR), dtype=np.int16)
+
+
+def _row_signatures(small: 'np.ndarray') -> List[bytes]:
+    """Coarse per-row fingerprints: 16 column bins quantized to 8 levels."""
+    bins = small.reshape(small.shape[0], 16, -1).mean(axis=2)
+    return [row.tobytes() for row in (bins // 32).astype(np.uint8)]
+
+
+def _identity(old_small, new_small) -> List[Tuple[str, int, int, int, int]]:
+    """Row i ↔ row i, with any extra rows as a trailing insert/delete."""
+    n_old, n_new = len(old_small), len(new_small)
+    common = min(n_old, n_new)
+    ops = [('equal', 0, common, 0, common)]
+    if n_new > common:
+        ops.append(('insert', common, common, common, n_new))
+    elif n_old > common:
+        ops.append(('delete', common, n_old, common, common))
+    return ops
+
+
+def _cost(opcodes, old_small, new_small) -> int:
+    """Downsampled rows an alignment leaves different."""
+    cost = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'insert':
+            cost += j2 - j1
+        elif tag in ('equal', 'replace'):
+            n = min(i2 - i1, j2 - j1)
+            rows = np.abs(old_small[i1:i1 + n] - new_small[j1:j1 + n]).max(axis=1)
+            cost += int((rows >= PREPASS_DELTA).sum()) + (j2 - j1 - n)
+    return cost
+
+
+def _align(old_small, new_small) -> List[Tuple[str, int, int, int, int]]:
+    """Row alignment of two downsampled captures.
+
+    A sequence match over row fingerprints follows inserted/removed content;
+    on repetitive pages it can pair the wrong rows, so the in-place
+    alignment is used instead whenever it leaves fewer rows different.
+    """
+    matcher = difflib.SequenceMatcher(
+        None, _row_signatures(old_small), _row_signatures(new_small), autojunk=False,
+    )
+    candidates = [_identity(old_small, new_small), matcher.get_opcodes()]
+    return min(candidates, key=lambda ops: _cost(ops, old_small, new_small))
+
+
+def _block_mask(old: 'np.ndarray', new: 'np.ndarray') -> 'np.ndarray':
+    """Boolean (rows/BLOCK, cols/BLOCK) mask of blocks that differ."""
+    h = min(old.shape[0], new.shape[0]) // BLOCK * BLOCK
+    w = min(old.shape[1], new.shape[1]) // BLOCK * BLOCK
+    if h == 0 or w == 0:
+        return np.zeros((0, 0), dtype=bool)
+    delta = np.abs(old[:h, :w] - new[:h, :w]).max(axis=2) > PIXEL_DELTA
+    blocks = delta.reshape(h // BLOCK, BLOCK, w // BLOCK, BLOCK).mean(axis=(1, 3))
+    return blocks > BLOCK_FRACTION
+
+
+def _changed_blocks(old_img, new_img, old_small, new_small, opcodes) -> List[Tuple[int, int]]:
+    """(block_row, block_col) of changed blocks in new-image coordinates."""
+    scale_new = new_img.size[0] / ALIGN_WIDTH
+    scale_old = old_img.size[0] / ALIGN_WIDTH
+    cols = new_img.size[0] // BLOCK
+    changed = set()
+
+    def band(top_row: int, bottom_row: int):
+        for r in range(int(top_row * scale_new) // BLOCK, int(bottom_row * scale_new) // BLOCK + 1):
+            changed.update((r, c) for c in range(cols))
+
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'insert':
+            # New rows with no counterpart: the whole band changed
+            band(j1, j2)
+            continue
+        if tag == 'delete':
+            # Old rows removed: flag a one-block band where they used to be
+            band(j1, j1)
+            continue
+        if tag == 'replace':
+            # Rows that differ coarsely: pixel-diff the overlap in place,
+            # and any extra new rows are a changed band
+            overlap = min(i2 - i1, j2 - j1)
+            if j2 - j1 > overlap:
+                band(j1 + overlap, j2)
+            i2, j2 = i1 + overlap, j1 + overlap
+
+        # Aligned segment: old rows = new rows - offset
+        seg_top = int(j1 * scale_new) // BLOCK * BLOCK
+        seg_bottom = int(j2 * scale_new)
+        offset = int(j1 * scale_new) - int(i1 * scale_old)
+        pre = np.abs(old_small[i1:i2] - new_small[j1:j2])
+        strip_rows = max(1, int(STRIP_HEIGHT / scale_new))
+        for top in range(seg_top, seg_bottom, STRIP_HEIGHT):
+            s = int((top - seg_top) / scale_new)
+            candidate = pre[s:s + strip_rows]
+            if candidate.size and candidate.max() < PREPASS_DELTA:
+                continue
+            bottom = min(top + STRIP_HEIGHT, seg_bottom)
+            new_tile = np.asarray(new_img.crop((0, top, new_img.size[0], bottom)), dtype=np.int16)
+            old_top = top - offset
+            if old_top < 0 or old_top >= old_img.size[1]:
+                continue
+            old_tile = np.asarray(
+                old_img.crop((0, old_top, old_img.size[0], min(old_top + (bottom - top), old_img.size[1]))),
+                dtype=np.int16,
+            )
+            mask = _block_mask(old_tile, new_tile)
+            for r, c in zip(*np.nonzero(mask)):
+                changed.add((top // BLOCK + int(r), int(c)))
+
+    max_row = new_img.size[1] // BLOCK
+    return [(r, c) for r, c in changed if 0 <= r <= max_row]
+
+
+def _regions(blocks: List[Tuple[int, int]]) -> List[Tuple[int, int, int, int]]:
+    """Group changed blocks (within REGION_GAP) into pixel boxes, largest first."""
+    remaining = set(blocks)
+    boxes = []
+    while remaining:
+        start = remaining.pop()
+        queue = deque([start])
+        r0 = r1 = start[0]
+        c0 = c1 = start[1]
+        while queue:
+            r, c = queue.popleft()
+            for dr in range(-REGION_GAP, REGION_GAP + 1):
+                for dc in range(-REGION_GAP, REGION_GAP + 1):
+                    nb = (r + dr, c + dc)
+                    if nb in remaining:
+                        remaining.remove(nb)
+                        queue.append(nb)
+                        r0, r1 = min(r0, nb[0]), max(r1, nb[0])
+                        c0, c1 = min(c0, nb[1]), max(c1, nb[1])
+        boxes.append((c0 * BLOCK, r0 * BLOCK, (c1 + 1) * BLOCK, (r1 + 1) * BLOCK))
+    boxes.sort(key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True)
+    return boxes
+
+
+def _old_box(box, opcodes, old_img, new_img) -> Optional[Tuple[int, int, int, int]]:
+    """Map a new-image box to the old image through the alignment, if aligned."""
+    scale_new = new_img.size[0] / ALIGN_WIDTH
+    scale_old = old_img.size[0] / ALIGN_WIDTH
+    mid = (box[1] + box[3]) / 2 / scale_new
+    for tag, i1, i2, j1, j2 in opcodes:
+        if j1 <= mid < j2 and tag in ('equal', 'replace'):
+            offset = int(j1 * scale_new) - int(i1 * scale_old)
+            top, bottom = box[1] - offset, box[3] - offset
+            if bottom > 0 and top < old_img.size[1]:
+                return (box[0], max(0, top), box[2], min(old_img.size[1], bottom))
+    return None
+
+
+def visual_diff(previous_path: str, new_path: str, out_path: str) -> Optional[Dict]:
+    """Write an annotated "what changed" image for two captures of a page.
+
+    Returns {'path', 'regions', 'changed_fraction'}, or None when nothing
+    changed visually (or numpy/Pillow are unavailable).
+    """
+    if not HAS_DIFF_DEPS:
+        return None
+
+    old_img, new_img = _open_rgb(previous_path), _open_rgb(new_path)
+    old_small, new_small = _downsampled(old_img), _downsampled(new_img)
+
+    opcodes = _align(old_small, new_small)
+    blocks = _changed_blocks(old_img, new_img, old_small, new_small, opcodes)
+    if not blocks:
+        return None
+    total_blocks = max(1, (new_img.size[0] // BLOCK) * (new_img.size[1] // BLOCK + 1))
+    boxes = _regions(blocks)[:MAX_REGIONS]
+    boxes.sort(key=lambda b: b[1])  # top to bottom in the output
+
+    half = OUTPUT_WIDTH // 2
+    panels = []
+    for box in boxes:
+        # Pad, and widen narrow regions to a half-width panel for context
+        grow = max(PADDING, (half - (box[2] - box[0])) // 2)
+        padded = (max(0, box[0] - grow), max(0, box[1] - PADDING),
+                  min(new_img.size[0], box[2] + grow), min(new_img.size[1], box[3] + PADDING))
+        after = new_img.crop(padded)
+        ImageDraw.Draw(after).rectangle(
+            (box[0] - padded[0], box[1] - padded[1], box[2] - padded[0] - 1, box[3] - padded[1] - 1),
+            outline=OUTLINE, width=3,
+        )
+        old_box = _old_box(padded, opcodes, old_img, new_img)
+        before = old_img.crop(old_box) if old_box else None
+
+        scale = min(1.0, half / after.size[0])
+        after = after.resize((max(1, int(after.size[0] * scale)), max(1, int(after.size[1] * scale))))
+        panel_h = after.size[1] + 20
+        panel = Image.new('RGB', (OUTPUT_WIDTH, panel_h), 'white')
+        draw = ImageDraw.Draw(panel)
+        draw.text((4, 4), f"before (y={old_box[1]})" if old_box else "before: (new content)", fill=(80, 80, 80))
+        draw.text((half + 4, 4), f"after (y={box[1]})", fill=(80, 80, 80))
+        if before is not None:
+            before = before.resize((max(1, int(before.size[0] * scale)), max(1, int(before.size[1] * scale))))
+            panel.paste(before, (0, 20))
+        panel.paste(after, (half, 20))
+        panels.append(panel)
+
+    out = Image.new('RGB', (OUTPUT_WIDTH, sum(p.size[1] for p in panels) + 4 * len(panels)), (200, 200, 200))
+    y = 0
+    for panel in panels:
+        out.paste(panel, (0, y))
+        y += panel.size[1] + 4
+    out.save(out_path, optimize=True)
+
+    return {
+        'path': out_path,
+        'regions': [list(b) for b in boxes],
+        'changed_fraction': round(len(blocks) / total_blocks, 4),
+    }
+
+
+def diff_changed_captures(screenshots: Dict[str, str], reference_dir: str = REFERENCE_DIR) -> Dict[str, Dict]:
+    """Diff each new capture against its state's reference, then make the
+    new capture the reference.
+
+    Args:
+        screenshots: Dict mapping state name to a (visually changed) capture.
+
+    Returns:
+        Dict mapping state name to visual_diff()'s result, for states that
+        had a reference and a visible difference.
+    """
+    os.makedirs(reference_dir, exist_ok=True)
+    diffs = {}
+    for name, path in screenshots.items():
+        base, ext = os.path.splitext(os.path.basename(path))
+        reference = os.path.join(reference_dir, f"{base.rsplit('-', 3)[0]}{ext}")
+        if os.path.exists(reference):
+            out_path = os.path.join(os.path.dirname(path), f"{base}-changes{ext}")
+            try:
+                result = visual_diff(reference, path, out_path)
+                if result:
+                    diffs[name] = result
+                    logger.info(f"  {name}: {len(result['regions'])} changed region(s) -> {out_path}")
+            except Exception as e:
+                logger.warning(f"  Visual diff failed for {name}: {e}")
+        shutil.copyfile(path, reference)
+    return diffs
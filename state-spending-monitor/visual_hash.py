@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Perceptual hashes for page screenshots.
+
+Each capture is recorded with:
+  tiles       — a dHash per vertical tile of the full-page image (a page is
+                cut into roughly screen-sized tiles, so a change far down a
+                long page still moves a hash)
+  phash       — DCT pHash of the whole image
+  hero_phash  — pHash of the top band build_heroes.py crops for thumbnails
+  text_hash   — the URL monitor's text hash at capture time
+
+The hash store (SCREENSHOT_HASHES_FILE, default screenshot_hashes.json,
+cached between runs like snapshots.json) lets the pipeline skip capturing
+pages whose text hash is unchanged, and skip Drive upload / hero rebuilds
+for captures within VISUAL_CHANGE_THRESHOLD bits of the previous one.
+
+The default threshold (4) was calibrated on pages stacked from the real
+state captures in img/states (1280x5976, nine tiles).  Worst-tile dHash
+distances measured:
+  re-render noise (0.5 px blur, 1 px resample)    0-3 bits
+  1% global brightness shift                      2-6
+  400x100 px region replaced                      0-12, median 3
+  full-width 200 px band replaced                 2-18, median 9
+  a different page                                34-40
+Hero-band pHash distances were 0-4 for the noise cases and a median of 12
+for a 400x100 px change.  No threshold separates noise from small edits
+completely.  At 4, re-render noise is always ignored, while 40% of
+400x100 changes and 96% of 200 px bands count as changed (at 6: 21% and
+85%).  A missed change costs the only screenshot of it, but extra noise
+costs only one more upload.
+
+Requires Pillow; without it every capture counts as changed.
+"""
+
+import json
+import logging
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from PIL import Image
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+TILE_ASPECT = 0.75          # tile height = width * 0.75 (≈ one 1280x960 screen)
+MAX_TILES = 16
+HERO_BAND_RATIO = 0.52      # matches build_heroes.BAND_RATIO
+VISUAL_CHANGE_THRESHOLD = int(os.getenv('VISUAL_CHANGE_THRESHOLD', '4'))  # see module docstring
+HASHES_FILE = os.getenv('SCREENSHOT_HASHES_FILE', 'screenshot_hashes.json')
+
+
+def dhash(img) -> str:
+    """64-bit difference hash (row-wise gradient of a 9x8 grayscale)."""
+    small = img.convert('L').resize((9, 8), Image.LANCZOS)
+    px = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (px[row * 9 + col] < px[row * 9 + col + 1])
+    return f"{bits:016x}"
+
+
+def _dct_1d(values: List[float]) -> List[float]:
+    n = len(values)
+    return [
+        sum(v * math.cos(math.pi * (i + 0.5) * k / n) for i, v in enumerate(values))
+        for k in range(n)
+    ]
+
+
+def phash(img) -> str:
+    """64-bit DCT perceptual hash: low 8x8 frequencies of a 32x32 grayscale,
+    thresholded at their median (DC term excluded)."""
+    small = img.convert('L').resize((32, 32), Image.LANCZOS)
+    px = list(small.getdata())
+    rows = [_dct_1d(px[r * 32:(r + 1) * 32])[:8] for r in range(32)]
+    cols = [_dct_1d([rows[r][c] for r in range(32)])[:8] for c in range(8)]
+    low = [cols[c][r] for r in range(8) for c in range(8)]
+    median = sorted(low[1:])[len(low[1:]) // 2]
+    bits = 0
+    for v in low:
+        bits = (bits << 1) | (v > median)
+    return f"{bits:016x}"
+
+
+def hamming(a: str, b: str) -> int:
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def _tiles(img) -> List:
+    w, h = img.size
+    count = min(MAX_TILES, max(1, math.ceil(h / (w * TILE_ASPECT))))
+    step = h / count
+    return [img.crop((0, round(i * step), w, round((i + 1) * step))) for i in range(count)]
+
+
+def hero_band(img):
+    """The top band build_heroes.py turns into a thumbnail."""
+    w, h = img.size
+    return img.crop((0, 0, w, min(h, int(w * HERO_BAND_RATIO))))
+
+
+def image_hashes(path: str) -> Optional[Dict]:
+    """Perceptual hashes for a screenshot file (None without Pillow)."""
+    if not HAS_PIL:
+        return None
+    with Image.open(path) as im:
+        img = im.convert('RGB')
+    return {
+        'size': list(img.size),
+        'tiles': [dhash(t) for t in _tiles(img)],
+        'phash': phash(img),
+        'hero_phash': phash(hero_band(img)),
+    }
+
+
+def visual_distance(prev: Optional[Dict], cur: Optional[Dict]) -> int:
+    """Worst tile distance in bits; HASH_BITS when not comparable."""
+    if not prev or not cur or not prev.get('tiles') or not cur.get('tiles'):
+        return HASH_BITS
+    if len(prev['tiles']) != len(cur['tiles']):
+        return HASH_BITS
+    return max(hamming(a, b) for a, b in zip(prev['tiles'], cur['tiles']))
+
+
+class ScreenshotHashStore:
+    """name → last visually-distinct capture (hashes, file, text hash)."""
+
+    def __init__(self, path: str = HASHES_FILE, threshold: int = VISUAL_CHANGE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self.entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Ignoring unreadable screenshot hash store {path}: {e}")
+
+    def needs_capture(self, items: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Split items into (to capture, skipped) by the URL monitor's text
+        hash: a page whose text is unchanged since its last capture is skipped."""
+        capture, skipped = [], []
+        for item in items:
+            prev = self.entries.get(item['name'])
+            if item.get('hash') and prev and prev.get('text_hash') == item['hash'] \
+                    and prev.get('url') == item['url']:
+                skipped.append(item)
+            else:
+                capture.append(item)
+        return capture, skipped
+
+    def classify(self, screenshots: Dict[str, str], items: List[Dict]) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """Compare new captures with the stored ones.
+
+        Returns (changed, unchanged): changed maps name → filepath for
+        captures at or above the threshold (recorded as the new reference);
+        unchanged maps name → distance for captures below it, whose files
+        are deleted — the previous capture stays the reference.
+        """
+        by_name = {item['name']: item for item in items}
+        changed, unchanged = {}, {}
+        for name, filepath in screenshots.items():
+            item = by_name.get(name, {})
+            hashes = image_hashes(filepath)
+            prev = self.entries.get(name)
+            distance = visual_distance(prev, hashes)
+            if hashes and distance < self.threshold:
+                unchanged[name] = distance
+                prev['text_hash'] = item.get('hash') or prev.get('text_hash')
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+                logger.info(f"  {name}: visually unchanged ({distance} bits) — skipping upload")
+                continue
+            changed[name] = filepath
+            if hashes:
+                self.entries[name] = dict(
+                    hashes,
+                    url=item.get('url', ''),
+                    file=os.path.basename(filepath),
+                    text_hash=item.get('hash'),
+                    distance=None if prev is None else distance,
+                )
+        return changed, unchanged
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=1)
@@ -43,6 +43,18 @@ export default {
     // 2) Otherwise pass through to origin.
     const response = await fetch(request);
 
+    // Content-hashed assets (e.g. /css/rht-states.<hash>.css from the state
+    // pages build) never change under the same name: let browsers keep them.
+    if (response.ok && FINGERPRINTED.test(url.pathname)) {
+      const headers = new Headers(response.headers);
+      headers.set("Cache-Control", "public, max-age=31536000, immutable");
+      return new Response(response.body, {
+        status: response.status,
+        statusText: response.statusText,
+        headers,
+      });
+    }
+
     // Advertise the Markdown alternate on HTML pages that have a companion.
     const type = response.headers.get("Content-Type") || "";
     if (mdPath && type.includes("text/html")) {
@@ -60,6 +72,8 @@ export default {
   },
 };
 
+const FINGERPRINTED = /^\/css\/[\w-]+\.[0-9a-f]{10,}\.css$/;
+
 /**
  * Map a page URL to its Markdown companion path, or null if this URL is not a
  * negotiable page (assets, .md files themselves, robots.txt, sitemap.xml, ...).